@@ -1,15 +1,17 @@
 import json
-import pandas as pd
-from tzarfati_func import call_claude_sonnet
+from llm_cache import cached_llm_stream, default_cache
 from rule_engine import detect_events
+from columnar_cache import read_csv_cached
+from prompt_budget import budget_events
 
 # Prefer explicit imports rather than star-imports
 from extract_CSV_columns import extract_csv_columns, build_facts_from_csv_and_events
+from rule_LLM_creator import RuleCreator
 
 
 # -------- 1. Load CSV --------
 # df = pd.read_csv("flight.csv")
-df = pd.read_csv("NavGpsMetry.csv")
+df = read_csv_cached("NavGpsMetry.csv")
 
 # -------- 2. Deterministic analysis --------
 """ altitude_min = df["altitude"].min()
@@ -21,7 +23,7 @@ events = []
 signals = extract_csv_columns("NavGpsMetry.csv")
 #signals = extract_csv_columns("flight.csv")
 print(signals)
-rc = RuleCreator(available_signals=signals, use_llm=True)
+rc = RuleCreator(available_signals=signals, use_llm=True, stream=True)
 
 print("RuleCreator (type 'exit' to stop)")
 print(rc.start())
@@ -39,10 +41,12 @@ while True:
         break
     print(out)
 
-rule = {'name': 'rapid_descent', 'severity': 'medium', 'description': 'vertical_speed lt -1.5', 'condition': {'signal': 'vertical_speed', 'operator': 'lt', 'value': -1.5}}
+# NavGpsMetry has no vertical_speed column (and velocity_down is the -9999 sentinel throughout):
+# rapid descent = altitude (position_2) falling faster than 1.5 m/s, timed by imu_time
+rule = {'name': 'rapid_descent', 'severity': 'medium', 'description': 'altitude (position_2) falling faster than 1.5 m/s', 'condition': {'signal': 'position_2', 'operator': 'rate', 'compare': 'lt', 'value': -1.5}}
 
 # זיהוי כללי של אירוע
-events = detect_events(df, [rule])
+events = detect_events(df, [rule], time_column="imu_time")
 
 # -------- 3. Facts JSON (האמת היחידה) --------
 """ facts = {
@@ -83,6 +87,12 @@ schema = {
 }
 
 # -------- 5. Prompt --------
+# compact, token-budgeted events: per-rule summary + the most severe events that fit
+events_payload, budget_report = budget_events(
+    events, budget_tokens=2000, rules=[rule], df=df, time_column="imu_time"
+)
+print("prompt budget:", budget_report)
+
 prompt = f"""
 You are an analysis assistant.
 
@@ -94,8 +104,8 @@ Rules:
 - Do not invent data
 - Output valid JSON only
 
-Events:
-{json.dumps(events, indent=2)}
+Events ("summary" has one entry per rule; "events" lists the most severe individual events; "omitted" counts events not listed):
+{events_payload}
 """
 
 # -------- 6. LLM Call --------
@@ -105,11 +115,17 @@ Events:
     # temperature=0
 # )
 
-response = call_claude_sonnet( prompt )
+# stream the answer to the terminal as it is generated; repeat runs on the same flight come from the cache
+parts = []
+for delta in cached_llm_stream(prompt):
+    print(delta, end="", flush=True)
+    parts.append(delta)
+print()
+response = "".join(parts)
 
 # -------- 7. Result --------
 result = response
-print(result)
+print("llm cache:", default_cache().stats())
 
 # אופציונלי: ולידציה
 #json.loads(result)
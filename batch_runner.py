@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+from csv_stats import CsvStats
+from event_store import EventStore
+from extract_CSV_columns import build_facts_from_csv_and_events, files_missing_columns, scan_csv_headers, sniff_csv
+from quantile_sketch import DEFAULT_K
+from rule_compiler import compile_rules
+from rule_stream import detect_events_csv
+
+
+PathSpec = Union[str, Path, Sequence[Union[str, Path]]]
+
+
+def resolve_inputs(spec: PathSpec) -> List[Path]:
+    """Expand a directory (all *.csv inside), a glob pattern, or a list of paths."""
+    if isinstance(spec, (str, Path)):
+        p = Path(spec)
+        if p.is_dir():
+            return sorted(p.glob("*.csv"))
+        if p.exists():
+            return [p]
+        return [Path(m) for m in sorted(glob.glob(str(spec), recursive=True))]
+    out: List[Path] = []
+    for item in spec:
+        out.extend(resolve_inputs(item))
+    return out
+
+
+def analyze_file(
+    csv_path: Union[str, Path],
+    rules: Sequence[Dict[str, Any]],
+    *,
+    chunksize: int = 100_000,
+    time_column: str = "time",
+    coalesce: bool = False,
+    max_gap: int = 0,
+    min_samples: int = 1,
+    quantiles: bool = False,
+) -> Dict[str, Any]:
+    """Events plus per-column stats for one flight log. Never raises: errors are reported."""
+    t0 = time.perf_counter()
+    try:
+        separator = sniff_csv(csv_path)["separator"]
+        # one pass over the file: column stats are folded in while rules run
+        stats = CsvStats(sketch_k=DEFAULT_K if quantiles else None)
+        events = detect_events_csv(
+            csv_path, rules, chunksize=chunksize, time_column=time_column, separator=separator,
+            coalesce=coalesce, max_gap=max_gap, min_samples=min_samples, stats=stats,
+        )
+        facts = build_facts_from_csv_and_events(csv_path, events, stats=stats)
+        return {
+            "file": str(csv_path),
+            "ok": True,
+            "events": events,
+            "stats": facts["stats"],
+            "column_stats": stats.to_dict(),
+            "seconds": round(time.perf_counter() - t0, 4),
+        }
+    except Exception as e:
+        return {
+            "file": str(csv_path),
+            "ok": False,
+            "error": f"{type(e).__name__}: {e}",
+            "seconds": round(time.perf_counter() - t0, 4),
+        }
+
+
+def iter_batch(
+    inputs: PathSpec,
+    rules: Sequence[Dict[str, Any]],
+    *,
+    workers: Optional[int] = None,
+    skip_incompatible: bool = True,
+    **options: Any,
+) -> Iterator[Dict[str, Any]]:
+    """Fan files out to a process pool; yield each file's result as soon as it finishes.
+
+    With `skip_incompatible`, headers are scanned first (concurrently, cached) and
+    files lacking the time column or a signal the rules read are reported as
+    skipped (`"skipped": True`) without being loaded.
+    """
+    paths = resolve_inputs(inputs)
+    if not paths:
+        return
+    if skip_incompatible:
+        required = [options.get("time_column", "time"), *compile_rules(rules).signals]
+        report = scan_csv_headers(paths)
+        lacking = files_missing_columns(report, required)
+        for p in paths:
+            key = str(p)
+            if key in lacking:
+                yield {"file": key, "ok": False, "skipped": True, "error": f"missing columns: {lacking[key]}"}
+            elif key in report["errors"]:
+                yield {"file": key, "ok": False, "skipped": True, "error": report["errors"][key]}
+        paths = [p for p in paths if str(p) in report["files"] and str(p) not in lacking]
+        if not paths:
+            return
+    workers = workers or min(len(paths), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(analyze_file, p, list(rules), **options): p for p in paths}
+        for fut in as_completed(futures):
+            try:
+                yield fut.result()
+            except Exception as e:  # worker died (e.g. BrokenProcessPool)
+                yield {"file": str(futures[fut]), "ok": False, "error": f"{type(e).__name__}: {e}"}
+
+
+def run_batch(
+    inputs: PathSpec,
+    rules: Sequence[Dict[str, Any]],
+    *,
+    workers: Optional[int] = None,
+    out_path: Optional[Union[str, Path]] = None,
+    store_path: Optional[Union[str, Path]] = None,
+    **options: Any,
+) -> Dict[str, Any]:
+    """Analyze many flight logs in parallel.
+
+    Per-file results are appended to `out_path` (JSON Lines) as they finish, so a
+    long campaign leaves usable output even if interrupted. With `store_path`,
+    each file's events are also written to an `EventStore` (flight = file path,
+    recorded_at = file mtime; re-runs replace that flight's events). Returns a
+    summary with fleet-level stats merged from every file; failed and skipped
+    files are listed with their error and don't stop the batch.
+    """
+    summary: Dict[str, Any] = {"files": 0, "ok": 0, "failed": [], "skipped": [], "events": 0}
+    fleet = CsvStats()
+    out = open(out_path, "w", encoding="utf-8") if out_path else None
+    store = EventStore(store_path) if store_path else None
+    try:
+        for result in iter_batch(inputs, rules, workers=workers, **options):
+            summary["files"] += 1
+            if result["ok"]:
+                summary["ok"] += 1
+                summary["events"] += len(result["events"])
+                fleet = fleet.merge(CsvStats.from_dict(result["column_stats"]))
+                if store is not None:
+                    store.add_events(
+                        result["file"], result["events"],
+                        recorded_at=os.path.getmtime(result["file"]), source="batch_runner", replace=True,
+                    )
+            elif result.get("skipped"):
+                summary["skipped"].append({"file": result["file"], "error": result["error"]})
+            else:
+                summary["failed"].append({"file": result["file"], "error": result["error"]})
+            if out is not None:
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+    finally:
+        if out is not None:
+            out.close()
+        if store is not None:
+            store.close()
+    summary["stats"] = fleet.to_facts(extended=True)
+    return summary
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a rule set over many flight CSVs in parallel.")
+    parser.add_argument("inputs", nargs="+", help="Directory, glob pattern or CSV paths")
+    parser.add_argument("--rules", required=True, help="JSON file with a list of rules")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", default=None, help="Write per-file results as JSON Lines")
+    parser.add_argument("--store", default=None, help="Also write events to this SQLite event store")
+    parser.add_argument("--time-column", default="time", help="Column holding sample times")
+    parser.add_argument("--coalesce", action="store_true", help="Merge consecutive hits into intervals")
+    parser.add_argument("--quantiles", action="store_true", help="Add approximate p1/p50/p99 to the stats")
+    args = parser.parse_args()
+
+    with open(args.rules, encoding="utf-8") as f:
+        rules = json.load(f)
+
+    summary = run_batch(
+        args.inputs, rules, workers=args.workers, out_path=args.out, store_path=args.store,
+        time_column=args.time_column, coalesce=args.coalesce, quantiles=args.quantiles,
+    )
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Benchmark: per-call boto3 client vs the shared client registry in `tzarfati_func`.
+
+Usage:
+    python bench_bedrock_client.py --calls 200 --threads 8
+
+A local `http.server` stands in for the bedrock-runtime endpoint (answers
+InvokeModel with a fixed message), so only client-side cost is measured: client
+construction, credential resolution and connection setup. The stand-in counts
+TCP connections, which shows connection reuse. Against the real HTTPS endpoint
+each new connection also pays a TLS handshake, so the gap is larger there.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List
+
+import boto3
+
+from tzarfati_func import DEFAULT_MODEL_ID, DEFAULT_REGION, call_claude_sonnet, clear_bedrock_clients, get_bedrock_client
+
+
+class StandIn(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real endpoint
+    disable_nagle_algorithm = True  # headers and body are separate writes; avoid 40ms delayed-ACK stalls
+    connections = 0
+    delay = 0.0
+    lock = threading.Lock()
+
+    def setup(self) -> None:
+        super().setup()
+        with StandIn.lock:
+            StandIn.connections += 1
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if StandIn.delay:
+            time.sleep(StandIn.delay)
+        body = json.dumps({"content": [{"type": "text", "text": "ok"}], "stop_reason": "end_turn"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def per_call_client(endpoint: str) -> Callable[[], str]:
+    """The old behaviour: a fresh boto3 client for every call."""
+
+    def call() -> str:
+        client = boto3.client("bedrock-runtime", region_name=DEFAULT_REGION, endpoint_url=endpoint)
+        body = json.dumps({"anthropic_version": "bedrock-2023-05-31", "max_tokens": 50,
+                           "messages": [{"role": "user", "content": "hi"}]})
+        response = client.invoke_model(modelId=DEFAULT_MODEL_ID, body=body)
+        return json.loads(response["body"].read())["content"][0]["text"]
+
+    return call
+
+
+def shared_client(endpoint: str, pool: int) -> Callable[[], str]:
+    return lambda: call_claude_sonnet("hi", max_pool_connections=pool, endpoint_url=endpoint)
+
+
+def run(name: str, call: Callable[[], str], calls: int, threads: int) -> None:
+    StandIn.connections = 0
+    latencies: List[float] = []
+
+    def timed(_: int) -> None:
+        t0 = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    if threads > 1:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(timed, range(calls)))
+    else:
+        for i in range(calls):
+            timed(i)
+    wall = time.perf_counter() - t0
+
+    ms = sorted(x * 1000 for x in latencies)
+    p95 = ms[int(0.95 * (len(ms) - 1))]
+    print(f"{name:<16} mean {statistics.mean(ms):7.2f} ms  p50 {statistics.median(ms):7.2f} ms  "
+          f"p95 {p95:7.2f} ms  wall {wall:6.2f}s  connections {StandIn.connections}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Bedrock client reuse against a local stand-in.")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--pool", type=int, default=10, help="max_pool_connections of the shared client")
+    parser.add_argument("--delay-ms", type=float, default=0.0, help="Stand-in server latency per call")
+    args = parser.parse_args()
+
+    # the stand-in ignores signatures, but botocore needs credentials to sign
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "bench")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "bench")
+
+    StandIn.delay = args.delay_ms / 1000.0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        print(f"calls: {args.calls}  threads: {args.threads}  pool: {args.pool}  server delay: {args.delay_ms} ms")
+        run("per-call client", per_call_client(endpoint), args.calls, args.threads)
+        clear_bedrock_clients()
+        get_bedrock_client(max_pool_connections=args.pool, endpoint_url=endpoint)  # warm, as after the first call
+        run("shared client", shared_client(endpoint, args.pool), args.calls, args.threads)
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
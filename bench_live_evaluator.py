@@ -0,0 +1,69 @@
+"""Benchmark: LiveEvaluator throughput (samples/s) for a 50-rule set.
+
+Usage:
+    python bench_live_evaluator.py --samples 100000
+
+Samples come from `NavGpsMetry.csv` (tiled as needed, with a synthetic `time`
+column). The rule set mixes threshold, between, delta/rate and rolling rules.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+from bench_rule_engine import load_scaled
+from rule_builder import make_rule
+from rule_engine import detect_events
+from rule_live import LiveEvaluator
+
+
+def rule_set_50(df) -> List[Dict[str, Any]]:
+    signals = ["velocity_north", "velocity_east", "position_0", "position_1", "position_2",
+               "gps_fom", "pdop", "sat_num", "gps_fom_vertical", "vdop"]
+    rules: List[Dict[str, Any]] = []
+    for s in signals:
+        col = df[s].to_numpy(dtype=np.float64)
+        p5, p50, p95 = np.nanpercentile(col, [5, 50, 95])
+        spread = float(p95 - p5) or 1.0
+        rules += [
+            make_rule(f"{s}_low", s, "lt", "medium", value=float(p5)),
+            make_rule(f"{s}_high", s, "gt", "medium", value=float(p95)),
+            make_rule(f"{s}_band", s, "between", "low", min_value=float(p50), max_value=float(p95)),
+            make_rule(f"{s}_jump", s, "abs_delta", "high", value=spread / 4, compare="gt"),
+            make_rule(f"{s}_stuck", s, "rolling_range", "low", value=spread / 100, window=10, compare="lt"),
+        ]
+    return rules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark LiveEvaluator throughput.")
+    parser.add_argument("--csv", default="NavGpsMetry.csv")
+    parser.add_argument("--samples", type=int, default=100_000)
+    parser.add_argument("--check", action="store_true", help="Compare fired events with detect_events")
+    args = parser.parse_args()
+
+    scale = max(1, -(-args.samples // len(load_scaled(args.csv, 1))))
+    df = load_scaled(args.csv, scale).iloc[: args.samples].reset_index(drop=True)
+    rules = rule_set_50(df)
+    rows = df.to_dict("records")
+
+    live = LiveEvaluator(rules)
+    t0 = time.perf_counter()
+    fired: List[Dict[str, Any]] = []
+    for row in rows:
+        fired.extend(live.push(row))
+    dt = time.perf_counter() - t0
+
+    print(f"rules: {len(rules)}  samples: {len(rows):,}  events: {len(fired):,}")
+    print(f"elapsed: {dt:.3f}s  ->  {len(rows) / dt:,.0f} samples/s  ({len(rows) * len(rules) / dt:,.0f} rule-evals/s)")
+
+    if args.check:
+        key = lambda e: (e["event"], e["time"])  # noqa: E731
+        print("matches detect_events:", sorted(fired, key=key) == sorted(detect_events(df, rules), key=key))
+
+
+if __name__ == "__main__":
+    main()
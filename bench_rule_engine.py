@@ -0,0 +1,110 @@
+"""Benchmark: vectorized `detect_events` vs. the per-sample dict-condition loop.
+
+Usage:
+    python bench_rule_engine.py --scale 2000
+    python bench_rule_engine.py --scale 2000 --sweep   # threshold index vs. masks
+
+`NavGpsMetry.csv` is tiled `--scale` times (a synthetic `time` column is added,
+since the file has none) and both engines run the same rule set on it.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from rule_compiler import compile_rules
+from rule_engine import _eval_condition_dict, detect_events
+
+
+RULES: List[Dict[str, Any]] = [
+    {"name": "rapid_descent", "severity": "high", "description": "velocity_down lt -1.5",
+     "condition": {"signal": "velocity_down", "operator": "lt", "value": -1.5}},
+    {"name": "high_pdop", "severity": "medium", "description": "pdop gt 1.0",
+     "condition": {"signal": "pdop", "operator": "gt", "value": 1.0}},
+    {"name": "few_sats", "severity": "medium", "description": "sat_num lte 14",
+     "condition": {"signal": "sat_num", "operator": "lte", "value": 14}},
+    {"name": "fom_band", "severity": "low", "description": "gps_fom between 1.0 and 1.05",
+     "condition": {"signal": "gps_fom", "operator": "between", "min": 1.0, "max": 1.05}},
+    {"name": "status_4", "severity": "low", "description": "status eq 4",
+     "condition": {"signal": "status", "operator": "eq", "value": 4}},
+]
+
+
+def detect_events_loop(df: pd.DataFrame, rules: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """The pre-vectorization dict-condition path (one `df.loc` + evaluator call per sample)."""
+    events = []
+    for rule in rules:
+        cond = rule["condition"]
+        signal = cond["signal"]
+        for i in range(len(df)):
+            if _eval_condition_dict(cond, df.loc[i, signal]):
+                events.append({
+                    "time": float(df.loc[i, "time"]),
+                    "event": rule.get("name"),
+                    "severity": rule.get("severity"),
+                    "details": rule.get("description"),
+                })
+    return events
+
+
+def load_scaled(csv_path: str, scale: int) -> pd.DataFrame:
+    base = pd.read_csv(csv_path)
+    df = pd.concat([base] * scale, ignore_index=True)
+    df["time"] = np.arange(len(df), dtype=np.float64) * 0.01
+    return df
+
+
+def _timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+def threshold_sweep(df: pd.DataFrame, counts=(1, 10, 100, 1000)) -> None:
+    """Hit evaluation cost as threshold rules on one signal grow (mask mode vs. index mode)."""
+    col = df["velocity_north"].to_numpy()
+    lo, hi = np.nanpercentile(col, [0.5, 1.5])
+    for n_rules in counts:
+        rules = [
+            {"name": f"vn_{k}", "severity": "low",
+             "condition": {"signal": "velocity_north", "operator": "lt", "value": float(v)}}
+            for k, v in enumerate(np.linspace(lo, hi, n_rules))
+        ]
+        row = [f"rules={n_rules:5d}"]
+        for mode in ("mask", "index"):
+            plan = compile_rules(rules, mode=mode)
+            _, t = _timed(plan.evaluate_hits, df)
+            row.append(f"{mode}: {t:.4f}s")
+        print("  ".join(row))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark detect_events against the per-sample loop.")
+    parser.add_argument("--csv", default="NavGpsMetry.csv")
+    parser.add_argument("--scale", type=int, default=100, help="How many times to tile the CSV")
+    parser.add_argument("--skip-loop", action="store_true", help="Only time the vectorized engine")
+    parser.add_argument("--sweep", action="store_true", help="Time 1..1000 threshold rules on one signal")
+    args = parser.parse_args()
+
+    df = load_scaled(args.csv, args.scale)
+    if args.sweep:
+        threshold_sweep(df)
+        return
+    print(f"rows: {len(df):,}  rules: {len(RULES)}")
+
+    fast, t_fast = _timed(detect_events, df, RULES)
+    print(f"vectorized: {t_fast:.4f}s  ({len(fast):,} events)")
+
+    if not args.skip_loop:
+        slow, t_slow = _timed(detect_events_loop, df, RULES)
+        print(f"loop:       {t_slow:.4f}s  ({len(slow):,} events)")
+        print(f"speedup:    {t_slow / max(t_fast, 1e-9):.1f}x")
+        print("identical:", fast == slow)
+
+
+if __name__ == "__main__":
+    main()
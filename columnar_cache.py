@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from extract_CSV_columns import sniff_csv
+
+
+DEFAULT_CACHE_DIR = Path(os.environ.get("AINSIGHT_CACHE_DIR", Path.home() / ".cache" / "ainsight" / "columns"))
+DEFAULT_MAX_BYTES = 2 * 1024**3
+_HASH_BLOCK = 1 << 20
+
+
+def file_sha256(path: Union[str, Path]) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _write_json(path: Path, obj: Any) -> None:
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f)
+    os.replace(tmp, path)
+
+
+class ColumnarCache:
+    """Binary columnar copies of telemetry CSVs, loaded memory-mapped.
+
+    Layout: `<cache_dir>/<sha256 of the CSV bytes>/` holds one `.npy` per column
+    plus `meta.json`. The first load parses the CSV once and writes the entry;
+    later loads open only the requested columns with `mmap_mode="r"`, so pages are
+    read from disk only when a rule actually touches them.
+
+    - Keyed by content hash: a renamed/copied file hits, an edited file misses.
+      The hash of a path is remembered by (size, mtime_ns) so unchanged files are
+      not re-hashed.
+    - Size-bounded: after each insert, least recently used entries are removed
+      until the cache fits in `max_bytes`.
+    - Non-numeric columns are stored as fixed-width strings plus a missing-value mask.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path, None] = None, *, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.dir = Path(cache_dir) if cache_dir is not None else DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._hashes_path = self.dir / "hashes.json"
+
+    # -------------------------
+    # Keys
+    # -------------------------
+
+    def key(self, csv_path: Union[str, Path]) -> str:
+        """Content hash of the CSV (memoized per path by size and mtime_ns)."""
+        st = os.stat(csv_path)
+        path = os.path.abspath(csv_path)
+        try:
+            with open(self._hashes_path, encoding="utf-8") as f:
+                known = json.load(f)
+        except (FileNotFoundError, ValueError):
+            known = {}
+        hit = known.get(path)
+        if hit is not None and hit["size"] == st.st_size and hit["mtime_ns"] == st.st_mtime_ns:
+            return hit["sha256"]
+        sha = file_sha256(csv_path)
+        known[path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": sha}
+        _write_json(self._hashes_path, known)
+        return sha
+
+    # -------------------------
+    # Build / load
+    # -------------------------
+
+    def _build(self, csv_path: Union[str, Path], entry: Path, *, encoding: Optional[str], separator: Optional[str]) -> None:
+        sep = sniff_csv(csv_path, encoding=encoding, separator=separator)["separator"]
+        df = pd.read_csv(csv_path, sep=sep, encoding=encoding)
+        tmp = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        columns: List[Dict[str, Any]] = []
+        for k, c in enumerate(df.columns):
+            s = df[c]
+            col: Dict[str, Any] = {"name": str(c), "file": f"{k}.npy"}
+            if pd.api.types.is_numeric_dtype(s) or pd.api.types.is_bool_dtype(s):
+                np.save(tmp / col["file"], s.to_numpy())
+            else:
+                col["dtype"] = str(s.dtype)
+                na = s.isna().to_numpy()
+                np.save(tmp / col["file"], s.astype(str).to_numpy(dtype=str))
+                if na.any():
+                    col["na"] = f"{k}.na.npy"
+                    np.save(tmp / col["na"], na)
+            columns.append(col)
+        size = sum(p.stat().st_size for p in tmp.iterdir())
+        meta = {"source": os.path.abspath(csv_path), "rows": len(df), "columns": columns, "bytes": size}
+        _write_json(tmp / "meta.json", meta)
+        try:
+            os.replace(tmp, entry)
+        except OSError:  # another process built it first
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def ensure(
+        self,
+        csv_path: Union[str, Path],
+        *,
+        encoding: Optional[str] = None,
+        separator: Optional[str] = None,
+    ) -> Path:
+        """Entry directory for the CSV, building it (and evicting others) on a miss."""
+        entry = self.dir / self.key(csv_path)
+        if (entry / "meta.json").exists():
+            os.utime(entry / "meta.json")  # LRU clock
+            return entry
+        self._build(csv_path, entry, encoding=encoding, separator=separator)
+        self.evict(keep=entry.name)
+        return entry
+
+    def load(
+        self,
+        csv_path: Union[str, Path],
+        columns: Optional[Sequence[str]] = None,
+        *,
+        encoding: Optional[str] = None,
+        separator: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """The CSV as a DataFrame whose numeric columns are read-only memory maps.
+
+        `columns` limits what is opened (like `usecols`); unknown names raise KeyError.
+        """
+        entry = self.ensure(csv_path, encoding=encoding, separator=separator)
+        with open(entry / "meta.json", encoding="utf-8") as f:
+            meta = json.load(f)
+        by_name = {c["name"]: c for c in meta["columns"]}
+        names = list(by_name) if columns is None else list(dict.fromkeys(columns))
+        missing = [c for c in names if c not in by_name]
+        if missing:
+            raise KeyError(f"columns not in {csv_path}: {missing}")
+
+        data: Dict[str, Any] = {}
+        for name in names:
+            col = by_name[name]
+            values = np.load(entry / col["file"], mmap_mode="r")
+            if values.dtype.kind == "U":
+                s = pd.Series(values, dtype=object)
+                if "na" in col:
+                    s[np.load(entry / col["na"])] = np.nan
+                data[name] = s if col.get("dtype", "object") == "object" else s.astype(col["dtype"])
+            else:
+                data[name] = values
+        return pd.DataFrame(data, copy=False, index=pd.RangeIndex(meta["rows"]))
+
+    # -------------------------
+    # Housekeeping
+    # -------------------------
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Cached entries, least recently used first."""
+        out = []
+        for meta_path in self.dir.glob("*/meta.json"):
+            if meta_path.parent.name.endswith(".tmp"):  # entry still being built
+                continue
+            try:
+                with open(meta_path, encoding="utf-8") as f:
+                    meta = json.load(f)
+                used = meta_path.stat().st_mtime
+            except (FileNotFoundError, ValueError):
+                continue
+            out.append({"key": meta_path.parent.name, "source": meta["source"], "bytes": meta["bytes"], "last_used": used})
+        return sorted(out, key=lambda e: e["last_used"])
+
+    def evict(self, *, keep: Optional[str] = None) -> List[str]:
+        """Drop least recently used entries until the cache fits `max_bytes`; returns removed keys."""
+        entries = self.entries()
+        total = sum(e["bytes"] for e in entries)
+        removed: List[str] = []
+        for e in entries:
+            if total <= self.max_bytes:
+                break
+            if e["key"] == keep:
+                continue
+            shutil.rmtree(self.dir / e["key"], ignore_errors=True)
+            total -= e["bytes"]
+            removed.append(e["key"])
+        return removed
+
+    def clear(self) -> None:
+        for e in self.entries():
+            shutil.rmtree(self.dir / e["key"], ignore_errors=True)
+
+
+_DEFAULT: Optional[ColumnarCache] = None
+
+
+def read_csv_cached(
+    csv_path: Union[str, Path],
+    columns: Optional[Sequence[str]] = None,
+    *,
+    encoding: Optional[str] = None,
+    separator: Optional[str] = None,
+    cache: Optional[ColumnarCache] = None,
+) -> pd.DataFrame:
+    """Drop-in for `pd.read_csv(csv_path, usecols=columns)` backed by a `ColumnarCache`."""
+    global _DEFAULT
+    if cache is None:
+        if _DEFAULT is None:
+            _DEFAULT = ColumnarCache()
+        cache = _DEFAULT
+    return cache.load(csv_path, columns, encoding=encoding, separator=separator)
@@ -0,0 +1,60 @@
+"""Shared test data: a synthetic flight and rule sets over it."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+THRESHOLDS = (-1.0, -0.5, 0.0, 0.25, 0.5, 1.0)
+
+
+def _rule(name, cond, severity="low"):
+    return {"name": name, "severity": severity, "description": name, "condition": cond}
+
+
+def _flight(n=600, seed=0):
+    """Random walk on a 0.05 grid (so samples land exactly on thresholds), with
+    plateaus (stuck signal), jumps, and a few NaNs."""
+    rng = np.random.default_rng(seed)
+    alt = np.round(np.cumsum(rng.choice([-0.05, 0.0, 0.0, 0.05], n)) / 0.05) * 0.05
+    alt[rng.integers(0, n, 5)] += 4.0
+    vs = np.round(rng.normal(0, 0.8, n) / 0.05) * 0.05
+    vs[rng.integers(0, n, 6)] = np.nan
+    return pd.DataFrame({"time": np.arange(n) * 0.1, "altitude": alt, "vertical_speed": vs})
+
+
+@pytest.fixture
+def flight():
+    """Builds the synthetic flight: `flight(n=600, seed=0)`."""
+    return _flight
+
+
+@pytest.fixture
+def threshold_rules():
+    """Every plain comparison on vertical_speed at THRESHOLDS, plus a band and a one-point range."""
+    rules = []
+    for op in ("lt", "lte", "gt", "gte", "eq"):
+        for v in THRESHOLDS:
+            rules.append(_rule(f"{op}_{v}", {"signal": "vertical_speed", "operator": op, "value": v}))
+    rules.append(_rule("band", {"signal": "vertical_speed", "operator": "between", "min": -0.5, "max": 0.5}))
+    rules.append(_rule("point", {"signal": "vertical_speed", "operator": "between", "min": 0.25, "max": 0.25}))
+    return rules
+
+
+@pytest.fixture
+def mixed_rules():
+    """One rule per operator family, including a logic tree."""
+    return [
+        _rule("rapid_descent", {"signal": "vertical_speed", "operator": "lt", "value": -1.0}, "high"),
+        _rule("altitude_spike", {"signal": "altitude", "operator": "abs_delta", "compare": "gt", "value": 3.0}),
+        _rule("stuck_signal", {"signal": "altitude", "operator": "rolling_range", "window": 3,
+                               "compare": "lt", "value": 0.1}),
+        _rule("noisy", {"signal": "vertical_speed", "operator": "rolling_std", "window": 5,
+                        "compare": "gt", "value": 0.9}),
+        _rule("climb", {"signal": "altitude", "operator": "rate", "compare": "gt", "value": 0.4}),
+        _rule("either", {"any": [
+            {"signal": "vertical_speed", "operator": "gt", "value": 1.0},
+            {"not": {"signal": "altitude", "operator": "rolling_max", "window": 4, "compare": "lt", "value": 5.0}},
+        ]}),
+    ]
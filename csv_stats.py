@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import math
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Sequence, Set, Union
+
+import numpy as np
+import pandas as pd
+
+from quantile_sketch import DEFAULT_K, KLLSketch
+
+
+# (quantile, facts suffix) reported when sketches are kept
+QUANTILE_FACTS = ((0.01, "p1"), (0.5, "p50"), (0.99, "p99"))
+
+
+# -------------------------
+# Per-column summary (mergeable)
+# -------------------------
+
+
+@dataclass
+class ColumnStats:
+    """count / NaN count / min / max / mean / M2 of one numeric column.
+
+    Two summaries merge exactly (Chan et al. parallel update), so a column can be
+    summarized chunk by chunk, file by file, with O(1) memory.
+    """
+
+    count: int = 0  # non-NaN samples
+    nan_count: int = 0
+    min: float = math.inf
+    max: float = -math.inf
+    mean: float = 0.0
+    m2: float = 0.0
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation (ddof=0, like np.std)."""
+        return math.sqrt(max(self.m2 / self.count, 0.0)) if self.count else math.nan
+
+    @classmethod
+    def of(cls, values: np.ndarray) -> "ColumnStats":
+        x = np.asarray(values, dtype=np.float64)
+        v = x[~np.isnan(x)]
+        if len(v) == 0:
+            return cls(nan_count=len(x))
+        mean = float(v.mean())
+        with np.errstate(invalid="ignore"):
+            m2 = float(np.square(v - mean).sum())
+        return cls(len(v), len(x) - len(v), float(v.min()), float(v.max()), mean, m2)
+
+    def merge(self, other: "ColumnStats") -> "ColumnStats":
+        n = self.count + other.count
+        if n == 0:
+            return ColumnStats(nan_count=self.nan_count + other.nan_count)
+        delta = other.mean - self.mean
+        return ColumnStats(
+            count=n,
+            nan_count=self.nan_count + other.nan_count,
+            min=min(self.min, other.min),
+            max=max(self.max, other.max),
+            mean=self.mean + delta * other.count / n,
+            m2=self.m2 + other.m2 + delta * delta * self.count * other.count / n,
+        )
+
+
+@dataclass
+class CsvStats:
+    """Per-column `ColumnStats` of one file (or a merged fleet of files).
+
+    With `sketch_k` set, each column also keeps a `KLLSketch` for approximate
+    quantiles and "fraction of samples above X" queries (bounded memory, mergeable).
+    """
+
+    rows: int = 0
+    columns: Dict[str, ColumnStats] = field(default_factory=dict)
+    non_numeric: Set[str] = field(default_factory=set)
+    sketch_k: Optional[int] = None
+    sketches: Dict[str, KLLSketch] = field(default_factory=dict)
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """Fold one chunk in. A column that is non-numeric in any chunk is dropped for good."""
+        self.rows += len(chunk)
+        for c in chunk.columns:
+            name = str(c)
+            if name in self.non_numeric:
+                continue
+            s = chunk[c]
+            if not pd.api.types.is_numeric_dtype(s):
+                self.non_numeric.add(name)
+                self.columns.pop(name, None)
+                self.sketches.pop(name, None)
+                continue
+            values = s.to_numpy(dtype=np.float64, na_value=np.nan)
+            part = ColumnStats.of(values)
+            prev = self.columns.get(name)
+            self.columns[name] = part if prev is None else prev.merge(part)
+            if self.sketch_k is not None:
+                self.sketches.setdefault(name, KLLSketch(self.sketch_k)).update(values)
+
+    def merge(self, other: "CsvStats") -> "CsvStats":
+        """Combined summary. Sketches survive only if every side with rows kept them."""
+        sketched = [part.sketch_k for part in (self, other) if part.rows]
+        keep = bool(sketched) and None not in sketched
+        out = CsvStats(
+            self.rows + other.rows,
+            dict(self.columns),
+            self.non_numeric | other.non_numeric,
+            sketched[0] if keep else None,
+            {c: sk.copy() for c, sk in self.sketches.items()} if keep else {},
+        )
+        for name, st in other.columns.items():
+            prev = out.columns.get(name)
+            out.columns[name] = st if prev is None else prev.merge(st)
+        for name, sk in (other.sketches.items() if keep else ()):
+            if name in out.sketches:
+                out.sketches[name].merge(sk)
+            else:
+                out.sketches[name] = sk.copy()
+        for name in out.non_numeric:
+            out.columns.pop(name, None)
+            out.sketches.pop(name, None)
+        return out
+
+    def quantile(self, column: str, q: float) -> float:
+        return self.sketches[column].quantile(q)
+
+    def fraction_above(self, column: str, x: float) -> float:
+        """Approximate fraction of `column`'s (non-NaN) samples greater than x, without a rescan."""
+        return self.sketches[column].fraction_above(x)
+
+    def to_facts(self, *, extended: bool = False, order: Optional[Sequence[str]] = None) -> Dict[str, float]:
+        """Flat facts: `{col}_min`/`{col}_max` for every column with data.
+
+        `extended` adds `{col}_mean`, `{col}_std`, `{col}_count` and `{col}_nan_count`;
+        columns with a sketch also get `{col}_p1`, `{col}_p50` and `{col}_p99`.
+        """
+        names = [c for c in order if c in self.columns] if order is not None else list(self.columns)
+        facts: Dict[str, float] = {}
+        for c in names:
+            st = self.columns[c]
+            if st.count == 0:
+                continue
+            facts[f"{c}_min"] = st.min
+            facts[f"{c}_max"] = st.max
+            if extended:
+                facts[f"{c}_mean"] = st.mean
+                facts[f"{c}_std"] = st.std
+                facts[f"{c}_count"] = st.count
+                facts[f"{c}_nan_count"] = st.nan_count
+            sketch = self.sketches.get(c)
+            if sketch is not None:
+                qs = sketch.quantiles([q for q, _ in QUANTILE_FACTS])
+                for (_, suffix), v in zip(QUANTILE_FACTS, qs):
+                    facts[f"{c}_{suffix}"] = float(v)
+        return facts
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-safe form (e.g. to ship between processes); inverse of `from_dict`."""
+        return {
+            "rows": self.rows,
+            "columns": {c: asdict(st) for c, st in self.columns.items()},
+            "non_numeric": sorted(self.non_numeric),
+            "sketch_k": self.sketch_k,
+            "sketches": {c: sk.to_dict() for c, sk in self.sketches.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "CsvStats":
+        return cls(
+            d["rows"],
+            {c: ColumnStats(**st) for c, st in d["columns"].items()},
+            set(d.get("non_numeric", ())),
+            d.get("sketch_k"),
+            {c: KLLSketch.from_dict(sk) for c, sk in d.get("sketches", {}).items()},
+        )
+
+
+# -------------------------
+# Scanning
+# -------------------------
+
+
+def scan_csv_stats(
+    csv_path: Union[str, Path],
+    *,
+    columns: Optional[Sequence[str]] = None,
+    chunksize: int = 100_000,
+    encoding: Optional[str] = None,
+    separator: str = ",",
+    quantiles: bool = False,
+    sketch_k: int = DEFAULT_K,
+) -> CsvStats:
+    """One pass over a CSV (C parser, `chunksize` rows at a time); memory stays flat.
+
+    `quantiles=True` also builds a `KLLSketch` of size `sketch_k` per column.
+    """
+    stats = CsvStats(sketch_k=sketch_k if quantiles else None)
+    usecols = list(columns) if columns is not None else None
+    with pd.read_csv(csv_path, usecols=usecols, chunksize=chunksize, sep=separator, encoding=encoding) as reader:
+        for chunk in reader:
+            stats.update(chunk)
+    return stats
+
+
+def frame_stats(df: pd.DataFrame, *, quantiles: bool = False, sketch_k: int = DEFAULT_K) -> CsvStats:
+    """`CsvStats` of an already-loaded frame (e.g. a memory-mapped `columnar_cache` load)."""
+    stats = CsvStats(sketch_k=sketch_k if quantiles else None)
+    stats.update(df)
+    return stats
+
+
+def merge_stats(stats: Iterable[CsvStats]) -> CsvStats:
+    """Fleet-level summary of many files."""
+    out = CsvStats()
+    for st in stats:
+        out = out.merge(st)
+    return out
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Literal, Optional, Sequence, Tuple
+
+import numpy as np
+
+from time_index import signal_slice, time_index
+
+
+Method = Literal["lttb", "minmax"]
+
+
+# -------------------------
+# Index selection
+# -------------------------
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: indices of `n_out` points that keep the visual shape.
+
+    First and last points are always kept; the rest are split into n_out-2
+    buckets and each contributes the point forming the largest triangle with the
+    previously chosen point and the mean of the next bucket. Bucket means come
+    from one `reduceat`; the per-bucket choice is sequential by nature (it
+    depends on the previous pick) but each step is a vectorized argmax.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1])[:max(n_out, 0)]
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)  # n_out-2 buckets over points 1..n-2
+    starts = np.append(edges[:-1], n - 1)  # bucket starts, plus the last point as a final "bucket"
+    sizes = np.diff(np.append(starts, n))
+    mean_x = np.add.reduceat(x, starts) / sizes
+    mean_y = np.add.reduceat(y, starts) / sizes
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        bx, by = x[lo:hi], y[lo:hi]
+        area = np.abs((x[a] - mean_x[i + 1]) * (by - y[a]) - (x[a] - bx) * (mean_y[i + 1] - y[a]))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return np.unique(out)
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of each bucket's min and max (n_out // 2 buckets), plus first and last point.
+
+    Fully vectorized: buckets are laid out as rows of a padded 2-D index grid and
+    reduced with argmin/argmax along the rows. Keeps every spike, unlike LTTB.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    n_buckets = max(1, n_out // 2)
+    edges = np.linspace(0, n, n_buckets + 1).astype(np.int64)
+    width = int(np.diff(edges).max())
+    grid = edges[:-1, None] + np.arange(width)
+    valid = grid < edges[1:, None]
+    grid = np.minimum(grid, n - 1)
+    vals = y[grid]
+    lo = np.where(valid & ~np.isnan(vals), vals, np.inf)
+    hi = np.where(valid & ~np.isnan(vals), vals, -np.inf)
+    rows = np.arange(n_buckets)
+    picks = np.concatenate([[0, n - 1], grid[rows, lo.argmin(axis=1)], grid[rows, hi.argmax(axis=1)]])
+    return np.unique(picks)
+
+
+def decimate(x: np.ndarray, y: np.ndarray, n_out: int, method: Method = "lttb") -> Tuple[np.ndarray, np.ndarray]:
+    """Reduce (x, y) to about `n_out` points (NaN samples dropped, x sorted if needed)."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    keep = ~(np.isnan(x) | np.isnan(y))
+    if not keep.all():
+        x, y = x[keep], y[keep]
+    if len(x) > 1 and not bool(np.all(x[1:] >= x[:-1])):
+        order = np.argsort(x, kind="stable")
+        x, y = x[order], y[order]
+    if method == "lttb":
+        idx = lttb_indices(x, y, n_out)
+    elif method == "minmax":
+        idx = minmax_indices(y, n_out)
+    else:
+        raise ValueError("method must be one of: lttb,minmax")
+    return x[idx], y[idx]
+
+
+# -------------------------
+# Traces for facts
+# -------------------------
+
+
+def _trace(t: np.ndarray, v: np.ndarray, n_points: int, method: Method) -> Dict[str, List[float]]:
+    tx, vy = decimate(t, v, n_points, method)
+    return {"time": tx.tolist(), "value": vy.tolist()}
+
+
+def signal_traces(
+    df,
+    signals: Sequence[str],
+    *,
+    time_column: str = "time",
+    n_points: int = 200,
+    method: Method = "lttb",
+) -> Dict[str, Dict[str, List[float]]]:
+    """Whole-flight trace of each signal: {signal: {"time": [...], "value": [...]}}."""
+    t = time_index(df, time_column).times
+    return {s: _trace(t, df[s].to_numpy(dtype=np.float64, na_value=np.nan), n_points, method) for s in signals}
+
+
+def event_traces(
+    df,
+    events: Sequence[Dict[str, Any]],
+    signals: Sequence[str],
+    *,
+    seconds: float = 5.0,
+    time_column: str = "time",
+    n_points: int = 50,
+    method: Method = "lttb",
+    max_events: Optional[int] = 20,
+) -> List[Dict[str, Any]]:
+    """Trace of each signal from `seconds` before to `seconds` after each event.
+
+    Windows are found by binary search on the frame's time index. Only the
+    first `max_events` events are traced (None = all).
+    """
+    chosen = events if max_events is None else events[:max_events]
+    out: List[Dict[str, Any]] = []
+    for e in chosen:
+        window = signal_slice(df, e, seconds, signals=signals, time_column=time_column)
+        t = window[time_column].to_numpy(dtype=np.float64, na_value=np.nan)
+        out.append(
+            {
+                "event": e.get("event"),
+                "time": e.get("time"),
+                "traces": {
+                    s: _trace(t, window[s].to_numpy(dtype=np.float64, na_value=np.nan), n_points, method)
+                    for s in signals
+                },
+            }
+        )
+    return out
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+# -------------------------
+# Run-length boundaries of a hit mask
+# -------------------------
+
+
+def hit_runs(idx: np.ndarray, *, max_gap: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """Split ascending hit positions into runs.
+
+    Returns (first, last) offsets into `idx` for every run. Runs separated by at
+    most `max_gap` non-hit samples are merged (debounce).
+    """
+    idx = np.asarray(idx, dtype=np.int64)
+    if len(idx) == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    breaks = np.flatnonzero(np.diff(idx) > max_gap + 1)
+    first = np.concatenate([[0], breaks + 1])
+    last = np.concatenate([breaks, [len(idx) - 1]])
+    return first, last
+
+
+def peak_kind(cmp: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Which extreme of a run is its peak, given the comparison that fired it."""
+    if cmp is None:
+        return None
+    op = cmp.get("operator")
+    if op in ("lt", "lte"):
+        return "min"
+    if op in ("gt", "gte"):
+        return "max"
+    if op in ("eq", "between"):
+        return "far"
+    return None
+
+
+def run_peaks(values: np.ndarray, first: np.ndarray, kind: str, cmp: Dict[str, Any]) -> np.ndarray:
+    """Peak of each run from the hit values, via one `reduceat` per extreme.
+
+    kind "min"/"max" take the extreme; "far" takes whichever extreme lies
+    farthest from the middle of the compared range (between) or the target (eq).
+    """
+    if kind == "min":
+        return np.minimum.reduceat(values, first)
+    if kind == "max":
+        return np.maximum.reduceat(values, first)
+    lo = np.minimum.reduceat(values, first)
+    hi = np.maximum.reduceat(values, first)
+    if cmp.get("operator") == "between":
+        center = (cmp["min"] + cmp["max"]) / 2.0
+    else:
+        center = cmp["value"]
+    return np.where(np.abs(hi - center) > np.abs(lo - center), hi, lo)
+
+
+@dataclass
+class Interval:
+    """One merged run of hits; `start`/`end` are (global) sample positions, inclusive."""
+
+    start: int
+    end: int
+    t_start: float
+    t_end: float
+    samples: int
+    peak: Optional[float] = None
+
+    def to_event(self, name: Any, severity: Any, desc: Any) -> Dict[str, Any]:
+        return {
+            "time": self.t_start,
+            "end_time": self.t_end,
+            "duration": self.t_end - self.t_start,
+            "samples": self.samples,
+            "peak": self.peak,
+            "event": name,
+            "severity": severity,
+            "details": desc,
+        }
+
+
+def merge_peaks(a: Optional[float], b: Optional[float], cmp: Optional[Dict[str, Any]]) -> Optional[float]:
+    """Peak of two adjacent intervals; agrees with `run_peaks` over the joined run."""
+    kind = peak_kind(cmp)
+    if a is None or b is None or kind is None:
+        return None
+    if kind == "min":
+        return min(a, b)
+    if kind == "max":
+        return max(a, b)
+    center = (cmp["min"] + cmp["max"]) / 2.0 if cmp.get("operator") == "between" else cmp["value"]
+    da, db = abs(a - center), abs(b - center)
+    if da == db:
+        return min(a, b)
+    return a if da > db else b
+
+
+def intervals_from_hits(
+    idx: np.ndarray,
+    times: np.ndarray,
+    *,
+    series: Optional[np.ndarray] = None,
+    cmp: Optional[Dict[str, Any]] = None,
+    max_gap: int = 0,
+    base: int = 0,
+) -> List[Interval]:
+    """Merge ascending hit positions (into `times`/`series`) into intervals.
+
+    `base` is added to positions so chunked callers get global sample positions.
+    """
+    first, last = hit_runs(idx, max_gap=max_gap)
+    if len(first) == 0:
+        return []
+    counts = last - first + 1
+
+    kind = peak_kind(cmp)
+    peaks: Optional[np.ndarray] = None
+    if series is not None and kind is not None:
+        peaks = run_peaks(np.asarray(series, dtype=np.float64)[idx], first, kind, cmp or {})
+
+    starts, ends = idx[first], idx[last]
+    t_start = np.asarray(times[starts], dtype=np.float64)
+    t_end = np.asarray(times[ends], dtype=np.float64)
+    return [
+        Interval(
+            start=int(starts[k]) + base,
+            end=int(ends[k]) + base,
+            t_start=float(t_start[k]),
+            t_end=float(t_end[k]),
+            samples=int(counts[k]),
+            peak=None if peaks is None else float(peaks[k]),
+        )
+        for k in range(len(first))
+    ]
+
+
+def interval_events(
+    idx: np.ndarray,
+    times: np.ndarray,
+    name: Any,
+    severity: Any,
+    desc: Any,
+    *,
+    series: Optional[np.ndarray] = None,
+    cmp: Optional[Dict[str, Any]] = None,
+    max_gap: int = 0,
+    min_samples: int = 1,
+) -> List[Dict[str, Any]]:
+    """Merge ascending hit positions into interval events.
+
+    Each event carries start `time`, `end_time`, `duration`, `samples` (hit count)
+    and `peak` (extreme value of `series` over the hits; None if unknown).
+    Intervals with fewer than `min_samples` hits are dropped.
+    """
+    intervals = intervals_from_hits(idx, times, series=series, cmp=cmp, max_gap=max_gap)
+    return [iv.to_event(name, severity, desc) for iv in intervals if iv.samples >= min_samples]
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import datetime as dt
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+
+Timestamp = Union[float, dt.datetime, dt.date]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS flights (
+    id          INTEGER PRIMARY KEY,
+    name        TEXT NOT NULL UNIQUE,
+    source      TEXT,
+    recorded_at REAL,
+    added_at    REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    id        INTEGER PRIMARY KEY,
+    flight_id INTEGER NOT NULL REFERENCES flights(id) ON DELETE CASCADE,
+    rule      TEXT,
+    severity  TEXT,
+    time      REAL,
+    end_time  REAL,
+    duration  REAL,
+    samples   INTEGER,
+    peak      REAL,
+    details   TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_rule_severity_time ON events(rule, severity, time);
+CREATE INDEX IF NOT EXISTS idx_events_flight ON events(flight_id);
+CREATE INDEX IF NOT EXISTS idx_flights_recorded_at ON flights(recorded_at);
+"""
+
+_EVENT_COLUMNS = ("rule", "severity", "time", "end_time", "duration", "samples", "peak", "details")
+_INTERVAL_KEYS = ("end_time", "duration", "samples", "peak")
+
+
+def _epoch(t: Optional[Timestamp]) -> Optional[float]:
+    if t is None:
+        return None
+    if isinstance(t, dt.datetime):
+        return t.timestamp()
+    if isinstance(t, dt.date):
+        return dt.datetime(t.year, t.month, t.day).timestamp()
+    return float(t)
+
+
+def _row(flight_id: int, e: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (
+        flight_id,
+        e.get("event"),
+        e.get("severity"),
+        e.get("time"),
+        e.get("end_time"),
+        e.get("duration"),
+        e.get("samples"),
+        e.get("peak"),
+        None if e.get("details") is None else str(e.get("details")),
+    )
+
+
+class EventStore:
+    """SQLite store of detected events across flights.
+
+    Event rows carry the flight, rule name, severity and time (plus the interval
+    fields of coalesced events). Indexes on (rule, severity, time) and on the flight
+    make cross-flight queries index lookups rather than CSV re-parses.
+
+    Usage:
+        with EventStore("events.db") as store:
+            store.add_events("flight_042", detect_events(df, rules), recorded_at=date)
+            store.query(rule="rapid_descent", severity="high", since=month_start)
+    """
+
+    def __init__(self, path: Union[str, Path] = ":memory:") -> None:
+        self.path = str(path)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        if self.path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode = WAL")
+            self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "EventStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # -------------------------
+    # Writes
+    # -------------------------
+
+    def add_flight(
+        self,
+        name: str,
+        *,
+        recorded_at: Optional[Timestamp] = None,
+        source: Optional[str] = None,
+    ) -> int:
+        """Register a flight (or update its metadata) and return its id."""
+        with self.conn:
+            self.conn.execute(
+                """
+                INSERT INTO flights (name, source, recorded_at, added_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET
+                    source = COALESCE(excluded.source, flights.source),
+                    recorded_at = COALESCE(excluded.recorded_at, flights.recorded_at)
+                """,
+                (name, source, _epoch(recorded_at), time.time()),
+            )
+        return int(self.conn.execute("SELECT id FROM flights WHERE name = ?", (name,)).fetchone()[0])
+
+    def add_events(
+        self,
+        flight: str,
+        events: Iterable[Dict[str, Any]],
+        *,
+        recorded_at: Optional[Timestamp] = None,
+        source: Optional[str] = None,
+        replace: bool = False,
+        batch_size: int = 10_000,
+    ) -> int:
+        """Bulk-insert `detect_events` output for one flight; returns the number of rows.
+
+        Rows go through `executemany` in batches of `batch_size`, all in one
+        transaction. `replace=True` first drops the flight's stored events (re-runs).
+        """
+        flight_id = self.add_flight(flight, recorded_at=recorded_at, source=source)
+        placeholders = ", ".join("?" * (len(_EVENT_COLUMNS) + 1))
+        sql = f"INSERT INTO events (flight_id, {', '.join(_EVENT_COLUMNS)}) VALUES ({placeholders})"
+        count = 0
+        with self.conn:
+            if replace:
+                self.conn.execute("DELETE FROM events WHERE flight_id = ?", (flight_id,))
+            batch: List[Tuple[Any, ...]] = []
+            for e in events:
+                batch.append(_row(flight_id, e))
+                if len(batch) >= batch_size:
+                    self.conn.executemany(sql, batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                self.conn.executemany(sql, batch)
+                count += len(batch)
+        return count
+
+    def delete_flight(self, name: str) -> None:
+        """Remove a flight and all its events."""
+        with self.conn:
+            self.conn.execute("DELETE FROM flights WHERE name = ?", (name,))
+
+    # -------------------------
+    # Reads
+    # -------------------------
+
+    def _where(
+        self,
+        *,
+        rule: Optional[str] = None,
+        severity: Union[str, Sequence[str], None] = None,
+        flights: Optional[Sequence[str]] = None,
+        since: Optional[Timestamp] = None,
+        until: Optional[Timestamp] = None,
+        t0: Optional[float] = None,
+        t1: Optional[float] = None,
+    ) -> Tuple[str, List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        if rule is not None:
+            clauses.append("e.rule = ?")
+            params.append(rule)
+        if severity is not None:
+            sev = [severity] if isinstance(severity, str) else list(severity)
+            clauses.append(f"e.severity IN ({', '.join('?' * len(sev))})")
+            params.extend(sev)
+        if flights is not None:
+            clauses.append(f"f.name IN ({', '.join('?' * len(flights))})")
+            params.extend(flights)
+        if since is not None:
+            clauses.append("f.recorded_at >= ?")
+            params.append(_epoch(since))
+        if until is not None:
+            clauses.append("f.recorded_at < ?")
+            params.append(_epoch(until))
+        if t0 is not None:
+            clauses.append("e.time >= ?")
+            params.append(float(t0))
+        if t1 is not None:
+            clauses.append("e.time <= ?")
+            params.append(float(t1))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def iter_query(
+        self,
+        *,
+        rule: Optional[str] = None,
+        severity: Union[str, Sequence[str], None] = None,
+        flights: Optional[Sequence[str]] = None,
+        since: Optional[Timestamp] = None,
+        until: Optional[Timestamp] = None,
+        t0: Optional[float] = None,
+        t1: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream matching events (see `query`)."""
+        where, params = self._where(
+            rule=rule, severity=severity, flights=flights, since=since, until=until, t0=t0, t1=t1
+        )
+        sql = (
+            "SELECT f.name AS flight, e.time, e.end_time, e.duration, e.samples, e.peak,"
+            " e.rule AS event, e.severity, e.details"
+            " FROM events e JOIN flights f ON f.id = e.flight_id"
+            f"{where} ORDER BY f.recorded_at, f.name, e.time"
+        )
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        for row in self.conn.execute(sql, params):
+            event = dict(row)
+            for k in _INTERVAL_KEYS:  # point events don't carry interval fields
+                if event[k] is None:
+                    del event[k]
+            yield event
+
+    def query(self, **filters: Any) -> List[Dict[str, Any]]:
+        """Events matching all given filters, as `detect_events`-style dicts plus `flight`.
+
+        Filters: rule, severity (one or several), flights (names), since/until
+        (flight recorded_at; datetime, date or epoch seconds), t0/t1 (event time
+        within the flight), limit.
+        """
+        return list(self.iter_query(**filters))
+
+    def counts(self, **filters: Any) -> List[Dict[str, Any]]:
+        """Number of events per (rule, severity), same filters as `query` (no limit)."""
+        filters.pop("limit", None)
+        where, params = self._where(**filters)
+        sql = (
+            "SELECT e.rule AS event, e.severity, COUNT(*) AS count, COUNT(DISTINCT e.flight_id) AS flights"
+            " FROM events e JOIN flights f ON f.id = e.flight_id"
+            f"{where} GROUP BY e.rule, e.severity ORDER BY count DESC"
+        )
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def flights(self) -> List[Dict[str, Any]]:
+        return [dict(row) for row in self.conn.execute("SELECT * FROM flights ORDER BY recorded_at, name")]
@@ -1,10 +1,104 @@
 from __future__ import annotations
 
+import csv
+import json
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 import pandas as pd
 
+from csv_stats import CsvStats, frame_stats, scan_csv_stats
+
+
+# -------------------------
+# Header / dialect cache
+# -------------------------
+
+# (abs path, encoding, separator) -> (size, mtime_ns, {"columns": [...], "separator": str})
+_HEADER_CACHE: Dict[Tuple[str, Optional[str], Optional[str]], Tuple[int, int, Dict[str, Any]]] = {}
+
+SNIFF_DELIMITERS = ",;\t|"
+SNIFF_LINES = 20
+
+
+def _sniff_separator(path: Path, encoding: Optional[str]) -> str:
+    """Guess the delimiter from the first few lines (csv.Sniffer); "," if undecidable.
+
+    Decodes like `pd.read_csv` (UTF-8 unless `encoding` is given), not with the
+    locale's encoding.
+    """
+    try:
+        with open(path, "r", encoding=encoding or "utf-8", newline="") as f:
+            sample = "".join(line for _, line in zip(range(SNIFF_LINES), f))
+        return csv.Sniffer().sniff(sample, delimiters=SNIFF_DELIMITERS).delimiter
+    except (csv.Error, UnicodeDecodeError):
+        return ","
+
+
+def sniff_csv(
+    csv_path: Union[str, Path],
+    *,
+    encoding: Optional[str] = None,
+    separator: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Header and dialect of a CSV: {"columns": [...], "separator": str}.
+
+    Results are cached by path and validated against the file's size and
+    mtime_ns on every call (one `stat`), so a changed file is re-sniffed and
+    unchanged ones cost no read at all. The header itself is read with the C parser.
+    """
+    path = Path(csv_path)
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"CSV file not found: {path}") from None
+
+    key = (os.path.abspath(path), encoding, separator)
+    hit = _HEADER_CACHE.get(key)
+    if hit is not None and hit[0] == st.st_size and hit[1] == st.st_mtime_ns:
+        return hit[2]
+
+    sep = separator if separator is not None else _sniff_separator(path, encoding)
+    header = pd.read_csv(path, nrows=0, sep=sep, encoding=encoding)
+    info = {"columns": [str(c) for c in header.columns.tolist()], "separator": sep}
+    _HEADER_CACHE[key] = (st.st_size, st.st_mtime_ns, info)
+    return info
+
+
+def clear_header_cache() -> None:
+    _HEADER_CACHE.clear()
+
+
+def save_header_cache(cache_path: Union[str, Path]) -> None:
+    """Persist the header cache as JSON (written atomically)."""
+    entries = [
+        {"path": k[0], "encoding": k[1], "separator": k[2], "size": v[0], "mtime_ns": v[1], "info": v[2]}
+        for k, v in _HEADER_CACHE.items()
+    ]
+    tmp = f"{cache_path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(entries, f)
+    os.replace(tmp, cache_path)
+
+
+def load_header_cache(cache_path: Union[str, Path]) -> int:
+    """Merge a cache saved by `save_header_cache`; returns the number of entries loaded.
+
+    Stale entries are harmless: they fail the size/mtime check and are re-sniffed.
+    A missing file loads nothing.
+    """
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            entries = json.load(f)
+    except FileNotFoundError:
+        return 0
+    for e in entries:
+        _HEADER_CACHE[(e["path"], e["encoding"], e["separator"])] = (e["size"], e["mtime_ns"], e["info"])
+    return len(entries)
+
 
 def extract_csv_columns(
     csv_path: Union[str, Path],
@@ -16,23 +110,31 @@ def extract_csv_columns(
     Return column names from a CSV file.
 
     - Uses a lightweight read (nrows=0), so it doesn't load full data.
-    - If separator is not provided, pandas will try to infer it.
+    - If separator is not provided, it is sniffed from the first lines.
+    - Cached per file (see `sniff_csv`): repeated calls on an unchanged file are free.
     """
-    path = Path(csv_path)
-    if not path.exists():
-        raise FileNotFoundError(f"CSV file not found: {path}")
+    return list(sniff_csv(csv_path, encoding=encoding, separator=separator)["columns"])
 
-    read_kwargs = {}
-    if encoding is not None:
-        read_kwargs["encoding"] = encoding
 
-    if separator is None:
-        # infer delimiter (works well for comma/semicolon/tab)
-        df = pd.read_csv(path, nrows=0, sep=None, engine="python", **read_kwargs)
-    else:
-        df = pd.read_csv(path, nrows=0, sep=separator, **read_kwargs)
+def _sniff_many(
+    csv_paths: Sequence[Union[str, Path]],
+    *,
+    encoding: Optional[str],
+    separator: Optional[str],
+    workers: Optional[int],
+) -> List[Union[Dict[str, Any], Exception]]:
+    """`sniff_csv` of every path on a thread pool (header reads are I/O bound); input order."""
 
-    return [str(c) for c in df.columns.tolist()]
+    def one(p: Union[str, Path]) -> Union[Dict[str, Any], Exception]:
+        try:
+            return sniff_csv(p, encoding=encoding, separator=separator)
+        except Exception as e:  # reported per file by the callers
+            return e
+
+    if len(csv_paths) <= 1:
+        return [one(p) for p in csv_paths]
+    with ThreadPoolExecutor(max_workers=workers or min(32, len(csv_paths))) as pool:
+        return list(pool.map(one, csv_paths))
 
 
 def extract_csv_columns_from_many(
@@ -40,19 +142,86 @@ def extract_csv_columns_from_many(
     *,
     encoding: Optional[str] = None,
     separator: Optional[str] = None,
+    workers: Optional[int] = None,
 ) -> List[str]:
-    """Return a de-duplicated list of columns across multiple CSV files (preserves order)."""
+    """Return a de-duplicated list of columns across multiple CSV files (preserves order).
+
+    Headers are read concurrently; the first unreadable file raises its error.
+    """
     seen = set()
     out: List[str] = []
-    for p in csv_paths:
-        cols = extract_csv_columns(p, encoding=encoding, separator=separator)
-        for c in cols:
+    for info in _sniff_many(list(csv_paths), encoding=encoding, separator=separator, workers=workers):
+        if isinstance(info, Exception):
+            raise info
+        for c in info["columns"]:
             if c not in seen:
                 seen.add(c)
                 out.append(c)
     return out
 
 
+def scan_csv_headers(
+    csv_paths: Sequence[Union[str, Path]],
+    *,
+    encoding: Optional[str] = None,
+    separator: Optional[str] = None,
+    workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Schema-union report over many CSVs, headers read concurrently.
+
+    - `columns`: ordered union of all columns.
+    - `files`: per file, its columns and separator.
+    - `missing`: per file, the union columns it lacks (complete files omitted).
+    - `separator`: the most common separator; `dialect_differences`: files using another one.
+    - `errors`: unreadable files and why (they are left out of everything else).
+    """
+    paths = [str(p) for p in csv_paths]
+    infos = _sniff_many(paths, encoding=encoding, separator=separator, workers=workers)
+
+    files: Dict[str, Dict[str, Any]] = {}
+    errors: Dict[str, str] = {}
+    union: List[str] = []
+    seen = set()
+    for p, info in zip(paths, infos):
+        if isinstance(info, Exception):
+            errors[p] = f"{type(info).__name__}: {info}"
+            continue
+        files[p] = {"columns": list(info["columns"]), "separator": info["separator"]}
+        for c in info["columns"]:
+            if c not in seen:
+                seen.add(c)
+                union.append(c)
+
+    missing: Dict[str, List[str]] = {}
+    for p, info in files.items():
+        have = set(info["columns"])
+        lacks = [c for c in union if c not in have]
+        if lacks:
+            missing[p] = lacks
+
+    seps = Counter(info["separator"] for info in files.values())
+    common = seps.most_common(1)[0][0] if seps else None
+    return {
+        "columns": union,
+        "files": files,
+        "missing": missing,
+        "separator": common,
+        "dialect_differences": {p: i["separator"] for p, i in files.items() if i["separator"] != common},
+        "errors": errors,
+    }
+
+
+def files_missing_columns(report: Dict[str, Any], required: Sequence[str]) -> Dict[str, List[str]]:
+    """From a `scan_csv_headers` report: files lacking any `required` column -> what they lack."""
+    out: Dict[str, List[str]] = {}
+    for p, info in report["files"].items():
+        have = set(info["columns"])
+        lacks = [c for c in required if c not in have]
+        if lacks:
+            out[p] = lacks
+    return out
+
+
 def build_facts_from_csv_and_events(
     csv_path: Union[str, Path],
     events: List[Dict[str, Any]],
@@ -60,39 +229,71 @@ def build_facts_from_csv_and_events(
     domain_context: str = "Drone flight test",
     encoding: Optional[str] = None,
     separator: Optional[str] = None,
+    extended_stats: bool = False,
+    quantiles: bool = False,
+    chunksize: int = 100_000,
+    stats: Optional[CsvStats] = None,
+    use_cache: bool = False,
+    trace_signals: Optional[Sequence[str]] = None,
+    trace_points: int = 200,
+    event_trace_points: int = 50,
+    event_window: float = 5.0,
+    trace_method: str = "lttb",
+    time_column: str = "time",
 ) -> Dict[str, Any]:
     """Create a facts dict suitable for LLM prompting.
 
-    - `stats` includes min/max for every numeric column found in the CSV.
+    - `stats` includes min/max for every numeric column found in the CSV
+      (plus mean/std/count/nan_count with `extended_stats=True`, and approximate
+      p1/p50/p99 with `quantiles=True` - robust to sentinels such as -9999).
     - `events_detected` is the output of `detect_events(...)`.
 
     Notes:
     - This function does not call `detect_events` itself; you pass `events` in.
     - Non-numeric columns are skipped.
+    - The CSV is read once, in chunks (see `csv_stats.scan_csv_stats`); pass a
+      precomputed `stats` to skip the read entirely, or `use_cache=True` to compute
+      them from the memory-mapped `columnar_cache` copy (no text parsing after the first run).
+    - `trace_signals` adds decimated signal shape (see `decimate`): `signal_traces`
+      holds `trace_points` points per signal over the whole flight, and
+      `event_traces` holds `event_trace_points` per signal within `event_window`
+      seconds of each event (first 20 events).
     """
 
-    cols = extract_csv_columns(csv_path, encoding=encoding, separator=separator)
+    info = sniff_csv(csv_path, encoding=encoding, separator=separator)
+    if stats is None and use_cache:
+        from columnar_cache import read_csv_cached  # columnar_cache imports this module
 
-    # Load only needed columns; this is still simple and robust for a POC.
-    df = pd.read_csv(csv_path, sep=separator, encoding=encoding) if separator else pd.read_csv(csv_path, sep=None, engine="python", encoding=encoding)
+        stats = frame_stats(read_csv_cached(csv_path, encoding=encoding, separator=separator), quantiles=quantiles)
+    if stats is None:
+        stats = scan_csv_stats(
+            csv_path, chunksize=chunksize, encoding=encoding, separator=info["separator"], quantiles=quantiles
+        )
 
-    stats: Dict[str, float] = {}
-    for c in cols:
-        if c not in df.columns:
-            continue
-        s = df[c]
-        if not pd.api.types.is_numeric_dtype(s):
-            continue
-        s2 = pd.to_numeric(s, errors="coerce")
-        if s2.notna().any():
-            stats[f"{c}_min"] = float(s2.min())
-            stats[f"{c}_max"] = float(s2.max())
-
-    return {
-        "stats": stats,
+    facts: Dict[str, Any] = {
+        "stats": stats.to_facts(extended=extended_stats, order=info["columns"]),
         "events_detected": events,
         "domain_context": domain_context,
     }
+    if trace_signals:
+        from decimate import event_traces, signal_traces
+
+        wanted = list(dict.fromkeys([time_column, *trace_signals]))
+        if use_cache:
+            from columnar_cache import read_csv_cached
+
+            df = read_csv_cached(csv_path, wanted, encoding=encoding, separator=info["separator"])
+        else:
+            df = pd.read_csv(csv_path, usecols=wanted, sep=info["separator"], encoding=encoding)
+        facts["signal_traces"] = signal_traces(
+            df, trace_signals, time_column=time_column, n_points=trace_points, method=trace_method
+        )
+        if events:
+            facts["event_traces"] = event_traces(
+                df, events, trace_signals, seconds=event_window, time_column=time_column,
+                n_points=event_trace_points, method=trace_method,
+            )
+    return facts
 
 
 def main() -> None:
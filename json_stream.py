@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict
+
+
+class IncrementalJSON:
+    """Incremental parser for one top-level JSON object arriving in pieces.
+
+    `feed(text)` returns the members completed so far. A member counts as
+    complete once the `,` or `}` after its value arrives, so a number such as
+    `-1` is not reported before it has finished growing into `-1.5`. Text before
+    the first `{` (prose, a code fence) is skipped. Each character is scanned
+    once, however many pieces it arrives in.
+    """
+
+    def __init__(self) -> None:
+        self.fields: Dict[str, Any] = {}
+        self.complete = False
+        self._buf = ""
+        self._pos = 0
+        self._started = False
+        self._depth = 0
+        self._in_str = False
+        self._esc = False
+        self._member_start = 0
+
+    def _member(self, text: str) -> None:
+        if not text.strip():
+            return
+        try:
+            self.fields.update(json.loads("{" + text + "}"))
+        except ValueError:
+            pass  # malformed member: skip it and keep going
+
+    def feed(self, text: str) -> Dict[str, Any]:
+        if self.complete:
+            return self.fields
+        self._buf += text
+        buf = self._buf
+        i = self._pos
+        while i < len(buf):
+            c = buf[i]
+            if not self._started:
+                if c == "{":
+                    self._started = True
+                    self._depth = 1
+                    self._member_start = i + 1
+            elif self._in_str:
+                if self._esc:
+                    self._esc = False
+                elif c == "\\":
+                    self._esc = True
+                elif c == '"':
+                    self._in_str = False
+            elif c == '"':
+                self._in_str = True
+            elif c in "{[":
+                self._depth += 1
+            elif c in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._member(buf[self._member_start:i])
+                    self.complete = True
+                    break
+            elif c == "," and self._depth == 1:
+                self._member(buf[self._member_start:i])
+                self._member_start = i + 1
+            i += 1
+        self._pos = i + 1 if self.complete else i
+        return self.fields
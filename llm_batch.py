@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence, Union
+
+
+THROTTLING_CODES = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceUnavailableException",
+    "ModelNotReadyException",
+    "RequestLimitExceeded",
+}
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` acquisitions per second, bursts of up to `burst`.
+
+    Each acquisition takes a whole token, so `burst` must be at least 1.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        if burst is not None and not burst >= 1:
+            raise ValueError("burst must be >= 1")
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def is_throttling(exc: BaseException) -> bool:
+    """True if `exc` (or an exception it was raised from) is a Bedrock throttling/overload error."""
+    seen = set()
+    e: Optional[BaseException] = exc
+    while e is not None and id(e) not in seen:
+        seen.add(id(e))
+        response = getattr(e, "response", None)  # botocore ClientError
+        if isinstance(response, dict) and response.get("Error", {}).get("Code") in THROTTLING_CODES:
+            return True
+        e = e.__cause__ or e.__context__
+    return False
+
+
+def call_with_backoff(
+    call: Callable[..., str],
+    prompt: str,
+    *,
+    retries: int = 5,
+    base_delay: float = 0.5,
+    max_delay: float = 20.0,
+    bucket: Optional[TokenBucket] = None,
+    **call_kwargs: Any,
+) -> str:
+    """`call(prompt, **call_kwargs)`, retrying throttling errors with exponential backoff.
+
+    Waits are "full jitter": uniform in [0, min(max_delay, base_delay * 2**attempt)].
+    Other errors, and the last throttling error after `retries` retries, propagate.
+    Every attempt (retries included) takes a token from `bucket`.
+    """
+    attempt = 0
+    while True:
+        if bucket is not None:
+            bucket.acquire()
+        try:
+            return call(prompt, **call_kwargs)
+        except Exception as e:
+            if attempt >= retries or not is_throttling(e):
+                raise
+        time.sleep(random.uniform(0.0, min(max_delay, base_delay * 2**attempt)))
+        attempt += 1
+
+
+def batch_call(
+    prompts: Sequence[str],
+    *,
+    max_workers: int = 4,
+    rate: Optional[float] = None,
+    burst: Optional[float] = None,
+    retries: int = 5,
+    base_delay: float = 0.5,
+    max_delay: float = 20.0,
+    use_cache: bool = False,
+    return_exceptions: bool = False,
+    call: Optional[Callable[..., str]] = None,
+    **call_kwargs: Any,
+) -> List[Union[str, Exception]]:
+    """Run many prompts concurrently; results come back in input order.
+
+    - `max_workers`: concurrency cap (threads in flight).
+    - `rate`/`burst`: token-bucket limit on requests per second (None = unlimited).
+    - throttling errors are retried via `call_with_backoff`.
+    - `use_cache=True` goes through `llm_cache.cached_llm_call`.
+    - `return_exceptions=True` puts a failed prompt's exception in its slot
+      instead of raising the first failure.
+
+    `call` defaults to `tzarfati_func.call_claude_sonnet`, with the shared
+    client's connection pool sized to `max_workers`.
+    """
+    if call is None:
+        from tzarfati_func import DEFAULT_MAX_POOL_CONNECTIONS, DEFAULT_MODEL_ID, call_claude_sonnet
+
+        call = call_claude_sonnet
+        call_kwargs.setdefault("model_id", DEFAULT_MODEL_ID)
+        call_kwargs.setdefault("max_pool_connections", max(max_workers, DEFAULT_MAX_POOL_CONNECTIONS))
+    if use_cache:
+        from llm_cache import cached_llm_call
+
+        inner = call
+        call = lambda p, **kw: cached_llm_call(p, call=inner, **kw)  # noqa: E731
+    bucket = TokenBucket(rate, burst) if rate is not None else None
+
+    def one(prompt: str) -> Union[str, Exception]:
+        try:
+            return call_with_backoff(
+                call, prompt, retries=retries, base_delay=base_delay, max_delay=max_delay,
+                bucket=bucket, **call_kwargs,
+            )
+        except Exception as e:
+            if return_exceptions:
+                return e
+            raise
+
+    if not prompts:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(prompts)))) as pool:
+        return list(pool.map(one, prompts))
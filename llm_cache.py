@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union
+
+
+DEFAULT_CACHE_DIR = Path(os.environ.get("AINSIGHT_LLM_CACHE_DIR", Path.home() / ".cache" / "ainsight" / "llm"))
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_DISK_BYTES = 64 * 1024**2
+
+
+def cache_key(model_id: str, max_tokens: int, prompt: str) -> str:
+    """Content address of one LLM request."""
+    blob = json.dumps([model_id, int(max_tokens), prompt], ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """Two-tier response cache for LLM calls.
+
+    - memory: LRU of up to `max_entries` responses (a hit is a dict lookup),
+    - disk (optional, `disk_dir`): one JSON file per response, oldest files
+      removed once the tier exceeds `max_disk_bytes`; disk hits are promoted to memory,
+    - `ttl` (seconds, optional) expires entries in both tiers.
+
+    Thread-safe. `stats()` returns hit/miss counters.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        disk_dir: Union[str, Path, None] = None,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+        ttl: Optional[float] = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.disk_dir = Path(disk_dir) if disk_dir is not None else None
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl = ttl
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes: Optional[int] = None  # computed on first disk write
+        self.hits = self.memory_hits = self.disk_hits = self.misses = 0
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+    def _fresh(self, created: float) -> bool:
+        return self.ttl is None or time.time() - created <= self.ttl
+
+    def _path(self, key: str) -> Path:
+        return self.disk_dir / key[:2] / f"{key}.json"  # type: ignore[operator]
+
+    # -------------------------
+    # Tiers
+    # -------------------------
+
+    def _remember(self, key: str, created: float, response: str) -> None:
+        self._memory[key] = (created, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_get(self, key: str) -> Optional[Tuple[float, str]]:
+        if self.disk_dir is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        if not self._fresh(entry["created"]):
+            path.unlink(missing_ok=True)
+            return None
+        return entry["created"], entry["response"]
+
+    def _disk_put(self, key: str, created: float, response: str) -> None:
+        if self.disk_dir is None:
+            return
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"created": created, "response": response}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        if self._disk_bytes is None:
+            self._disk_bytes = sum(p.stat().st_size for p in self.disk_dir.glob("*/*.json"))
+        else:
+            self._disk_bytes += path.stat().st_size
+        if self._disk_bytes > self.max_disk_bytes:
+            self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        files = []
+        for p in self.disk_dir.glob("*/*.json"):  # type: ignore[union-attr]
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            files.append((st.st_mtime, st.st_size, p))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        target = int(self.max_disk_bytes * 0.9)  # leave headroom so every write doesn't rescan
+        for _, size, p in files:
+            if total <= target:
+                break
+            p.unlink(missing_ok=True)
+            total -= size
+        self._disk_bytes = total
+
+    # -------------------------
+    # API
+    # -------------------------
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            hit = self._memory.get(key)
+            if hit is not None and self._fresh(hit[0]):
+                self._memory.move_to_end(key)
+                self.hits += 1
+                self.memory_hits += 1
+                return hit[1]
+            if hit is not None:
+                del self._memory[key]
+            entry = self._disk_get(key)
+            if entry is not None:
+                self._remember(key, *entry)
+                self.hits += 1
+                self.disk_hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def put(self, key: str, response: str) -> None:
+        created = time.time()
+        with self._lock:
+            self._remember(key, created, response)
+            self._disk_put(key, created, response)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self.disk_dir is not None:
+                for p in self.disk_dir.glob("*/*.json"):
+                    p.unlink(missing_ok=True)
+                self._disk_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "memory_entries": len(self._memory),
+        }
+
+
+_DEFAULT: Optional[LLMCache] = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def default_cache() -> LLMCache:
+    """Process-wide cache with a disk tier under DEFAULT_CACHE_DIR (override: AINSIGHT_LLM_CACHE_DIR)."""
+    global _DEFAULT
+    with _DEFAULT_LOCK:
+        if _DEFAULT is None:
+            _DEFAULT = LLMCache(disk_dir=DEFAULT_CACHE_DIR)
+        return _DEFAULT
+
+
+def cached_llm_call(
+    prompt: str,
+    *,
+    model_id: Optional[str] = None,
+    max_tokens: int = 50,
+    cache: Optional[LLMCache] = None,
+    call: Optional[Callable[..., str]] = None,
+    **call_kwargs: Any,
+) -> str:
+    """`call_claude_sonnet` behind an `LLMCache`, keyed by (model_id, max_tokens, prompt).
+
+    `call` replaces the underlying LLM function (same signature as
+    `tzarfati_func.call_claude_sonnet`); failed calls are not cached.
+    """
+    if call is None:
+        from tzarfati_func import DEFAULT_MODEL_ID, call_claude_sonnet
+
+        call = call_claude_sonnet
+        model_id = model_id or DEFAULT_MODEL_ID
+    if model_id is None:
+        raise ValueError("model_id is required with a custom `call`")
+    cache = cache if cache is not None else default_cache()
+    key = cache_key(model_id, max_tokens, prompt)
+    hit = cache.get(key)
+    if hit is not None:
+        return hit
+    response = call(prompt, model_id=model_id, max_tokens=max_tokens, **call_kwargs)
+    cache.put(key, response)
+    return response
+
+
+def cached_llm_stream(
+    prompt: str,
+    *,
+    model_id: Optional[str] = None,
+    max_tokens: int = 50,
+    cache: Optional[LLMCache] = None,
+    stream: Optional[Callable[..., Iterator[str]]] = None,
+    stop: Optional[Callable[[], bool]] = None,
+    **call_kwargs: Any,
+) -> Iterator[str]:
+    """Streaming counterpart of `cached_llm_call`: yields text deltas.
+
+    A cache hit yields the whole stored response at once. On a miss, deltas come
+    from `stream` (default `tzarfati_func.call_claude_sonnet_stream`) and the
+    response is cached only if the stream is read to the end, so a caller that
+    stops early never leaves a truncated response in the cache.
+
+    `stop()` is checked after each delta has been consumed: once it returns True
+    the stream is closed and the text received so far is cached as the response.
+    Use it when the caller can tell the answer is complete (e.g. its JSON object
+    closed) and the rest of the generation is of no use.
+    """
+    if stream is None:
+        from tzarfati_func import DEFAULT_MODEL_ID, call_claude_sonnet_stream
+
+        stream = call_claude_sonnet_stream
+        model_id = model_id or DEFAULT_MODEL_ID
+    if model_id is None:
+        raise ValueError("model_id is required with a custom `stream`")
+    cache = cache if cache is not None else default_cache()
+    key = cache_key(model_id, max_tokens, prompt)
+    hit = cache.get(key)
+    if hit is not None:
+        yield hit
+        return
+    parts = []
+    deltas = stream(prompt, model_id=model_id, max_tokens=max_tokens, **call_kwargs)
+    try:
+        for delta in deltas:
+            parts.append(delta)
+            yield delta
+            if stop is not None and stop():
+                break
+    finally:
+        close = getattr(deltas, "close", None)
+        if close is not None:
+            close()
+    cache.put(key, "".join(parts))
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Literal, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+
+Direction = Literal["nearest", "backward", "forward"]
+
+
+@dataclass(frozen=True)
+class Source:
+    """One telemetry stream to align.
+
+    - data: CSV path or an already-loaded DataFrame.
+    - time_column: the stream's own time column (e.g. "imu_time").
+    - columns: signals to keep (default: all but the time column).
+    - prefix: prepended to every kept signal, to keep names unique across streams.
+    - direction / tolerance: per-source override of the `align_sources` defaults.
+    """
+
+    data: Union[str, Path, pd.DataFrame]
+    time_column: str = "time"
+    columns: Optional[Sequence[str]] = None
+    prefix: str = ""
+    direction: Optional[Direction] = None
+    tolerance: Optional[float] = None
+
+
+def load_source(source: Source, *, time_column: str = "time") -> pd.DataFrame:
+    """Load one source as a frame sorted by time (renamed to `time_column`), NaN times dropped.
+
+    Only the time column and the requested signals are parsed. Already-sorted
+    logs (the usual case) are detected with one vectorized check and not re-sorted.
+    """
+    keep = None if source.columns is None else list(dict.fromkeys([source.time_column, *source.columns]))
+    if isinstance(source.data, pd.DataFrame):
+        df = source.data if keep is None else source.data[keep]
+    else:
+        df = pd.read_csv(source.data, usecols=keep)
+
+    t = df[source.time_column].to_numpy(dtype=np.float64, na_value=np.nan)
+    signals = [c for c in df.columns if c != source.time_column]
+    out = df[signals].rename(columns={c: f"{source.prefix}{c}" for c in signals})
+    out.insert(0, time_column, t)
+
+    valid = ~np.isnan(t)
+    if not valid.all():
+        out, t = out[valid], t[valid]
+    if len(t) > 1 and not bool(np.all(t[1:] >= t[:-1])):
+        out = out.iloc[np.argsort(t, kind="stable")]
+    return out.reset_index(drop=True)
+
+
+def align_sources(
+    sources: Sequence[Union[Source, pd.DataFrame, str, Path]],
+    *,
+    base: Union[int, np.ndarray] = 0,
+    direction: Direction = "nearest",
+    tolerance: Optional[float] = None,
+    time_column: str = "time",
+) -> pd.DataFrame:
+    """Join several streams onto one timeline with vectorized as-of merges.
+
+    - base: index of the source whose samples form the timeline, or an explicit
+      array of times (e.g. a uniform grid).
+    - direction: "nearest" or "backward" (previous sample), as in `pd.merge_asof`.
+    - tolerance: max time distance of a matched sample; farther samples give NaN.
+
+    Each source is loaded and sorted once; each join is one `merge_asof` (binary
+    search in pandas' C code). The result has a RangeIndex and one `time_column`,
+    so `detect_events(result, rules, time_column=...)` can use signals from any source.
+    Raises ValueError if two sources would produce the same column name.
+    """
+    specs = [s if isinstance(s, Source) else Source(s) for s in sources]
+    if not specs:
+        raise ValueError("align_sources needs at least one source")
+    frames = [load_source(s, time_column=time_column) for s in specs]
+
+    names: List[str] = [c for f in frames for c in f.columns if c != time_column]
+    dupes = sorted({c for c in names if names.count(c) > 1})
+    if dupes:
+        raise ValueError(f"column names clash across sources (use Source.prefix): {dupes}")
+
+    if isinstance(base, (int, np.integer)):
+        out = frames[base]
+        others = [(s, f) for k, (s, f) in enumerate(zip(specs, frames)) if k != base]
+    else:
+        grid = np.sort(np.asarray(base, dtype=np.float64))
+        out = pd.DataFrame({time_column: grid})
+        others = list(zip(specs, frames))
+
+    for spec, frame in others:
+        out = pd.merge_asof(
+            out,
+            frame,
+            on=time_column,
+            direction=spec.direction or direction,
+            tolerance=spec.tolerance if spec.tolerance is not None else tolerance,
+        )
+    return out.reset_index(drop=True)
@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from event_intervals import merge_peaks
+from rule_core import comparison_of, is_logic
+from rule_engine import _FrameContext
+
+
+SEVERITY_RANK = {"high": 0, "medium": 1, "low": 2}
+CHARS_PER_TOKEN = 4
+FULL_SAMPLE = 1000
+
+
+def estimate_tokens(text: str) -> int:
+    """Fast local token estimate (~4 characters per token for English/JSON)."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def compact_json(obj: Any) -> str:
+    """JSON without indentation or spaces after separators."""
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+# -------------------------
+# Compared values
+# -------------------------
+
+
+def _comparisons(rules: Sequence[Dict[str, Any]]) -> Dict[Any, Optional[Dict[str, Any]]]:
+    """Rule name -> plain comparison of its condition (None for all/any/not rules)."""
+    return {
+        r.get("name"): None if not isinstance(r.get("condition"), dict) or is_logic(r["condition"])
+        else comparison_of(r["condition"])
+        for r in rules
+    }
+
+
+def event_values(
+    events: Sequence[Dict[str, Any]],
+    rules: Sequence[Dict[str, Any]] = (),
+    df=None,
+    *,
+    time_column: str = "time",
+) -> List[Optional[float]]:
+    """The compared value behind each event (None if unknown).
+
+    Interval events (`coalesce=True`) carry it as `peak`. For point events it is
+    read from `df`: the rule's compared series (the signal, or its rolling/delta
+    aggregate) at the event's sample. Needs the rule in `rules`; all/any/not
+    rules have no single compared value.
+    """
+    out: List[Optional[float]] = [e.get("peak") for e in events]
+    if df is None:
+        return out
+    ctx = _FrameContext(df, time_column=time_column)
+    by_rule: Dict[Any, Dict[float, float]] = {}
+    for r in rules:
+        cond = r.get("condition")
+        if not isinstance(cond, dict) or is_logic(cond):
+            continue
+        mask, series, _ = ctx.leaf(cond, keep_series=True)
+        hits = np.flatnonzero(mask)
+        if series is None or not len(hits):
+            continue
+        # point events are emitted once per hit sample, keyed by that sample's time
+        lookup: Dict[float, float] = {}
+        for t, v in zip(ctx.times()[hits].tolist(), np.asarray(series, dtype=np.float64)[hits].tolist()):
+            lookup.setdefault(t, v)
+        by_rule[r.get("name")] = lookup
+    for k, e in enumerate(events):
+        if out[k] is None and "end_time" not in e:
+            out[k] = by_rule.get(e.get("event"), {}).get(e.get("time"))
+    return out
+
+
+def excess(value: Optional[float], cmp: Optional[Dict[str, Any]]) -> float:
+    """How far `value` lies past the rule's threshold (0 if unknown).
+
+    lt/lte: below the value; gt/gte: above it; eq/between: distance from the
+    target / the middle of the range (the `peak` direction of `event_intervals`).
+    """
+    if value is None or cmp is None:
+        return 0.0
+    op = cmp.get("operator")
+    if op in ("lt", "lte"):
+        return float(cmp["value"]) - value
+    if op in ("gt", "gte"):
+        return value - float(cmp["value"])
+    if op == "between":
+        return abs(value - (cmp["min"] + cmp["max"]) / 2.0)
+    if op == "eq":
+        return abs(value - cmp["value"])
+    return 0.0
+
+
+# -------------------------
+# Per-rule aggregates
+# -------------------------
+
+
+def summarize_events(
+    events: Sequence[Dict[str, Any]],
+    rules: Sequence[Dict[str, Any]] = (),
+    values: Optional[Sequence[Optional[float]]] = None,
+) -> List[Dict[str, Any]]:
+    """One aggregate per rule: count, first/last time, total duration and worst value.
+
+    `worst` is the most extreme compared value over the rule's events, in the
+    direction of its condition (lowest for lt/lte, highest for gt/gte, farthest
+    from the target for eq/between). Values come from `values` (see
+    `event_values`), else from interval `peak`s; `worst` is left out when the
+    rule is not in `rules` or no value is known. Most severe rule first.
+    """
+    cmps = _comparisons(rules)
+    if values is None:
+        values = [e.get("peak") for e in events]
+    out: Dict[Any, Dict[str, Any]] = {}
+    worst: Dict[Any, Optional[float]] = {}
+    for e, v in zip(events, values):
+        name = e.get("event")
+        agg = out.get(name)
+        t0 = e.get("time")
+        t1 = e.get("end_time", t0)
+        if agg is None:
+            agg = out[name] = {
+                "event": name,
+                "severity": e.get("severity"),
+                "description": e.get("details"),
+                "count": 0,
+                "first_time": t0,
+                "last_time": t1,
+            }
+            worst[name] = v
+        else:
+            agg["first_time"] = min(agg["first_time"], t0)
+            agg["last_time"] = max(agg["last_time"], t1)
+            w = worst[name]
+            worst[name] = v if w is None else w if v is None else merge_peaks(w, v, cmps.get(name))
+        agg["count"] += 1
+        if "duration" in e:
+            agg["total_duration"] = agg.get("total_duration", 0.0) + (e["duration"] or 0.0)
+    for name, agg in out.items():
+        if worst[name] is not None and cmps.get(name) is not None:
+            agg["worst"] = worst[name]
+    return sorted(out.values(), key=lambda a: (SEVERITY_RANK.get(a["severity"], len(SEVERITY_RANK)), -a["count"]))
+
+
+# -------------------------
+# Budgeted payload
+# -------------------------
+
+
+def _compact_event(e: Dict[str, Any], ndigits: Optional[int]) -> Dict[str, Any]:
+    """Event without None fields and `details` (already in the rule's summary)."""
+    out = {}
+    for k, v in e.items():
+        if v is None or k == "details":
+            continue
+        if ndigits is not None and isinstance(v, float):
+            v = round(v, ndigits)
+        out[k] = v
+    return out
+
+
+def _full_tokens(events: Sequence[Dict[str, Any]]) -> int:
+    """Tokens of `json.dumps(events, indent=2)`; extrapolated from an even sample of long lists."""
+    n = len(events)
+    if n <= FULL_SAMPLE:
+        return estimate_tokens(json.dumps(list(events), indent=2))
+    step = n / FULL_SAMPLE
+    sample = [events[int(i * step)] for i in range(FULL_SAMPLE)]
+    return int(estimate_tokens(json.dumps(sample, indent=2)) * n / FULL_SAMPLE)
+
+
+def _severity_order(
+    events: Sequence[Dict[str, Any]],
+    values: Sequence[Optional[float]],
+    cmps: Dict[Any, Optional[Dict[str, Any]]],
+) -> List[int]:
+    """Event positions, most severe first.
+
+    Severity level, then how far past its threshold the event went (relative to
+    the largest excess of the same rule, so rules with different units
+    interleave fairly), then duration, then time.
+    """
+    ex = [excess(v, cmps.get(e.get("event"))) for e, v in zip(events, values)]
+    top: Dict[Any, float] = {}
+    for e, x in zip(events, ex):
+        name = e.get("event")
+        top[name] = max(top.get(name, 0.0), x)
+
+    def key(k: int) -> Tuple[int, float, float, float]:
+        e = events[k]
+        scale = top[e.get("event")]
+        return (
+            SEVERITY_RANK.get(e.get("severity"), len(SEVERITY_RANK)),
+            -(ex[k] / scale if scale > 0 else 0.0),
+            -(e.get("duration") or 0.0),
+            e.get("time") or 0.0,
+        )
+
+    return sorted(range(len(events)), key=key)
+
+
+def budget_events(
+    events: Sequence[Dict[str, Any]],
+    *,
+    budget_tokens: int = 2000,
+    rules: Sequence[Dict[str, Any]] = (),
+    df=None,
+    time_column: str = "time",
+    ndigits: Optional[int] = 3,
+) -> Tuple[str, Dict[str, Any]]:
+    """Compact JSON payload of `events` that fits in about `budget_tokens` tokens.
+
+    The payload is {"summary": per-rule aggregates (`summarize_events`),
+    "events": individual events, "omitted": count left out}. The summary is
+    always included; individual events are added most severe first (see
+    `_severity_order`) while they fit, and listed in time order.
+
+    Pass the frame the events came from as `df` for point events: their
+    compared values (`event_values`) then rank them, give each rule's `worst`,
+    and are included as `value`. Floats are rounded to `ndigits` decimals (None
+    keeps them as-is) and None fields are dropped.
+
+    Returns (payload, report); the report compares the estimate against the
+    old `json.dumps(events, indent=2)` embedding.
+    """
+    values = event_values(events, rules, df, time_column=time_column)
+    summary = [_compact_event(a, ndigits) for a in summarize_events(events, rules, values)]
+    base = {"summary": summary, "events": [], "omitted": len(events)}
+    used = estimate_tokens(compact_json(base))
+
+    kept: List[Dict[str, Any]] = []
+    for k in _severity_order(events, values, _comparisons(rules)):
+        e = events[k]
+        if "peak" not in e and values[k] is not None:
+            e = {**e, "value": values[k]}
+        ce = _compact_event(e, ndigits)
+        cost = estimate_tokens(compact_json(ce)) + 1  # + separator
+        if used + cost > budget_tokens:
+            break  # events are similar in size; the rest would not fit either
+        kept.append(ce)
+        used += cost
+    kept.sort(key=lambda ce: ce.get("time") or 0.0)
+
+    payload = compact_json({"summary": summary, "events": kept, "omitted": len(events) - len(kept)})
+    full = _full_tokens(events)
+    tokens = estimate_tokens(payload)
+    report = {
+        "budget_tokens": budget_tokens,
+        "tokens": tokens,
+        "tokens_full": full,
+        "tokens_saved": max(0, full - tokens),
+        "events_total": len(events),
+        "events_kept": len(kept),
+        "over_budget": tokens > budget_tokens,
+    }
+    return payload, report
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+DEFAULT_K = 200
+
+
+class KLLSketch:
+    """Mergeable streaming quantile sketch (KLL).
+
+    Items live in levels of compactors; an item at level h stands for 2**h
+    samples. When a level overflows it is sorted and every other item (random
+    offset) moves up one level, so memory stays O(k) whatever the stream length,
+    and rank error is roughly 1.7/k of n (~1% at the default k=200). Updates take
+    whole arrays: one sort per overflowing level, no per-sample Python work.
+
+    NaNs are ignored; min and max are exact.
+    """
+
+    def __init__(self, k: int = DEFAULT_K, *, seed: Optional[int] = 0) -> None:
+        if k < 8:
+            raise ValueError("k must be at least 8")
+        self.k = k
+        self.n = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+        self._view: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return self.n
+
+    # -------------------------
+    # Building
+    # -------------------------
+
+    def _capacity(self, h: int) -> int:
+        depth = len(self._levels) - 1 - h
+        return max(2, int(math.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def _compress(self) -> None:
+        h = 0
+        while h < len(self._levels):
+            level = self._levels[h]
+            if len(level) > self._capacity(h):
+                if h + 1 == len(self._levels):
+                    self._levels.append(np.empty(0))
+                level = np.sort(level)
+                odd = len(level) % 2
+                promoted = level[odd + int(self._rng.integers(2)) :: 2]
+                self._levels[h] = level[:odd]  # an odd leftover keeps its weight here
+                self._levels[h + 1] = np.concatenate([self._levels[h + 1], promoted])
+            h += 1
+
+    def update(self, values: Any) -> None:
+        x = np.asarray(values, dtype=np.float64).ravel()
+        x = x[~np.isnan(x)]
+        if len(x) == 0:
+            return
+        self.n += len(x)
+        self.min = min(self.min, float(x.min()))
+        self.max = max(self.max, float(x.max()))
+        self._levels[0] = np.concatenate([self._levels[0], x])
+        self._compress()
+        self._view = None
+
+    def copy(self) -> "KLLSketch":
+        out = KLLSketch(self.k)
+        out.n, out.min, out.max = self.n, self.min, self.max
+        out._levels = list(self._levels)  # levels are replaced, never mutated in place
+        out._rng = np.random.default_rng(self._rng.integers(2**32))
+        return out
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """Combine two sketches (in place); returns self."""
+        if other.n == 0:
+            return self
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0))
+        for h, level in enumerate(other._levels):
+            self._levels[h] = np.concatenate([self._levels[h], level])
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        self._view = None
+        return self
+
+    # -------------------------
+    # Queries
+    # -------------------------
+
+    def _sorted(self) -> Tuple[np.ndarray, np.ndarray]:
+        """All retained items sorted, with cumulative weights (cached until the next update)."""
+        if self._view is None:
+            items = np.concatenate(self._levels)
+            weights = np.concatenate([np.full(len(lv), 2.0**h) for h, lv in enumerate(self._levels)])
+            order = np.argsort(items, kind="stable")
+            self._view = (items[order], np.cumsum(weights[order]))
+        return self._view
+
+    def quantile(self, q: float) -> float:
+        return float(self.quantiles([q])[0])
+
+    def quantiles(self, qs: Sequence[float]) -> np.ndarray:
+        """Approximate q-quantiles (q in [0, 1]); q=0 and q=1 give the exact min/max."""
+        q = np.asarray(qs, dtype=np.float64)
+        if self.n == 0:
+            return np.full(q.shape, np.nan)
+        items, cum = self._sorted()
+        pos = np.searchsorted(cum, q * self.n, side="left")
+        out = items[np.minimum(pos, len(items) - 1)]
+        return np.where(q <= 0, self.min, np.where(q >= 1, self.max, out))
+
+    def cdf(self, x: float) -> float:
+        """Approximate fraction of samples <= x."""
+        if self.n == 0:
+            return math.nan
+        items, cum = self._sorted()
+        i = int(np.searchsorted(items, x, side="right"))
+        return float(cum[i - 1] / self.n) if i else 0.0
+
+    def fraction_above(self, x: float) -> float:
+        """Approximate fraction of samples > x."""
+        return 1.0 - self.cdf(x) if self.n else math.nan
+
+    # -------------------------
+    # Serialization
+    # -------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "k": self.k,
+            "n": self.n,
+            "min": self.min,
+            "max": self.max,
+            "levels": [lv.tolist() for lv in self._levels],
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "KLLSketch":
+        sk = cls(d["k"])
+        sk.n, sk.min, sk.max = d["n"], d["min"], d["max"]
+        sk._levels = [np.asarray(lv, dtype=np.float64) for lv in d["levels"]] or [np.empty(0)]
+        return sk
@@ -5,10 +5,12 @@ from typing import Any, Dict, List, Literal, Optional, Tuple
 
 from rule_builder import make_rule
 from extract_CSV_columns import *
+from json_stream import IncrementalJSON
 
 try:
     # Optional: enable LLM-based parsing
     from tzarfati_func import call_claude_sonnet  # type: ignore
+    from llm_cache import cached_llm_call, cached_llm_stream
 except Exception:  # pragma: no cover
     call_claude_sonnet = None  # type: ignore
 
@@ -155,14 +157,49 @@ def _parse_minmax(text: str) -> Tuple[Optional[float], Optional[float]]:
     return None, None
 
 
+def _json_patch(parser: IncrementalJSON) -> Optional[Dict[str, Any]]:
+    """Every field of the parsed object, or None unless the object closed.
+
+    All fields are kept: the user may answer more than the current slot ("below
+    -1.5, call it rapid_descent") and those would otherwise cost another
+    question. An object cut off mid-way (max_tokens, dropped stream) is not
+    trusted, so the caller falls back to deterministic parsing.
+    """
+    return dict(parser.fields) if parser.complete else None
+
+
+def _stream_patch(prompt: str) -> Optional[Dict[str, Any]]:
+    """Stream the LLM answer and parse it while it arrives.
+
+    Stops reading as soon as the object's closing brace arrives, without
+    waiting for any trailing text or the end of the message; the object text is
+    what gets cached. See `_json_patch` for the result.
+    """
+    parser = IncrementalJSON()
+    deltas = cached_llm_stream(prompt, stop=lambda: parser.complete)
+    try:
+        for delta in deltas:
+            parser.feed(delta)
+    finally:
+        deltas.close()
+    return _json_patch(parser)
+
+
 def parse_user_answer(
     slot: str,
     user_text: str,
     *,
     available_signals: Optional[List[str]] = None,
     use_llm: bool = False,
+    stream: bool = False,
 ) -> Dict[str, Any]:
-    """Parse user answer into dict patch to apply onto draft."""
+    """Parse user answer into dict patch to apply onto draft.
+
+    The LLM answer is read up to the end of its first JSON object (text around
+    it, such as a code fence, is ignored). With `stream=True` it is streamed and
+    parsed while it arrives (see `_stream_patch`), which yields the same patch as
+    without streaming.
+    """
     available_signals = available_signals or []
 
     # Optional LLM: keep minimal responsibility (only slot-filling)
@@ -191,15 +228,14 @@ Rules:
 - Numbers must be numbers (not strings).
 """.strip()
 
-        raw = call_claude_sonnet(prompt)
-        try:
-            import json
-
-            obj = json.loads(raw)
-            if isinstance(obj, dict):
-                return obj
-        except Exception:
-            pass
+        if stream:
+            obj = _stream_patch(prompt)
+        else:
+            parser = IncrementalJSON()
+            parser.feed(cached_llm_call(prompt))
+            obj = _json_patch(parser)
+        if obj is not None:
+            return obj
         # fall back to deterministic parsing
 
     patch: Dict[str, Any] = {}
@@ -336,9 +372,11 @@ class RuleCreator:
         *,
         available_signals: Optional[List[str]] = None,
         use_llm: bool = False,
+        stream: bool = False,
     ) -> None:
         self.available_signals = available_signals or []
         self.use_llm = use_llm
+        self.stream = stream
         self.state = DraftState(draft={})
         self.last_user_text: Optional[str] = None
         self.final_rule: Optional[Dict[str, Any]] = None
@@ -392,6 +430,7 @@ class RuleCreator:
             user_text,
             available_signals=self.available_signals,
             use_llm=self.use_llm,
+            stream=self.stream,
         )
         self.state.draft = apply_patch(self.state.draft, patch)
         self._refresh()
@@ -426,7 +465,7 @@ def run_cli_demo() -> None:
     """Small interactive demo in the terminal."""
     signals = extract_csv_columns("NavGpsMetry.csv")
     print(signals)
-    rc = RuleCreator(available_signals=signals, use_llm=True)
+    rc = RuleCreator(available_signals=signals, use_llm=True, stream=True)
     print("RuleCreator (type 'exit' to stop)")
     print(rc.start())
 
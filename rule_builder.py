@@ -1,9 +1,67 @@
 # rule_builder.py
 from __future__ import annotations
-from typing import Any, Dict, Literal, Optional
+from typing import Any, Dict, Optional
+
+from rule_core import (
+    COMPARE_OPERATORS,
+    DERIVED_OPERATORS,
+    OPERATORS,
+    WINDOW_OPERATORS,
+    CompareOperator,
+    Operator,
+    Severity,
+    is_logic,
+)
+
+def make_condition(
+    signal: str,
+    operator: Operator,
+    *,
+    value: Optional[float] = None,
+    min_value: Optional[float] = None,
+    max_value: Optional[float] = None,
+    window: Optional[int] = None,
+    compare: Optional[CompareOperator] = None,
+) -> Dict[str, Any]:
+    """Build one signal/operator condition (a leaf of a condition tree)."""
+    cond: Dict[str, Any] = {"signal": signal, "operator": operator}
+    if operator in WINDOW_OPERATORS:
+        cond["window"] = window
+    test = operator
+    if operator in DERIVED_OPERATORS:
+        cond["compare"] = compare
+        test = compare
+
+    if test == "between":
+        cond["min"] = min_value
+        cond["max"] = max_value
+    else:
+        cond["value"] = value
+    return cond
+
+
+def describe_condition(cond: Dict[str, Any]) -> str:
+    """Short human-readable text for a condition (leaf or all/any/not tree)."""
+    if is_logic(cond):
+        if "not" in cond:
+            return f"not ({describe_condition(cond['not'])})"
+        key = "all" if "all" in cond else "any"
+        joiner = " and " if key == "all" else " or "
+        return joiner.join(f"({describe_condition(c)})" for c in cond[key])
+
+    signal, operator = cond.get("signal"), cond.get("operator")
+    subject, test = signal, operator
+    if operator in WINDOW_OPERATORS:
+        subject = f"{operator}({signal}, {cond.get('window')})"
+    elif operator in DERIVED_OPERATORS:
+        subject = f"{operator}({signal})"
+    if operator in DERIVED_OPERATORS:
+        test = cond.get("compare")
+
+    if test == "between":
+        return f"{subject} between {cond.get('min')} and {cond.get('max')}"
+    return f"{subject} {test} {cond.get('value')}"
 
-Operator = Literal["lt", "lte", "gt", "gte", "eq", "between"]
-Severity = Literal["low", "medium", "high"]
 
 def make_rule(
     name: str,
@@ -15,22 +73,28 @@ def make_rule(
     min_value: Optional[float] = None,
     max_value: Optional[float] = None,
     description: Optional[str] = None,
+    window: Optional[int] = None,
+    compare: Optional[CompareOperator] = None,
 ) -> Dict[str, Any]:
     """
     POC builder: returns a rule dict that is JSON-serializable.
     No validations (MSS assumption).
-    """
-    cond: Dict[str, Any] = {"signal": signal, "operator": operator}
 
-    if operator == "between":
-        cond["min"] = min_value
-        cond["max"] = max_value
-        if description is None:
-            description = f"{signal} between {min_value} and {max_value}"
-    else:
-        cond["value"] = value
-        if description is None:
-            description = f"{signal} {operator} {value}"
+    Rolling operators (rolling_mean, ...) take `window` (samples) and `compare`
+    (lt|lte|gt|gte|eq|between), which is applied to the rolling aggregate.
+    Delta operators (delta, abs_delta, rate) take `compare` only.
+    """
+    cond = make_condition(
+        signal,
+        operator,
+        value=value,
+        min_value=min_value,
+        max_value=max_value,
+        window=window,
+        compare=compare,
+    )
+    if description is None:
+        description = describe_condition(cond)
 
     return {
         "name": name,
@@ -39,6 +103,50 @@ def make_rule(
         "condition": cond,
     }
 
+def _normalize_condition(cond: Any, path: str) -> Dict[str, Any]:
+    """Check one condition (recursively for all/any/not) and rebuild it via make_condition."""
+    if not isinstance(cond, dict):
+        raise ValueError(f"{path} must be a dict")
+
+    if is_logic(cond):
+        if len(cond) != 1:
+            raise ValueError(f"{path} must have exactly one of: all,any,not")
+        if "not" in cond:
+            return {"not": _normalize_condition(cond["not"], f"{path}['not']")}
+        key = "all" if "all" in cond else "any"
+        children = cond[key]
+        if not isinstance(children, list) or not children:
+            raise ValueError(f"{path}['{key}'] must be a non-empty list")
+        return {key: [_normalize_condition(c, f"{path}['{key}'][{i}]") for i, c in enumerate(children)]}
+
+    signal = cond.get("signal")
+    if not isinstance(signal, str) or not signal:
+        raise ValueError(f"{path}['signal'] must be a non-empty string")
+
+    operator = cond.get("operator")
+    if operator not in OPERATORS:
+        raise ValueError(f"{path}['operator'] must be one of: " + ",".join(OPERATORS))
+
+    window = cond.get("window")
+    compare = cond.get("compare")
+    if operator in WINDOW_OPERATORS:
+        if not isinstance(window, int) or isinstance(window, bool) or window < 1:
+            raise ValueError(f"{path}['window'] must be a positive integer")
+    if operator in DERIVED_OPERATORS:
+        if compare not in COMPARE_OPERATORS:
+            raise ValueError(f"{path}['compare'] must be one of: " + ",".join(COMPARE_OPERATORS))
+
+    return make_condition(
+        signal,
+        operator,
+        value=cond.get("value"),
+        min_value=cond.get("min"),
+        max_value=cond.get("max"),
+        window=window,
+        compare=compare,
+    )
+
+
 def make_rule_from_dict(rule: Dict[str, Any]) -> Dict[str, Any]:
     """Create a normalized rule from the fixed dict format.
 
@@ -47,10 +155,12 @@ def make_rule_from_dict(rule: Dict[str, Any]) -> Dict[str, Any]:
       "name": str,
       "severity": "low"|"medium"|"high" (optional),
       "description": str (optional),
-      "condition": {"signal": str, "operator": str, "value"?: number, "min"?: number, "max"?: number}
+      "condition": {"signal": str, "operator": str, "value"?: number, "min"?: number, "max"?: number,
+                    "window"?: int, "compare"?: str}
+                   | {"all": [condition, ...]} | {"any": [condition, ...]} | {"not": condition}
     }
 
-    This helper keeps the existing make_rule(...) as the single formatting source.
+    This helper keeps make_condition(...)/describe_condition(...) as the single formatting source.
     """
     if not isinstance(rule, dict):
         raise TypeError("rule must be a dict")
@@ -63,13 +173,7 @@ def make_rule_from_dict(rule: Dict[str, Any]) -> Dict[str, Any]:
     if not isinstance(name, str) or not name:
         raise ValueError("rule['name'] must be a non-empty string")
 
-    signal = cond.get("signal")
-    if not isinstance(signal, str) or not signal:
-        raise ValueError("rule['condition']['signal'] must be a non-empty string")
-
-    operator = cond.get("operator")
-    if operator not in {"lt", "lte", "gt", "gte", "eq", "between"}:
-        raise ValueError("rule['condition']['operator'] must be one of: lt,lte,gt,gte,eq,between")
+    norm = _normalize_condition(cond, "rule['condition']")
 
     sev = rule.get("severity", "medium")
     if sev not in {"low", "medium", "high"}:
@@ -77,22 +181,9 @@ def make_rule_from_dict(rule: Dict[str, Any]) -> Dict[str, Any]:
 
     desc = rule.get("description")
 
-    if operator == "between":
-        return make_rule(
-            name=name,
-            signal=signal,
-            operator="between",
-            severity=sev,
-            min_value=cond.get("min"),
-            max_value=cond.get("max"),
-            description=desc,
-        )
-
-    return make_rule(
-        name=name,
-        signal=signal,
-        operator=operator,  # type: ignore[arg-type]
-        severity=sev,
-        value=cond.get("value"),
-        description=desc,
-    )
+    return {
+        "name": name,
+        "severity": sev,
+        "description": desc if desc is not None else describe_condition(norm),
+        "condition": norm,
+    }
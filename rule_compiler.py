@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Literal, Optional, Sequence, Tuple
+
+import numpy as np
+
+from event_intervals import interval_events
+from rule_core import condition_leaves, condition_lookback, condition_signals, is_logic, validate_rule
+from rule_engine import _emit_indices, _FrameContext, _needs_time
+from threshold_index import ThresholdIndex, is_indexable
+from time_index import time_index
+
+
+PlanMode = Literal["auto", "mask", "index"]
+
+# in "auto" mode a signal uses a threshold index only when it has at least this
+# many indexable rules that are sparse on the data (estimated per run from a
+# sample). Below that, one mask per rule is cheaper: the index pays a full sort
+# of the column's codes (crossover ~45 sparse rules on 746k rows), and dense
+# rules gain nothing from it.
+INDEX_MIN_RULES = 48
+
+
+# -------------------------
+# Plan structures
+# -------------------------
+
+
+@dataclass(frozen=True)
+class SignalGroup:
+    """All rules (by position in the rule-set) that read the same signal.
+
+    `indexed` rules are answered by `index` in one sorted pass; the rest get a mask each.
+    With `auto`, the index is used only if enough indexed rules are sparse on the data.
+    """
+
+    signal: str
+    rule_indices: Tuple[int, ...]
+    indexed: Tuple[int, ...] = ()
+    index: Optional[ThresholdIndex] = None
+    auto: bool = False
+
+    def use_index(self, values: np.ndarray) -> bool:
+        if self.index is None or values.dtype != np.float64:
+            return False
+        return not self.auto or self.index.sparse_count(values) >= INDEX_MIN_RULES
+
+
+class ExecutionPlan:
+    """Compiled rule-set: rules grouped by signal, each column extracted once per run.
+
+    Single-condition rules are grouped by signal; all/any/not rules are kept in
+    `logic` and share leaf results with each other and with the grouped rules.
+    `run(df)` returns the same events, in the same order, as `detect_events(df, rules)`.
+    """
+
+    def __init__(
+        self,
+        rules: List[Dict[str, Any]],
+        groups: Tuple[SignalGroup, ...],
+        key: str,
+        logic: Tuple[int, ...] = (),
+    ) -> None:
+        self.rules = rules
+        self.groups = groups
+        self.logic = logic
+        self.key = key
+
+    @property
+    def signals(self) -> List[str]:
+        """Every signal any rule reads, in first-use order."""
+        return list(dict.fromkeys(s for r in self.rules for s in condition_signals(r["condition"])))
+
+    @property
+    def lookback(self) -> int:
+        """Preceding samples any rule needs (window length, 1 for delta rules)."""
+        return max((condition_lookback(r["condition"]) for r in self.rules), default=0)
+
+    @property
+    def needs_time(self) -> bool:
+        return any(_needs_time(leaf) for r in self.rules for leaf in condition_leaves(r["condition"]))
+
+    def __repr__(self) -> str:
+        return f"ExecutionPlan(rules={len(self.rules)}, signals={self.signals}, key={self.key[:12]})"
+
+    def _evaluate(self, df, keep_series: bool, origin: int = 0, time_column: str = "time"):
+        """Per rule: hit positions, and (if asked) the compared series and comparison.
+
+        `origin` is the global sample index of df's first row (chunked evaluation).
+        """
+        n_rules = len(self.rules)
+        hits: List[Optional[np.ndarray]] = [None] * n_rules
+        series: List[Optional[np.ndarray]] = [None] * n_rules
+        cmps: List[Optional[Dict[str, Any]]] = [None] * n_rules
+        ctx = _FrameContext(df, origin, time_column)
+        for group in self.groups:
+            values = ctx.values(group.signal)
+            if group.use_index(values):
+                for idx, h in zip(group.indexed, group.index.hit_indices(values)):
+                    hits[idx] = h
+                    if keep_series:
+                        series[idx], cmps[idx] = values, self.rules[idx]["condition"]
+            for idx in group.rule_indices:
+                if hits[idx] is not None:
+                    continue
+                mask, s, cmp = ctx.leaf(self.rules[idx]["condition"], keep_series=keep_series)
+                hits[idx] = np.flatnonzero(mask)
+                if keep_series:
+                    series[idx], cmps[idx] = s, cmp
+        for idx in self.logic:
+            hits[idx] = np.flatnonzero(ctx.mask(self.rules[idx]["condition"]))
+        return hits, series, cmps
+
+    def evaluate_hits(self, df, *, time_column: str = "time") -> List[np.ndarray]:
+        """Return, per rule (rule-set order), the ascending row positions where it fires."""
+        return self._evaluate(df, keep_series=False, time_column=time_column)[0]
+
+    def run(
+        self,
+        df,
+        *,
+        time_column: str = "time",
+        coalesce: bool = False,
+        max_gap: int = 0,
+        min_samples: int = 1,
+    ) -> List[Dict[str, Any]]:
+        """Evaluate the plan; options as in `detect_events`."""
+        hits, series, cmps = self._evaluate(df, keep_series=coalesce, time_column=time_column)
+
+        def get_times() -> np.ndarray:
+            return time_index(df, time_column).times
+
+        events: List[Dict[str, Any]] = []
+        for k, (rule, idx) in enumerate(zip(self.rules, hits)):
+            name, severity, desc = rule.get("name"), rule.get("severity"), rule.get("description")
+            if coalesce:
+                events.extend(
+                    interval_events(
+                        idx, get_times(), name, severity, desc,
+                        series=series[k], cmp=cmps[k], max_gap=max_gap, min_samples=min_samples,
+                    )
+                )
+            else:
+                _emit_indices(events, idx, get_times, name, severity, desc)
+        return events
+
+
+# -------------------------
+# Compile + cache
+# -------------------------
+
+
+# LRU of compiled plans, keyed by mode, strictness and rule-set content
+PLAN_CACHE_SIZE = 256
+_PLAN_CACHE: "OrderedDict[str, ExecutionPlan]" = OrderedDict()
+_PLAN_CACHE_LOCK = threading.Lock()
+
+
+def rule_set_key(rules: Sequence[Dict[str, Any]]) -> str:
+    """Content hash of a rule-set (order-sensitive, key-order-insensitive)."""
+    blob = json.dumps(list(rules), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def clear_plan_cache() -> None:
+    with _PLAN_CACHE_LOCK:
+        _PLAN_CACHE.clear()
+
+
+def compile_rules(
+    rules: Sequence[Dict[str, Any]],
+    *,
+    strict: bool = True,
+    use_cache: bool = True,
+    mode: PlanMode = "auto",
+) -> ExecutionPlan:
+    """Validate a rule-set and build (or fetch from cache) its execution plan.
+
+    Plans are cached (LRU of PLAN_CACHE_SIZE) per (mode, strict, rule-set content).
+
+    mode:
+    - "mask": one vectorized mask per rule.
+    - "index": all threshold/between rules on a signal share one `ThresholdIndex`.
+    - "auto": index a signal only when at least INDEX_MIN_RULES of its indexable
+      rules are sparse (hit at most 1/8 of the samples) on the data being run.
+
+    Raises ValueError listing every validation error found.
+    """
+    if mode not in ("auto", "mask", "index"):
+        raise ValueError("mode must be one of: auto,mask,index")
+
+    # strict is part of the key: a plan compiled with strict=False was never strictly validated
+    key = f"{mode}:{'strict' if strict else 'lax'}:{rule_set_key(rules)}"
+    if use_cache:
+        with _PLAN_CACHE_LOCK:
+            plan = _PLAN_CACHE.get(key)
+            if plan is not None:
+                _PLAN_CACHE.move_to_end(key)
+                return plan
+
+    problems: List[str] = []
+    for i, rule in enumerate(rules):
+        for err in validate_rule(rule, strict=strict):
+            problems.append(f"rules[{i}] {err.path}: {err.message}")
+    if problems:
+        raise ValueError("invalid rule-set:\n" + "\n".join(problems))
+
+    frozen = copy.deepcopy(list(rules))
+    by_signal: Dict[str, List[int]] = {}
+    logic: List[int] = []
+    for i, rule in enumerate(frozen):
+        if is_logic(rule["condition"]):
+            logic.append(i)
+        else:
+            by_signal.setdefault(rule["condition"]["signal"], []).append(i)
+
+    groups: List[SignalGroup] = []
+    for signal, ix in by_signal.items():
+        indexed = tuple(i for i in ix if is_indexable(frozen[i]["condition"]))
+        use_index = mode == "index" or (mode == "auto" and len(indexed) >= INDEX_MIN_RULES)
+        if use_index and indexed:
+            index = ThresholdIndex([frozen[i]["condition"] for i in indexed])
+            groups.append(SignalGroup(signal, tuple(ix), indexed, index, auto=mode == "auto"))
+        else:
+            groups.append(SignalGroup(signal, tuple(ix)))
+    plan = ExecutionPlan(frozen, tuple(groups), key, tuple(logic))
+    if use_cache:
+        with _PLAN_CACHE_LOCK:
+            _PLAN_CACHE[key] = plan
+            while len(_PLAN_CACHE) > PLAN_CACHE_SIZE:
+                _PLAN_CACHE.popitem(last=False)
+    return plan
@@ -1,12 +1,85 @@
 # rule_core.py
 from __future__ import annotations
+import json
 from dataclasses import dataclass
 from typing import Any, Dict, List, Literal, Optional, Union
 
 
-Operator = Literal["lt", "lte", "gt", "gte", "eq", "between"]
+Operator = Literal[
+    "lt", "lte", "gt", "gte", "eq", "between",
+    "rolling_range", "rolling_mean", "rolling_std", "rolling_min", "rolling_max",
+    "delta", "abs_delta", "rate",
+]
+CompareOperator = Literal["lt", "lte", "gt", "gte", "eq", "between"]
 Severity = Literal["low", "medium", "high"]
 
+COMPARE_OPERATORS = ("lt", "lte", "gt", "gte", "eq", "between")
+# rolling operators aggregate the `window` samples preceding each sample, then apply `compare`
+WINDOW_OPERATORS = ("rolling_range", "rolling_mean", "rolling_std", "rolling_min", "rolling_max")
+# delta operators compare each sample with the previous one (rate = delta / time delta), then apply `compare`
+DELTA_OPERATORS = ("delta", "abs_delta", "rate")
+DERIVED_OPERATORS = WINDOW_OPERATORS + DELTA_OPERATORS
+OPERATORS = COMPARE_OPERATORS + DERIVED_OPERATORS
+
+
+def comparison_of(cond: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the plain comparison part of a condition.
+
+    For derived operators (e.g. rolling_mean) this is `compare` plus value/min/max;
+    plain conditions are returned unchanged.
+    """
+    if cond.get("operator") in COMPARE_OPERATORS:
+        return cond
+    out: Dict[str, Any] = {"operator": cond.get("compare")}
+    for k in ("value", "min", "max"):
+        if k in cond:
+            out[k] = cond[k]
+    return out
+
+
+# compound conditions: {"all": [cond, ...]}, {"any": [cond, ...]}, {"not": cond}
+LOGIC_KEYS = ("all", "any", "not")
+
+
+def is_logic(cond: Any) -> bool:
+    return isinstance(cond, dict) and any(k in cond for k in LOGIC_KEYS)
+
+
+def condition_children(cond: Dict[str, Any]) -> List[Dict[str, Any]]:
+    if "not" in cond:
+        return [cond["not"]]
+    return list(cond.get("all") or cond.get("any") or [])
+
+
+def condition_leaves(cond: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """All signal/operator leaves of a condition tree, left to right."""
+    if not is_logic(cond):
+        return [cond]
+    return [leaf for child in condition_children(cond) for leaf in condition_leaves(child)]
+
+
+def condition_signals(cond: Dict[str, Any]) -> List[str]:
+    """Signals a condition reads, de-duplicated, in first-use order."""
+    return list(dict.fromkeys(leaf.get("signal") for leaf in condition_leaves(cond) if leaf.get("signal")))
+
+
+def condition_key(cond: Dict[str, Any]) -> str:
+    """Canonical text of a condition; equal keys evaluate identically on the same data."""
+    return json.dumps(cond, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def condition_lookback(cond: Dict[str, Any]) -> int:
+    """How many preceding samples a condition needs to evaluate one sample."""
+    if is_logic(cond):
+        return max((condition_lookback(c) for c in condition_children(cond)), default=0)
+    op = cond.get("operator")
+    if op in WINDOW_OPERATORS:
+        window = cond.get("window")
+        return window if isinstance(window, int) and window > 0 else 0
+    if op in DELTA_OPERATORS:
+        return 1
+    return 0
+
 
 @dataclass(frozen=True)
 class ValidationError:
@@ -44,41 +117,81 @@ def validate_rule(rule: Dict[str, Any], *, strict: bool = True) -> List[Validati
     if "description" in rule and not isinstance(rule["description"], str):
         errors.append(ValidationError(path="$.description", message="must be a string"))
 
-    # condition validation
-    if isinstance(condition, dict):
+    def check_condition(condition: Any, path: str) -> None:
+        if not isinstance(condition, dict):
+            if condition is not None:
+                errors.append(ValidationError(path=path, message="must be an object"))
+            return
+
+        logic = [k for k in LOGIC_KEYS if k in condition]
+        if logic:
+            if len(condition) != 1:
+                errors.append(ValidationError(path=path, message="a logic node has exactly one key: all|any|not"))
+            for key in logic:
+                child = condition[key]
+                if key == "not":
+                    check_condition(child, f"{path}.not")
+                elif not isinstance(child, list) or not child:
+                    errors.append(ValidationError(path=f"{path}.{key}", message="must be a non-empty list"))
+                else:
+                    for i, c in enumerate(child):
+                        check_condition(c, f"{path}.{key}[{i}]")
+            return
+
         if strict:
-            allowed_cond = {"signal", "operator", "value", "min", "max"}
+            allowed_cond = {"signal", "operator", "value", "min", "max", "window", "compare"}
             for k in condition.keys():
                 if k not in allowed_cond:
-                    errors.append(ValidationError(path=f"$.condition.{k}", message="unexpected field"))
+                    errors.append(ValidationError(path=f"{path}.{k}", message="unexpected field"))
 
-        signal = req_field(condition, "signal", "$.condition")
-        op = req_field(condition, "operator", "$.condition")
+        signal = req_field(condition, "signal", path)
+        op = req_field(condition, "operator", path)
 
         if signal is not None and not isinstance(signal, str):
-            errors.append(ValidationError(path="$.condition.signal", message="must be a string"))
+            errors.append(ValidationError(path=f"{path}.signal", message="must be a string"))
 
-        if op is not None and op not in ("lt", "lte", "gt", "gte", "eq", "between"):
+        if op is not None and op not in OPERATORS:
             errors.append(ValidationError(
-                path="$.condition.operator",
-                message="must be one of lt|lte|gt|gte|eq|between"
+                path=f"{path}.operator",
+                message="must be one of " + "|".join(OPERATORS)
+            ))
+
+        if op in WINDOW_OPERATORS:
+            window = req_field(condition, "window", path)
+            if window is not None and (not isinstance(window, int) or isinstance(window, bool) or window < 1):
+                errors.append(ValidationError(path=f"{path}.window", message="must be a positive integer"))
+        elif "window" in condition:
+            errors.append(ValidationError(path=f"{path}.window", message="only valid with rolling operators"))
+
+        if op in DERIVED_OPERATORS:
+            cmp_op = req_field(condition, "compare", path)
+            if cmp_op is not None and cmp_op not in COMPARE_OPERATORS:
+                errors.append(ValidationError(
+                    path=f"{path}.compare",
+                    message="must be one of lt|lte|gt|gte|eq|between"
+                ))
+            op = cmp_op
+        elif "compare" in condition:
+            errors.append(ValidationError(
+                path=f"{path}.compare",
+                message="only valid with rolling/delta operators"
             ))
 
         if op in ("lt", "lte", "gt", "gte", "eq"):
-            val = req_field(condition, "value", "$.condition")
+            val = req_field(condition, "value", path)
             if val is not None and not isinstance(val, (int, float)):
-                errors.append(ValidationError(path="$.condition.value", message="must be number"))
+                errors.append(ValidationError(path=f"{path}.value", message="must be number"))
         elif op == "between":
-            lo = req_field(condition, "min", "$.condition")
-            hi = req_field(condition, "max", "$.condition")
+            lo = req_field(condition, "min", path)
+            hi = req_field(condition, "max", path)
             if lo is not None and not isinstance(lo, (int, float)):
-                errors.append(ValidationError(path="$.condition.min", message="must be number"))
+                errors.append(ValidationError(path=f"{path}.min", message="must be number"))
             if hi is not None and not isinstance(hi, (int, float)):
-                errors.append(ValidationError(path="$.condition.max", message="must be number"))
+                errors.append(ValidationError(path=f"{path}.max", message="must be number"))
             if isinstance(lo, (int, float)) and isinstance(hi, (int, float)) and lo > hi:
-                errors.append(ValidationError(path="$.condition", message="min must be <= max"))
-    else:
-        if condition is not None:
-            errors.append(ValidationError(path="$.condition", message="must be an object"))
+                errors.append(ValidationError(path=path, message="min must be <= max"))
+
+    # condition validation (leaf or nested all/any/not tree)
+    check_condition(condition, "$.condition")
 
     return errors
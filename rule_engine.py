@@ -1,44 +1,248 @@
-from turtle import pd
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+import numpy as np
 import pandas as pnd
 
-def detect_events(df, rules):
+from rule_core import DELTA_OPERATORS, WINDOW_OPERATORS, comparison_of, condition_key, is_logic
+from event_intervals import interval_events
+from signal_ops import difference, rolling
+from time_index import time_index
+
+
+def _eval_condition_dict(cond: dict, val):
+    """Single-sample evaluator for a dict condition (scalar reference semantics)."""
+    op = cond.get("operator")
+    if op == "between":
+        mn = cond.get("min")
+        mx = cond.get("max")
+        if mn is None or mx is None:
+            return False
+        return mn <= val <= mx
+
+    target = cond.get("value")
+    if target is None:
+        return False
+
+    if op == "lt":
+        return val < target
+    if op == "lte":
+        return val <= target
+    if op == "gt":
+        return val > target
+    if op == "gte":
+        return val >= target
+    if op == "eq":
+        return val == target
+
+    return False
+
+
+def _derive_series(cond: dict, values: np.ndarray, times: Optional[np.ndarray] = None, origin: int = 0):
+    """Return (series, comparison) for a condition.
+
+    Plain conditions compare the column itself; rolling and delta operators first
+    derive a series from it (`rate` needs `times`). `origin` is the global index of
+    values[0] when evaluating a chunk. Returns (None, None) when the series can't
+    be derived.
+    """
+    op = cond.get("operator")
+    if op in WINDOW_OPERATORS:
+        window = cond.get("window")
+        if not isinstance(window, int) or window < 1:
+            return None, None
+        return rolling(values, window, op, origin=origin), comparison_of(cond)
+    if op in DELTA_OPERATORS:
+        if op == "rate" and times is None:
+            return None, None
+        return difference(values, op, times), comparison_of(cond)
+    return values, cond
+
+
+def _compare_mask(cond: dict, values: np.ndarray) -> np.ndarray:
+    """Vectorized lt/lte/gt/gte/eq/between test of a series."""
+    n = len(values)
+    op = cond.get("operator")
+    if op == "between":
+        mn = cond.get("min")
+        mx = cond.get("max")
+        if mn is None or mx is None:
+            return np.zeros(n, dtype=bool)
+        return (values >= mn) & (values <= mx)
+
+    target = cond.get("value")
+    if target is None:
+        return np.zeros(n, dtype=bool)
+
+    if op == "lt":
+        return values < target
+    if op == "lte":
+        return values <= target
+    if op == "gt":
+        return values > target
+    if op == "gte":
+        return values >= target
+    if op == "eq":
+        return values == target
+
+    return np.zeros(n, dtype=bool)
+
+
+def _eval_condition_mask(cond: dict, values: np.ndarray, times: Optional[np.ndarray] = None) -> np.ndarray:
+    """Whole-column version of `_eval_condition_dict`.
+
+    Returns a boolean mask with the same semantics as evaluating every sample
+    with `_eval_condition_dict` (NaN never matches). Rolling and delta operators
+    first derive a series from the column, then apply `compare`; `rate` needs `times`.
+    """
+    series, cmp = _derive_series(cond, values, times)
+    if series is None:
+        return np.zeros(len(values), dtype=bool)
+    return _compare_mask(cmp, series)
+
+
+def _column_values(df, signal: str) -> np.ndarray:
+    """Pull a column as a contiguous array (numeric columns are widened to float64)."""
+    s = df[signal]
+    if pnd.api.types.is_numeric_dtype(s):
+        return np.ascontiguousarray(s.to_numpy(dtype=np.float64, na_value=np.nan))
+    return s.to_numpy()
+
+
+def _needs_time(cond: dict) -> bool:
+    return cond.get("operator") == "rate"
+
+
+class _FrameContext:
+    """Per-DataFrame evaluation cache: each column is extracted once and each distinct
+    leaf condition is evaluated once, however many rules (or logic trees) use it.
+
+    `origin` is the global sample index of df's first row (chunked evaluation).
+    Times come from the frame's cached `time_index.TimeIndex`, so later range
+    queries on the same frame reuse it.
+    """
+
+    def __init__(self, df, origin: int = 0, time_column: str = "time") -> None:
+        self.df = df
+        self.origin = origin
+        self.time_column = time_column
+        self.n = len(df)
+        self._columns: Dict[str, np.ndarray] = {}
+        self._leaf_masks: Dict[str, np.ndarray] = {}
+
+    def values(self, signal: str) -> np.ndarray:
+        if signal not in self._columns:
+            self._columns[signal] = _column_values(self.df, signal)
+        return self._columns[signal]
+
+    def times(self) -> np.ndarray:
+        return time_index(self.df, self.time_column).times
+
+    def leaf(self, cond: dict, keep_series: bool = False):
+        """(mask, series, comparison) of one leaf; series/comparison only if `keep_series`."""
+        if not cond.get("signal"):
+            return np.zeros(self.n, dtype=bool), None, None
+        key = condition_key(cond)
+        mask = self._leaf_masks.get(key)
+        if mask is not None and not keep_series:
+            return mask, None, None
+        times = self.times() if _needs_time(cond) else None
+        series, cmp = _derive_series(cond, self.values(cond["signal"]), times, self.origin)
+        if series is None:
+            mask = np.zeros(self.n, dtype=bool)
+        else:
+            mask = _compare_mask(cmp, series)
+        self._leaf_masks[key] = mask
+        return mask, series, cmp
+
+    def mask(self, cond: dict) -> np.ndarray:
+        """Boolean mask of a condition tree.
+
+        `all` stops at the first child that leaves no sample true, `any` at the
+        first that leaves none false; the remaining leaves are never evaluated.
+        """
+        if "not" in cond:
+            return ~self.mask(cond["not"])
+        if "all" in cond:
+            acc = np.ones(self.n, dtype=bool)
+            for child in cond["all"]:
+                acc = acc & self.mask(child)
+                if not acc.any():
+                    break
+            return acc
+        if "any" in cond:
+            acc = np.zeros(self.n, dtype=bool)
+            for child in cond["any"]:
+                acc = acc | self.mask(child)
+                if acc.all():
+                    break
+            return acc
+        return self.leaf(cond)[0]
+
+
+def _emit_mask(events: list, mask: np.ndarray, get_times, name, severity, desc) -> None:
+    """Append one event per True sample of `mask`; `get_times` is only called when needed."""
+    _emit_indices(events, np.flatnonzero(mask), get_times, name, severity, desc)
+
+
+def _emit_indices(events: list, idx: np.ndarray, get_times, name, severity, desc) -> None:
+    """Append one event per (ascending) sample position in `idx`."""
+    if len(idx) == 0:
+        return
+    times = get_times()[idx]
+    events.extend(
+        {
+            "time": float(t),
+            "event": name,
+            "severity": severity,
+            "details": desc,
+        }
+        for t in times
+    )
+
+
+def detect_events(
+    df,
+    rules,
+    *,
+    time_column: str = "time",
+    coalesce: bool = False,
+    max_gap: int = 0,
+    min_samples: int = 1,
+):
+    """Run rules over a DataFrame and return the list of events.
+
+    `time_column` names the column event times are read from (e.g. "imu_time"
+    for NavGpsMetry logs); events always report it under the "time" key.
+
+    Dict conditions may be single signal/operator leaves or all/any/not trees;
+    identical leaves are evaluated once per call. By default every triggering
+    sample is one event. With `coalesce=True`,
+    consecutive hits of a rule are merged into interval events (see
+    `event_intervals.interval_events`); `max_gap` merges runs separated by up to
+    that many non-hit samples and `min_samples` drops shorter intervals (debounce).
+    """
     events = []
+    ctx = _FrameContext(df, time_column=time_column)
 
     def _emit(i, name, severity, desc):
         events.append(
             {
-                "time": float(df.loc[i, "time"]),
+                "time": float(ctx.times()[i]),
                 "event": name,
                 "severity": severity,
                 "details": desc,
             }
         )
 
-    def _eval_condition_dict(cond: dict, val):
-        op = cond.get("operator")
-        if op == "between":
-            mn = cond.get("min")
-            mx = cond.get("max")
-            if mn is None or mx is None:
-                return False
-            return mn <= val <= mx
-
-        target = cond.get("value")
-        if target is None:
-            return False
-
-        if op == "lt":
-            return val < target
-        if op == "lte":
-            return val <= target
-        if op == "gt":
-            return val > target
-        if op == "gte":
-            return val >= target
-        if op == "eq":
-            return val == target
-
-        return False
+    def _emit_intervals(idx, name, severity, desc, series=None, cmp=None):
+        events.extend(
+            interval_events(
+                idx, ctx.times(), name, severity, desc,
+                series=series, cmp=cmp, max_gap=max_gap, min_samples=min_samples,
+            )
+        )
 
     for rule in rules:
         name = rule.get("name")
@@ -47,16 +251,25 @@ def detect_events(df, rules):
 
         # New format: condition is a dict with signal/operator/... inside it
         cond = rule.get("condition")
+        if is_logic(cond):
+            mask = ctx.mask(cond)
+            if coalesce:
+                _emit_intervals(np.flatnonzero(mask), name, severity, desc)
+            else:
+                _emit_mask(events, mask, ctx.times, name, severity, desc)
+            continue
+
         if isinstance(cond, dict):
             signal = cond.get("signal")
             if not signal:
                 continue
 
-            # POC: dict-based conditions are single-sample evaluators
-            for i in range(len(df)):
-                val = df.loc[i, signal]
-                if _eval_condition_dict(cond, val):
-                    _emit(i, name, severity, desc)
+            # dict-based conditions are single-sample evaluators -> one vectorized mask per rule
+            mask, series, cmp = ctx.leaf(cond, keep_series=coalesce)
+            if coalesce:
+                _emit_intervals(np.flatnonzero(mask), name, severity, desc, series, cmp)
+            else:
+                _emit_mask(events, mask, ctx.times, name, severity, desc)
             continue
 
         # Legacy format: top-level signal and callable condition
@@ -66,34 +279,43 @@ def detect_events(df, rules):
         if not signal or not callable(condition_callable):
             continue
 
+        hits = []
         if "window" in rule:
             w = rule["window"]
             for i in range(w, len(df)):
                 window_vals = df[signal].iloc[i - w : i].values
                 if condition_callable(window_vals):
-                    _emit(i, name, severity, desc)
+                    hits.append(i)
 
         elif getattr(condition_callable, "__code__", None) is not None and condition_callable.__code__.co_argcount == 2:
             for i in range(1, len(df)):
                 curr = df.loc[i, signal]
                 prev = df.loc[i - 1, signal]
                 if condition_callable(curr, prev):
-                    _emit(i, name, severity, desc)
+                    hits.append(i)
 
         else:
             for i in range(len(df)):
                 val = df.loc[i, signal]
                 if condition_callable(val):
-                    _emit(i, name, severity, desc)
+                    hits.append(i)
+
+        if coalesce:
+            _emit_intervals(np.asarray(hits, dtype=np.int64), name, severity, desc)
+        else:
+            for i in hits:
+                _emit(i, name, severity, desc)
 
     return events
 
 
 def main():
-    # -------- 1. Load CSV --------
-    df = pnd.read_csv("flight.csv")
+    from telemetry_loader import load_for_rules
+
     rule = {'name': 'rapid_descent', 'severity': 'medium', 'description': 'vertical_speed lt -1.5', 'condition': {'signal': 'vertical_speed', 'operator': 'lt', 'value': -1.5}}
+    # -------- 1. Load CSV (only the columns the rule reads, compacted) --------
+    df, _ = load_for_rules("flight.csv", [rule], use_cache=True)
     events = detect_events(df, [rule])
     print (events)
 
-#main()
\ No newline at end of file
+#main()
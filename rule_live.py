@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from rule_compiler import compile_rules
+from rule_core import DELTA_OPERATORS, WINDOW_OPERATORS, comparison_of, condition_key, condition_leaves
+from rule_engine import _eval_condition_dict
+
+
+# -------------------------
+# Per-condition state (O(1) amortized per sample)
+# -------------------------
+
+
+def _as_float(v: Any) -> float:
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _div(a: float, b: float) -> float:
+    """a / b with NumPy semantics for b == 0 (the vectorized `rate` path divides arrays)."""
+    if b != 0:
+        return a / b
+    if a == 0 or math.isnan(a) or math.isnan(b):
+        return math.nan
+    return math.copysign(math.inf, a) * math.copysign(1.0, b)
+
+
+class _PlainState:
+    def update(self, value: Any, t: float) -> Any:
+        return value
+
+
+class _DeltaState:
+    """Keeps the previous sample (and its time for `rate`)."""
+
+    def __init__(self, how: str) -> None:
+        self.how = how
+        self.prev: Optional[float] = None
+        self.prev_t: Optional[float] = None
+
+    def update(self, value: Any, t: float) -> Optional[float]:
+        x = _as_float(value)
+        prev, prev_t = self.prev, self.prev_t
+        self.prev, self.prev_t = x, t
+        if prev is None:
+            return None
+        d = x - prev
+        if self.how == "abs_delta":
+            return abs(d)
+        if self.how == "rate":
+            return _div(d, t - prev_t)  # type: ignore[operator]
+        return d
+
+
+class _WindowState:
+    """Ring buffer of the last `window` samples for rolling_min/max/range.
+
+    Monotonic deques keep the extremes (each sample enters and leaves once).
+    NaN and +/-inf are counted rather than queued, and resolve like the
+    vectorized kernels in `signal_ops` (NaN in window -> NaN).
+    """
+
+    def __init__(self, how: str, window: int) -> None:
+        self.how = how
+        self.w = window
+        self.buf: deque = deque()
+        self.n = 0  # samples pushed
+        self.nan = self.pinf = self.ninf = 0
+        self.mins: deque = deque()  # (pos, value), increasing values
+        self.maxs: deque = deque()  # (pos, value), decreasing values
+
+    # --- aggregate of the current window (the `window` samples before this one)
+    def _aggregate(self) -> float:
+        if self.nan:
+            return math.nan
+        lo = -math.inf if self.ninf else self.mins[0][1] if self.mins else math.inf
+        hi = math.inf if self.pinf else self.maxs[0][1] if self.maxs else -math.inf
+        if self.how == "rolling_min":
+            return lo
+        if self.how == "rolling_max":
+            return hi
+        return hi - lo
+
+    def _count(self, x: float, sign: int) -> bool:
+        """Track non-finite samples; returns True if x is finite."""
+        if math.isnan(x):
+            self.nan += sign
+        elif x == math.inf:
+            self.pinf += sign
+        elif x == -math.inf:
+            self.ninf += sign
+        else:
+            return True
+        return False
+
+    def _add(self, x: float) -> None:
+        pos = self.n
+        self.buf.append(x)
+        if self._count(x, +1):
+            while self.mins and self.mins[-1][1] >= x:
+                self.mins.pop()
+            self.mins.append((pos, x))
+            while self.maxs and self.maxs[-1][1] <= x:
+                self.maxs.pop()
+            self.maxs.append((pos, x))
+
+    def _remove(self) -> None:
+        x = self.buf.popleft()
+        old = self.n - self.w  # position of the evicted sample
+        if self.mins and self.mins[0][0] == old:
+            self.mins.popleft()
+        if self.maxs and self.maxs[0][0] == old:
+            self.maxs.popleft()
+        self._count(x, -1)
+
+    def update(self, value: Any, t: float) -> Optional[float]:
+        x = _as_float(value)
+        out = self._aggregate() if len(self.buf) == self.w else None
+        if len(self.buf) == self.w:
+            self._remove()
+        self._add(x)
+        self.n += 1
+        return out
+
+
+class _BlockState:
+    """rolling_mean/std with the block decomposition of `signal_ops._trailing_mean`/`_trailing_std`.
+
+    Samples fall into blocks of `window` aligned to sample 0, and each window is
+    the suffix of the previous block plus the prefix of the current one. The
+    prefix is accumulated as samples arrive; a block's suffixes are computed once
+    it completes. Every float operation is the one the vectorized kernel performs,
+    in the same order, so the values are bit-identical (NaN/inf included) at O(1)
+    amortized cost per sample.
+    """
+
+    def __init__(self, how: str, window: int) -> None:
+        self.std = how == "rolling_std"
+        self.w = window
+        self.n = 0  # samples pushed
+        self.block: List[float] = []  # samples of the current block
+        self.ref = self.s1 = self.s2 = 0.0  # prefix of the current block (s1 alone for the mean)
+        self.suffix: List[Tuple[float, float]] = []  # previous block: (sum or mean, M2) by offset
+
+    def _suffixes(self) -> List[Tuple[float, float]]:
+        out: List[Tuple[float, float]] = []
+        if not self.std:
+            acc = self.block[-1]
+            out.append((acc, 0.0))
+            for x in reversed(self.block[:-1]):
+                acc = acc + x
+                out.append((acc, 0.0))
+        else:
+            ref = self.block[-1]
+            for k, x in enumerate(reversed(self.block), 1):
+                c = x - ref
+                s1, s2 = (c, c * c) if k == 1 else (s1 + c, s2 + c * c)
+                out.append((ref + s1 / k, s2 - s1 * s1 / k))
+        out.reverse()
+        return out
+
+    def _add(self, x: float) -> None:
+        if self.n % self.w == 0:
+            self.block = [x]
+            if self.std:
+                self.ref = x
+                c = x - x
+                self.s1, self.s2 = c, c * c
+            else:
+                self.s1 = x
+        else:
+            self.block.append(x)
+            if self.std:
+                c = x - self.ref
+                self.s1, self.s2 = self.s1 + c, self.s2 + c * c
+            else:
+                self.s1 = self.s1 + x
+        if len(self.block) == self.w:
+            self.suffix = self._suffixes()
+
+    def _aggregate(self) -> float:
+        w = self.w
+        k = float(len(self.block))  # prefix part count
+        aligned = len(self.block) == w
+        if not self.std:
+            total = self.s1 if aligned else self.suffix[len(self.block)][0] + self.s1
+            return total / w
+        m2 = self.s2 - self.s1 * self.s1 / k
+        if not aligned:
+            s_mean, s_m2 = self.suffix[len(self.block)]
+            delta = (self.ref + self.s1 / k) - s_mean
+            m2 = s_m2 + m2 + delta * delta * (w - k) * k / w
+        std = math.sqrt(max(m2 / w, 0.0))
+        return std if math.isfinite(std) else math.nan
+
+    def update(self, value: Any, t: float) -> Optional[float]:
+        x = _as_float(value)
+        out = self._aggregate() if self.n >= self.w else None
+        self._add(x)
+        self.n += 1
+        return out
+
+
+def _make_state(cond: Dict[str, Any]):
+    op = cond.get("operator")
+    if op in ("rolling_mean", "rolling_std"):
+        return _BlockState(op, cond["window"])
+    if op in WINDOW_OPERATORS:
+        return _WindowState(op, cond["window"])
+    if op in DELTA_OPERATORS:
+        return _DeltaState(op)
+    return _PlainState()
+
+
+# -------------------------
+# Evaluator
+# -------------------------
+
+
+def _compile_tree(cond: Dict[str, Any]) -> Tuple[str, Any]:
+    """Condition tree -> nested ("all"|"any"|"not"|"leaf", ...) tuples with leaf keys precomputed."""
+    if "not" in cond:
+        return ("not", _compile_tree(cond["not"]))
+    if "all" in cond or "any" in cond:
+        key = "all" if "all" in cond else "any"
+        return (key, tuple(_compile_tree(c) for c in cond[key]))
+    return ("leaf", condition_key(cond))
+
+
+def _tree_hit(node: Tuple[str, Any], leaf_hits: Dict[str, bool]) -> bool:
+    kind, arg = node
+    if kind == "leaf":
+        return leaf_hits[arg]
+    if kind == "not":
+        return not _tree_hit(arg, leaf_hits)
+    if kind == "all":
+        return all(_tree_hit(c, leaf_hits) for c in arg)
+    return any(_tree_hit(c, leaf_hits) for c in arg)
+
+
+class LiveEvaluator:
+    """Incremental rule evaluation for live telemetry.
+
+    `push(sample)` takes one sample (a mapping with `time_column` and signal values) and
+    returns the events it fired, in the same format and with the same condition
+    semantics as `detect_events` (`rule_engine._eval_condition_dict` decides
+    every comparison). Window and delta rules keep ring-buffer / block /
+    previous-sample state, so each rule costs O(1) amortized per sample.
+
+    Identical leaf conditions (across rules and inside all/any/not trees) share
+    one state and are evaluated once per sample. Every leaf is updated on every
+    sample - its history must stay complete - so logic trees don't short-circuit here.
+    """
+
+    def __init__(self, rules: Sequence[Dict[str, Any]], *, time_column: str = "time") -> None:
+        plan = compile_rules(rules)  # validates
+        self.rules = plan.rules
+        self.time_column = time_column
+        self._leaves: Dict[str, Tuple[Dict[str, Any], Dict[str, Any], Any]] = {}
+        for rule in self.rules:
+            for leaf in condition_leaves(rule["condition"]):
+                key = condition_key(leaf)
+                if key not in self._leaves:
+                    self._leaves[key] = (leaf, comparison_of(leaf), _make_state(leaf))
+        self._trees = [_compile_tree(rule["condition"]) for rule in self.rules]
+        self.samples_seen = 0
+
+    def push(self, sample: Mapping[str, Any]) -> List[Dict[str, Any]]:
+        t = _as_float(sample.get(self.time_column))
+        leaf_hits: Dict[str, bool] = {}
+        for key, (leaf, cmp, state) in self._leaves.items():
+            v = state.update(sample.get(leaf["signal"], math.nan), t)
+            leaf_hits[key] = v is not None and bool(_eval_condition_dict(cmp, v))
+
+        fired: List[Dict[str, Any]] = []
+        for rule, tree in zip(self.rules, self._trees):
+            if _tree_hit(tree, leaf_hits):
+                fired.append(
+                    {
+                        "time": t,
+                        "event": rule.get("name"),
+                        "severity": rule.get("severity"),
+                        "details": rule.get("description"),
+                    }
+                )
+        self.samples_seen += 1
+        return fired
+
+    def push_batch(self, rows: Iterable[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        """Push many samples (an iterable of mappings, or a DataFrame) in time order."""
+        if hasattr(rows, "to_dict"):
+            rows = rows.to_dict("records")  # type: ignore[union-attr]
+        fired: List[Dict[str, Any]] = []
+        for sample in rows:
+            fired.extend(self.push(sample))
+        return fired
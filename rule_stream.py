@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import pandas as pd
+
+from csv_stats import CsvStats
+from event_intervals import Interval, intervals_from_hits, merge_peaks
+from rule_compiler import ExecutionPlan, compile_rules
+from rule_core import comparison_of, is_logic
+from rule_engine import _emit_indices
+from time_index import time_index
+
+
+class ChunkedDetector:
+    """Run a compiled rule-set over consecutive chunks of one flight.
+
+    State carried across chunk boundaries:
+    - the last `plan.lookback` rows (previous sample for delta rules, window tails),
+    - the open interval per rule when coalescing.
+
+    Feeding every chunk and calling `finish()` returns exactly what
+    `plan.run(whole_frame, ...)` returns on the concatenated chunks.
+    """
+
+    def __init__(
+        self,
+        plan: ExecutionPlan,
+        *,
+        time_column: str = "time",
+        coalesce: bool = False,
+        max_gap: int = 0,
+        min_samples: int = 1,
+    ) -> None:
+        self.plan = plan
+        self.time_column = time_column
+        self.coalesce = coalesce
+        self.max_gap = max_gap
+        self.min_samples = min_samples
+        self.rows_seen = 0
+        self._tail: Optional[pd.DataFrame] = None
+        self._events: List[List[Dict[str, Any]]] = [[] for _ in plan.rules]
+        self._open: List[Optional[Interval]] = [None] * len(plan.rules)
+        self._cmps = [None if is_logic(r["condition"]) else comparison_of(r["condition"]) for r in plan.rules]
+
+    def feed(self, chunk: pd.DataFrame) -> None:
+        if len(chunk) == 0:
+            return
+        chunk = chunk.reset_index(drop=True)
+        tail_len = 0 if self._tail is None else len(self._tail)
+        frame = pd.concat([self._tail, chunk], ignore_index=True) if tail_len else chunk
+        origin = self.rows_seen - tail_len
+
+        hits, series, _ = self.plan._evaluate(
+            frame, keep_series=self.coalesce, origin=origin, time_column=self.time_column
+        )
+        times = time_index(frame, self.time_column).times
+        for k, (rule, idx) in enumerate(zip(self.plan.rules, hits)):
+            idx = idx[idx >= tail_len]  # tail rows were reported with the previous chunk
+            if self.coalesce:
+                ivs = intervals_from_hits(
+                    idx, times, series=series[k], cmp=self._cmps[k], max_gap=self.max_gap, base=origin
+                )
+                self._extend(k, ivs)
+            else:
+                _emit_indices(
+                    self._events[k], idx, lambda: times,
+                    rule.get("name"), rule.get("severity"), rule.get("description"),
+                )
+
+        self.rows_seen += len(chunk)
+        lookback = self.plan.lookback
+        self._tail = frame.iloc[len(frame) - min(lookback, len(frame)):].copy() if lookback else None
+
+    def _extend(self, k: int, intervals: List[Interval]) -> None:
+        for iv in intervals:
+            cur = self._open[k]
+            if cur is not None and iv.start - cur.end - 1 <= self.max_gap:
+                cur.end, cur.t_end = iv.end, iv.t_end
+                cur.samples += iv.samples
+                cur.peak = merge_peaks(cur.peak, iv.peak, self._cmps[k])
+                continue
+            if cur is not None:
+                self._close(k, cur)
+            self._open[k] = iv
+
+    def _close(self, k: int, iv: Interval) -> None:
+        if iv.samples >= self.min_samples:
+            rule = self.plan.rules[k]
+            self._events[k].append(iv.to_event(rule.get("name"), rule.get("severity"), rule.get("description")))
+
+    def finish(self) -> List[Dict[str, Any]]:
+        """Close open intervals and return all events in `detect_events` order."""
+        for k, iv in enumerate(self._open):
+            if iv is not None:
+                self._close(k, iv)
+                self._open[k] = None
+        return [e for per_rule in self._events for e in per_rule]
+
+
+def detect_events_csv(
+    csv_path: Union[str, Path],
+    rules: Union[ExecutionPlan, Sequence[Dict[str, Any]]],
+    *,
+    chunksize: int = 100_000,
+    time_column: str = "time",
+    coalesce: bool = False,
+    max_gap: int = 0,
+    min_samples: int = 1,
+    encoding: Optional[str] = None,
+    separator: str = ",",
+    stats: Optional[CsvStats] = None,
+) -> List[Dict[str, Any]]:
+    """Streaming `detect_events` over a CSV that need not fit in memory.
+
+    Only `time_column` and the signals the rules read are parsed, `chunksize`
+    rows at a time (C parser), so peak memory is bounded by the chunk size.
+    Rules must be dict rules accepted by `rule_core.validate_rule`.
+
+    Passing a `CsvStats` folds every column of each chunk into it in the same
+    pass (all columns are then parsed), so facts need no second read of the file.
+    """
+    plan = rules if isinstance(rules, ExecutionPlan) else compile_rules(rules)
+    usecols = list(dict.fromkeys([time_column, *plan.signals]))
+    detector = ChunkedDetector(
+        plan, time_column=time_column, coalesce=coalesce, max_gap=max_gap, min_samples=min_samples
+    )
+    reader = pd.read_csv(
+        csv_path, usecols=None if stats is not None else usecols,
+        chunksize=chunksize, sep=separator, encoding=encoding,
+    )
+    with reader:
+        for chunk in reader:
+            if stats is not None:
+                stats.update(chunk)
+                missing = [c for c in usecols if c not in chunk.columns]
+                if missing:
+                    raise KeyError(f"columns not in {csv_path}: {missing}")
+                chunk = chunk[usecols]
+            detector.feed(chunk)
+    return detector.finish()
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+
+# -------------------------
+# Rolling windows (legacy semantics: out[i] aggregates values[i-w:i], i >= w)
+# -------------------------
+#
+# All kernels use the van Herk / Gil-Werman block decomposition: the series is cut
+# into blocks of w samples aligned to the *global* sample index (`origin`), and every
+# window is one block suffix plus one block prefix. Each window's result therefore
+# depends only on its own samples and the fixed block grid - the same bits whether the
+# series is processed whole or in chunks - and the work is O(n).
+
+
+def _blocks(x: np.ndarray, w: int, origin: int) -> Tuple[np.ndarray, int]:
+    """Reshape x into NaN-padded (nb, w) blocks aligned so that global index 0 starts a block."""
+    lead = origin % w
+    tail = (-(lead + len(x))) % w
+    xp = np.concatenate([np.full(lead, np.nan), x, np.full(tail, np.nan)])
+    return xp.reshape(-1, w), lead
+
+
+def _split(n: int, w: int, lead: int):
+    """Flat (suffix start, prefix end) positions per window, and which windows are block-aligned."""
+    j = np.arange(w - 1, n) + lead  # window ends, in padded coordinates
+    s = j - w + 1
+    return s, j, (s % w) == 0
+
+
+def _trailing_extreme(x: np.ndarray, w: int, origin: int, fn: Callable) -> np.ndarray:
+    """r[j] = fn(x[j-w+1 : j+1]) for j >= w-1. A NaN anywhere in the window yields NaN."""
+    xb, lead = _blocks(x, w, origin)
+    prefix = fn.accumulate(xb, axis=1).ravel()
+    suffix = fn.accumulate(xb[:, ::-1], axis=1)[:, ::-1].ravel()
+    s, j, _ = _split(len(x), w, lead)
+    return fn(suffix[s], prefix[j])
+
+
+def _trailing_mean(x: np.ndarray, w: int, origin: int) -> np.ndarray:
+    """Window sum / w. NaN and +/-inf propagate like np.mean."""
+    xb, lead = _blocks(x, w, origin)
+    prefix = np.cumsum(xb, axis=1).ravel()
+    suffix = np.cumsum(xb[:, ::-1], axis=1)[:, ::-1].ravel()
+    s, j, aligned = _split(len(x), w, lead)
+    # an aligned window is exactly one block: its prefix alone
+    total = np.where(aligned, prefix[j], suffix[s] + prefix[j])
+    return total / w
+
+
+def _trailing_std(x: np.ndarray, w: int, origin: int) -> np.ndarray:
+    """Population standard deviation (ddof=0, like np.std); NaN if the window is not all finite.
+
+    Each block part keeps (count, mean, M2) of values centered on a sample of that
+    part, and the suffix and prefix parts are combined with Chan's parallel update,
+    which avoids the cancellation of a plain sum-of-squares formula.
+    """
+    xb, lead = _blocks(x, w, origin)
+    k = np.arange(1, w + 1, dtype=np.float64)
+
+    def part_stats(b: np.ndarray):
+        ref = b[:, :1]  # first sample of the part is part of every accumulation
+        c = b - ref
+        s1 = np.cumsum(c, axis=1)
+        s2 = np.cumsum(c * c, axis=1)
+        return (ref + s1 / k).ravel(), (s2 - s1 * s1 / k).ravel()
+
+    p_mean, p_m2 = part_stats(xb)
+    r_mean, r_m2 = part_stats(xb[:, ::-1])
+    s_mean, s_m2 = r_mean.reshape(-1, w)[:, ::-1].ravel(), r_m2.reshape(-1, w)[:, ::-1].ravel()
+
+    s, j, aligned = _split(len(x), w, lead)
+    n_b = (j % w + 1).astype(np.float64)  # prefix part count
+    n_a = w - n_b  # suffix part count (0 when aligned)
+    delta = p_mean[j] - s_mean[s]
+    m2 = np.where(aligned, p_m2[j], s_m2[s] + p_m2[j] + delta * delta * n_a * n_b / w)
+    std = np.sqrt(np.maximum(m2 / w, 0.0))
+    return np.where(np.isfinite(std), std, np.nan)
+
+
+_TRAILING: Dict[str, Callable[[np.ndarray, int, int], np.ndarray]] = {
+    "rolling_min": lambda x, w, o: _trailing_extreme(x, w, o, np.minimum),
+    "rolling_max": lambda x, w, o: _trailing_extreme(x, w, o, np.maximum),
+    "rolling_range": lambda x, w, o: _trailing_extreme(x, w, o, np.maximum) - _trailing_extreme(x, w, o, np.minimum),
+    "rolling_mean": _trailing_mean,
+    "rolling_std": _trailing_std,
+}
+
+
+def rolling(values: np.ndarray, window: int, how: str, *, origin: int = 0) -> np.ndarray:
+    """Aggregate the `window` samples preceding each sample.
+
+    out[i] = how(values[i-window:i]) for i >= window, NaN before that - the same
+    alignment as the legacy `"window"` lambda rules in `detect_events`.
+    `origin` is the global sample index of values[0] when evaluating a chunk of a
+    longer series; it keeps results bit-identical to a whole-series run.
+    """
+    x = np.asarray(values, dtype=np.float64)
+    n = len(x)
+    out = np.full(n, np.nan)
+    if window < 1 or n <= window:
+        return out
+    with np.errstate(invalid="ignore", over="ignore"):
+        r = _TRAILING[how](x, window, origin)  # r[j] covers x[j-window+1 : j+1]
+    out[window:] = r[: n - window]
+    return out
+
+
+# -------------------------
+# Sample-to-sample differences (legacy two-argument semantics: out[i] uses i and i-1, i >= 1)
+# -------------------------
+
+
+def difference(values: np.ndarray, how: str, times: Optional[np.ndarray] = None) -> np.ndarray:
+    """Per-sample change from the previous sample, from a single `np.diff`.
+
+    how: "delta" (curr - prev), "abs_delta" (|curr - prev|) or "rate"
+    ((curr - prev) / (t_curr - t_prev), needs `times`). out[0] is NaN.
+    """
+    x = np.asarray(values, dtype=np.float64)
+    out = np.full(len(x), np.nan)
+    if len(x) < 2:
+        return out
+    with np.errstate(invalid="ignore", divide="ignore"):
+        d = np.diff(x)
+        if how == "abs_delta":
+            d = np.abs(d)
+        elif how == "rate":
+            if times is None:
+                raise ValueError("rate needs a time column")
+            d = d / np.diff(np.asarray(times, dtype=np.float64))
+        elif how != "delta":
+            raise ValueError(f"unknown difference operator: {how}")
+    out[1:] = d
+    return out
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from extract_CSV_columns import sniff_csv
+from rule_compiler import ExecutionPlan, compile_rules
+
+
+CATEGORICAL_MAX_UNIQUE = 16
+_INT_TYPES = (np.int8, np.int16, np.int32)
+
+
+# -------------------------
+# Lossless dtype compaction
+# -------------------------
+
+
+def _smallest_int(lo: float, hi: float) -> Optional[type]:
+    for t in _INT_TYPES:
+        info = np.iinfo(t)
+        if info.min <= lo and hi <= info.max:
+            return t
+    return None
+
+
+def _compact_numeric(s: pd.Series) -> pd.Series:
+    """Smallest dtype that round-trips every value exactly (to float64 in the engine)."""
+    if pd.api.types.is_bool_dtype(s) or len(s) == 0:
+        return s
+    x = s.to_numpy()
+    if pd.api.types.is_integer_dtype(s):
+        t = _smallest_int(x.min(), x.max())
+        return s.astype(t) if t is not None and t != x.dtype else s
+    if not pd.api.types.is_float_dtype(s) or x.dtype == np.float16:
+        return s
+    finite = np.isfinite(x)
+    if finite.all() and np.array_equal(x, np.trunc(x)):
+        t = _smallest_int(x.min(), x.max())
+        if t is not None:
+            return s.astype(t)
+    if x.dtype == np.float64:
+        with np.errstate(over="ignore"):
+            x32 = x.astype(np.float32)
+        if np.array_equal(x32.astype(np.float64), x, equal_nan=True):
+            return s.astype(np.float32)
+    return s
+
+
+def compact_frame(
+    df: pd.DataFrame,
+    *,
+    numeric_columns: Sequence[str] = (),
+    categorical_max_unique: int = CATEGORICAL_MAX_UNIQUE,
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """Shrink a frame without changing any value.
+
+    - ints -> int8/16/32 when the range fits; floats -> small ints when every value
+      is a whole number, else float32 when every value survives the round trip.
+    - columns with at most `categorical_max_unique` distinct values (constant flags
+      such as `status`, all-zero fields) become categoricals (small integer codes
+      plus the distinct values) - except `numeric_columns`, which rules read and
+      must stay numeric.
+
+    Returns (compacted frame, report); the report gives bytes before/after and
+    the dtype change of every column that changed.
+    """
+    keep_numeric = set(numeric_columns)
+    before = int(df.memory_usage(index=False, deep=True).sum())
+    out: Dict[str, pd.Series] = {}
+    changes: Dict[str, List[str]] = {}
+    for c in df.columns:
+        s = df[c]
+        new = s
+        if (
+            c not in keep_numeric
+            and categorical_max_unique > 0
+            and len(s) > 2 * categorical_max_unique
+            and s.nunique(dropna=False) <= categorical_max_unique
+        ):
+            new = s.astype("category")
+        elif pd.api.types.is_numeric_dtype(s):
+            new = _compact_numeric(s)
+        if new.dtype != s.dtype:
+            changes[str(c)] = [str(s.dtype), str(new.dtype)]
+        out[c] = new
+    compacted = pd.DataFrame(out, index=df.index, copy=False)
+    after = int(compacted.memory_usage(index=False, deep=True).sum())
+    report = {"bytes_before": before, "bytes_after": after, "bytes_saved": before - after, "changed": changes}
+    return compacted, report
+
+
+# -------------------------
+# Rule-driven load
+# -------------------------
+
+
+def load_for_rules(
+    csv_path: Union[str, Path],
+    rules: Union[ExecutionPlan, Sequence[Dict[str, Any]]],
+    *,
+    time_column: str = "time",
+    extra_columns: Sequence[str] = (),
+    compact: bool = True,
+    use_cache: bool = False,
+    encoding: Optional[str] = None,
+    separator: Optional[str] = None,
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """Load only the columns a rule-set reads (plus time and `extra_columns`).
+
+    With `compact=True` the result goes through `compact_frame`, keeping rule
+    signals numeric; detection results are identical because every value is
+    preserved. `use_cache=True` reads from the memory-mapped `columnar_cache`.
+
+    The report adds `columns_loaded`, `columns_skipped` and, for skipped
+    columns, `bytes_skipped_estimate` (rows x 8 bytes each).
+    """
+    plan = rules if isinstance(rules, ExecutionPlan) else compile_rules(rules)
+    info = sniff_csv(csv_path, encoding=encoding, separator=separator)
+    wanted = list(dict.fromkeys([time_column, *plan.signals, *extra_columns]))
+    missing = [c for c in wanted if c not in info["columns"]]
+    if missing:
+        raise KeyError(f"columns not in {csv_path}: {missing}")
+
+    if use_cache:
+        from columnar_cache import read_csv_cached
+
+        df = read_csv_cached(csv_path, wanted, encoding=encoding, separator=info["separator"])
+    else:
+        df = pd.read_csv(csv_path, usecols=wanted, sep=info["separator"], encoding=encoding)[wanted]
+
+    if compact:
+        df, report = compact_frame(df, numeric_columns=[time_column, *plan.signals])
+    else:
+        size = int(df.memory_usage(index=False, deep=True).sum())
+        report = {"bytes_before": size, "bytes_after": size, "bytes_saved": 0, "changed": {}}
+    skipped = [c for c in info["columns"] if c not in wanted]
+    report.update(
+        columns_loaded=wanted,
+        columns_skipped=skipped,
+        bytes_skipped_estimate=len(df) * 8 * len(skipped),
+    )
+    return df, report
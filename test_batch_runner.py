@@ -0,0 +1,48 @@
+"""Per-file analysis: events and column stats from a single read of the log."""
+from __future__ import annotations
+
+import pandas as pd
+
+from batch_runner import analyze_file
+from csv_stats import scan_csv_stats
+from rule_stream import detect_events_csv
+
+
+def _write(tmp_path, flight):
+    df = flight(n=500)
+    df["mode"] = ["CRUISE" if i % 7 else "HOLD" for i in range(len(df))]  # non-numeric: no stats
+    path = tmp_path / "flight.csv"
+    df.to_csv(path, index=False)
+    return path
+
+
+def test_stats_and_events_come_from_one_read(tmp_path, monkeypatch, flight, mixed_rules):
+    path = _write(tmp_path, flight)
+    expected_events = detect_events_csv(path, mixed_rules, chunksize=64)
+    expected_stats = scan_csv_stats(path, chunksize=64, quantiles=True).to_dict()
+
+    reads = []
+    read_csv = pd.read_csv
+
+    def counting(*args, **kwargs):
+        if kwargs.get("nrows") != 0:  # header sniffing reads no rows
+            reads.append(args[0])
+        return read_csv(*args, **kwargs)
+
+    monkeypatch.setattr(pd, "read_csv", counting)
+    result = analyze_file(path, mixed_rules, chunksize=64, quantiles=True)
+    assert result["ok"], result.get("error")
+    assert len(reads) == 1
+    assert result["events"] == expected_events
+    assert result["column_stats"] == expected_stats
+    assert "mode" not in result["column_stats"]["columns"]
+    assert result["stats"]["altitude_max"] == expected_stats["columns"]["altitude"]["max"]
+
+
+def test_missing_signal_is_reported(tmp_path, flight):
+    path = _write(tmp_path, flight)
+    rules = [{"name": "hot", "severity": "low", "description": "",
+              "condition": {"signal": "temperature", "operator": "gt", "value": 1.0}}]
+    result = analyze_file(path, rules)
+    assert not result["ok"]
+    assert "temperature" in result["error"]
@@ -0,0 +1,62 @@
+"""Column statistics: chunked and merged summaries against a single pass."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from csv_stats import ColumnStats, CsvStats, frame_stats, merge_stats, scan_csv_stats
+
+
+def _frame(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    alt = 1e4 + rng.normal(0, 1, n)  # large offset: a naive sum of squares loses the variance
+    alt[rng.integers(0, n, 40)] = np.nan
+    return pd.DataFrame({
+        "time": np.arange(n) * 0.1,
+        "altitude": alt,
+        "mode": np.where(rng.random(n) < 0.5, "CRUISE", "HOLD"),
+    })
+
+
+def _assert_column_close(got: ColumnStats, expected: ColumnStats):
+    assert (got.count, got.nan_count, got.min, got.max) == (expected.count, expected.nan_count,
+                                                            expected.min, expected.max)
+    np.testing.assert_allclose([got.mean, got.std], [expected.mean, expected.std], rtol=1e-12)
+
+
+def test_merged_parts_match_a_single_pass():
+    df = _frame()
+    whole = frame_stats(df, quantiles=True)
+    merged = merge_stats(frame_stats(df.iloc[i:i + 400], quantiles=True) for i in range(0, len(df), 400))
+    assert merged.rows == whole.rows == len(df)
+    assert merged.non_numeric == whole.non_numeric == {"mode"}
+    assert set(merged.columns) == set(whole.columns) == {"time", "altitude"}
+    for c in whole.columns:
+        _assert_column_close(merged.columns[c], whole.columns[c])
+    v = df["altitude"].dropna().to_numpy()
+    np.testing.assert_allclose(merged.columns["altitude"].std, v.std(), rtol=1e-9)
+    np.testing.assert_allclose(merged.quantile("altitude", 0.5), np.median(v), atol=0.05)
+
+
+def test_scan_matches_frame_stats(tmp_path):
+    df = _frame()
+    path = tmp_path / "flight.csv"
+    df.to_csv(path, index=False)
+    whole = frame_stats(pd.read_csv(path))
+    for chunksize in (1000, 777):
+        scanned = scan_csv_stats(path, chunksize=chunksize)
+        for c in whole.columns:
+            _assert_column_close(scanned.columns[c], whole.columns[c])
+
+
+def test_merge_drops_sketches_unless_every_side_kept_them():
+    a, b = _frame(100, seed=1), _frame(100, seed=2)
+    assert frame_stats(a, quantiles=True).merge(frame_stats(b)).sketches == {}
+    assert set(frame_stats(a, quantiles=True).merge(frame_stats(b, quantiles=True)).sketches) == {"time", "altitude"}
+    assert set(frame_stats(a, quantiles=True).merge(CsvStats()).sketches) == {"time", "altitude"}
+
+
+def test_round_trip():
+    st = frame_stats(_frame(300), quantiles=True)
+    back = CsvStats.from_dict(st.to_dict())
+    assert back.to_facts(extended=True) == st.to_facts(extended=True)
@@ -0,0 +1,94 @@
+"""Event store queries against a plain Python filter over the same events."""
+from __future__ import annotations
+
+import datetime as dt
+import random
+
+import pytest
+
+from event_store import EventStore
+
+
+FLIGHTS = {  # name -> recorded_at
+    "f1": dt.datetime(2026, 3, 1, 9, 0),
+    "f2": dt.datetime(2026, 3, 15, 14, 30),
+    "f3": dt.datetime(2026, 4, 2, 7, 45),
+}
+RULES = {"rapid_descent": "high", "stuck_signal": "low", "noisy": "medium", "spike": "high"}
+
+
+def _events(seed):
+    rng = random.Random(seed)
+    out = []
+    for k in range(60):
+        rule = rng.choice(sorted(RULES))
+        e = {"time": round(k * 0.5 + rng.random() * 0.1, 3), "event": rule,
+             "severity": RULES[rule], "details": f"{rule} desc"}
+        if k % 4 == 0:  # a coalesced interval
+            e.update(end_time=e["time"] + 0.2, duration=0.2, samples=3, peak=-2.5)
+        out.append(e)
+    return out
+
+
+@pytest.fixture
+def store():
+    with EventStore() as s:
+        for i, (name, recorded_at) in enumerate(FLIGHTS.items()):
+            s.add_events(name, _events(i), recorded_at=recorded_at)
+        yield s
+
+
+def _ts(t):
+    return t if isinstance(t, dt.datetime) else dt.datetime(t.year, t.month, t.day)
+
+
+def _expected(rule=None, severity=None, flights=None, since=None, until=None, t0=None, t1=None, limit=None):
+    sev = None if severity is None else {severity} if isinstance(severity, str) else set(severity)
+    rows = []
+    for i, (name, recorded_at) in enumerate(FLIGHTS.items()):
+        if flights is not None and name not in flights:
+            continue
+        if since is not None and recorded_at < _ts(since) or until is not None and recorded_at >= _ts(until):
+            continue
+        for e in sorted(_events(i), key=lambda e: e["time"]):
+            if rule is not None and e["event"] != rule or sev is not None and e["severity"] not in sev:
+                continue
+            if t0 is not None and e["time"] < t0 or t1 is not None and e["time"] > t1:
+                continue
+            rows.append({"flight": name, **e})
+    return rows[:limit] if limit is not None else rows
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"rule": "rapid_descent"},
+    {"severity": "high"},
+    {"severity": ["low", "medium"]},
+    {"flights": ["f1", "f3"]},
+    {"since": dt.datetime(2026, 3, 10)},
+    {"until": dt.date(2026, 4, 1)},
+    {"since": dt.date(2026, 3, 1), "until": dt.datetime(2026, 3, 15, 14, 30)},  # until is exclusive
+    {"t0": 5.0, "t1": 12.5},
+    {"rule": "noisy", "flights": ["f2", "f3"], "t1": 20.0},
+    {"severity": "high", "limit": 7},
+])
+def test_query_filters(store, filters):
+    assert store.query(**filters) == _expected(**filters)
+
+
+def test_counts(store):
+    counts = {(c["event"], c["severity"]): (c["count"], c["flights"]) for c in store.counts(since=dt.date(2026, 3, 2))}
+    rows = _expected(since=dt.datetime(2026, 3, 2))
+    for (rule, sev), (n, flights) in counts.items():
+        assert n == sum(1 for r in rows if r["event"] == rule)
+        assert flights == len({r["flight"] for r in rows if r["event"] == rule})
+    assert sum(n for n, _ in counts.values()) == len(rows)
+
+
+def test_replace_and_delete(store):
+    store.add_events("f1", _events(0)[:5], replace=True)
+    assert len(store.query(flights=["f1"])) == 5
+    assert store.flights()[0]["recorded_at"] == FLIGHTS["f1"].timestamp()  # metadata kept
+    store.delete_flight("f1")
+    assert store.query(flights=["f1"]) == []
+    assert [f["name"] for f in store.flights()] == ["f2", "f3"]
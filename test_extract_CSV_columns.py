@@ -0,0 +1,18 @@
+"""CSV header sniffing."""
+from __future__ import annotations
+
+from extract_CSV_columns import _sniff_separator, clear_header_cache, sniff_csv
+
+
+def test_sniff_reads_utf8_headers(tmp_path):
+    path = tmp_path / "flight.csv"
+    path.write_text("זמן;גובה;מהירות\n0.0;10.5;1\n0.1;10.7;2\n", encoding="utf-8")
+    clear_header_cache()
+    assert sniff_csv(path) == {"columns": ["זמן", "גובה", "מהירות"], "separator": ";"}
+
+
+def test_undecodable_sample_falls_back_to_comma(tmp_path):
+    path = tmp_path / "latin1.csv"
+    path.write_bytes("caf\xe9;x\n1;2\n".encode("latin-1"))
+    assert _sniff_separator(path, None) == ","
+    assert _sniff_separator(path, "latin-1") == ";"
@@ -0,0 +1,87 @@
+"""Concurrent LLM calls: ordering, throttling retries and rate limiting."""
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from llm_batch import TokenBucket, batch_call, call_with_backoff
+
+
+class _Throttled(Exception):
+    """Shaped like a botocore ClientError for a throttled Bedrock request."""
+
+    def __init__(self, code="ThrottlingException"):
+        super().__init__(code)
+        self.response = {"Error": {"Code": code}}
+
+
+def _flaky(failures, error):
+    """A call that raises `error()` the first `failures[prompt]` times it sees `prompt`."""
+    seen = {}
+
+    def call(prompt, **kwargs):
+        seen[prompt] = seen.get(prompt, 0) + 1
+        if seen[prompt] <= failures.get(prompt, 0):
+            raise error()
+        return prompt.upper()
+
+    return call, seen
+
+
+def test_results_keep_input_order():
+    def call(prompt, **kwargs):
+        time.sleep(0.02 * (5 - int(prompt)))  # later prompts finish first
+        return f"r{prompt}"
+
+    assert batch_call([str(i) for i in range(6)], max_workers=6, call=call) == [f"r{i}" for i in range(6)]
+
+
+def test_throttling_is_retried():
+    call, seen = _flaky({"a": 2, "c": 1}, _Throttled)
+    assert batch_call(["a", "b", "c"], base_delay=0.001, call=call) == ["A", "B", "C"]
+    assert seen == {"a": 3, "b": 1, "c": 2}
+
+
+def test_throttling_wrapped_in_runtime_error_is_retried():
+    def wrapped():
+        try:
+            raise _Throttled("ServiceUnavailableException")
+        except _Throttled as e:
+            raise RuntimeError("Can't invoke 'm'") from e
+
+    call, seen = _flaky({"a": 1}, wrapped)
+    assert call_with_backoff(call, "a", base_delay=0.001) == "A"
+    assert seen == {"a": 2}
+
+
+def test_other_errors_are_not_retried():
+    call, seen = _flaky({"b": 1}, lambda: _Throttled("ValidationException"))
+    with pytest.raises(_Throttled):
+        batch_call(["a", "b"], base_delay=0.001, call=call)
+    assert seen["b"] == 1
+    out = batch_call(["x", "y"], call=_flaky({"y": 1}, ValueError)[0], return_exceptions=True)
+    assert out[0] == "X" and isinstance(out[1], ValueError)
+
+
+def test_retries_are_bounded():
+    call, seen = _flaky({"a": 10}, _Throttled)
+    with pytest.raises(_Throttled):
+        call_with_backoff(call, "a", retries=2, base_delay=0.001)
+    assert seen == {"a": 3}
+
+
+def test_token_bucket_rejects_burst_below_one():
+    with pytest.raises(ValueError):
+        TokenBucket(10, burst=0.5)
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+    TokenBucket(0.5).acquire()  # default burst is at least one token
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(50, burst=1)
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    assert time.monotonic() - start >= 5 / 50 * 0.9
@@ -0,0 +1,105 @@
+"""LLM response cache: tiers, expiry and eviction."""
+from __future__ import annotations
+
+import os
+from types import SimpleNamespace
+
+import pytest
+
+import llm_cache
+from llm_cache import LLMCache, cache_key, cached_llm_call, cached_llm_stream
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(llm_cache, "time", SimpleNamespace(time=clock))
+    return clock
+
+
+def test_keys_cover_model_tokens_and_prompt():
+    keys = {cache_key("m", 50, "p"), cache_key("m", 51, "p"), cache_key("n", 50, "p"), cache_key("m", 50, "q")}
+    assert len(keys) == 4
+    assert cache_key("m", 50, "p") == cache_key("m", 50.0, "p")
+
+
+def test_disk_tier_survives_a_new_process(tmp_path):
+    LLMCache(disk_dir=tmp_path).put("k" * 64, "answer")
+    fresh = LLMCache(disk_dir=tmp_path)
+    assert fresh.get("k" * 64) == "answer"
+    assert fresh.get("k" * 64) == "answer"
+    assert fresh.stats()["disk_hits"] == 1 and fresh.stats()["memory_hits"] == 1
+
+
+def test_memory_tier_is_lru():
+    cache = LLMCache(max_entries=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    cache.get("a")
+    cache.put("c", "3")
+    assert [cache.get(k) for k in "abc"] == ["1", None, "3"]
+
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    cache = LLMCache(disk_dir=tmp_path, ttl=60)
+    key = "e" * 64
+    cache.put(key, "answer")
+    clock.now += 60
+    assert cache.get(key) == "answer"
+    clock.now += 1
+    assert cache.get(key) is None
+    assert not list(tmp_path.glob("*/*.json"))  # the expired file is removed
+    assert cache.stats()["misses"] == 1
+
+
+def test_disk_tier_evicts_oldest_files(tmp_path):
+    cache = LLMCache(max_entries=1, disk_dir=tmp_path, max_disk_bytes=2_000)
+    keys = [f"{i:064x}" for i in range(10)]
+    for i, key in enumerate(keys):
+        cache.put(key, "x" * 300)
+        path = tmp_path / key[:2] / f"{key}.json"
+        os.utime(path, (1_000 + i, 1_000 + i))  # distinct mtimes, oldest first
+    files = sorted(tmp_path.glob("*/*.json"))
+    assert sum(p.stat().st_size for p in files) <= 2_000
+    kept = {p.stem for p in files}
+    assert keys[-1] in kept and keys[0] not in kept
+    assert kept == set(keys[-len(kept):])
+
+
+def test_failed_calls_are_not_cached():
+    cache = LLMCache()
+    calls = []
+
+    def call(prompt, **kwargs):
+        calls.append(prompt)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        return prompt.upper()
+
+    with pytest.raises(RuntimeError):
+        cached_llm_call("p", model_id="m", cache=cache, call=call)
+    assert cached_llm_call("p", model_id="m", cache=cache, call=call) == "P"
+    assert cached_llm_call("p", model_id="m", cache=cache, call=call) == "P"
+    assert calls == ["p", "p"]
+
+
+def test_stream_is_cached_only_when_read_to_the_end():
+    cache = LLMCache()
+
+    def stream(prompt, **kwargs):
+        yield from ("a", "b", "c")
+
+    deltas = cached_llm_stream("p", model_id="m", cache=cache, stream=stream)
+    assert next(deltas) == "a"
+    deltas.close()
+    assert cache.get(cache_key("m", 50, "p")) is None
+    assert list(cached_llm_stream("p", model_id="m", cache=cache, stream=stream)) == ["a", "b", "c"]
+    assert list(cached_llm_stream("p", model_id="m", cache=cache, stream=stream)) == ["abc"]
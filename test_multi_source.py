@@ -0,0 +1,78 @@
+"""Multi-stream alignment against a brute-force nearest/previous-sample search."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from multi_source import Source, align_sources
+
+
+def _stream(n, name, seed):
+    rng = np.random.default_rng(seed)
+    t = np.sort(rng.uniform(0, 10, n))
+    return pd.DataFrame({f"{name}_time": t, name: np.round(rng.normal(size=n), 3)})
+
+
+def _as_of(base_t, t, v, direction, tolerance):
+    """Value of the matched sample per base time (NaN if none within tolerance)."""
+    out = []
+    for b in base_t:
+        d = t - b
+        if direction == "backward":
+            ok = d <= 0
+        elif direction == "forward":
+            ok = d >= 0
+        else:
+            ok = np.ones(len(t), bool)
+        ok &= np.abs(d) <= (np.inf if tolerance is None else tolerance)
+        if not ok.any():
+            out.append(np.nan)
+            continue
+        k = np.flatnonzero(ok)
+        out.append(v[k[np.argmin(np.abs(d[k]))]])
+    return np.array(out)
+
+
+@pytest.mark.parametrize("direction", ["nearest", "backward", "forward"])
+@pytest.mark.parametrize("tolerance", [None, 0.05, 0.2])
+def test_align_matches_brute_force(direction, tolerance):
+    imu, gps = _stream(400, "accel", 0), _stream(60, "pdop", 1)
+    out = align_sources(
+        [Source(imu, time_column="accel_time"), Source(gps, time_column="pdop_time")],
+        direction=direction, tolerance=tolerance,
+    )
+    assert out.columns.tolist() == ["time", "accel", "pdop"]
+    np.testing.assert_array_equal(out["time"], imu["accel_time"])
+    np.testing.assert_array_equal(out["accel"], imu["accel"])
+    expected = _as_of(imu["accel_time"].to_numpy(), gps["pdop_time"].to_numpy(), gps["pdop"].to_numpy(),
+                      direction, tolerance)
+    np.testing.assert_array_equal(out["pdop"], expected)
+    if tolerance is not None:
+        assert 0 < np.isnan(expected).sum() < len(expected)  # the tolerance matters
+
+
+def test_per_source_overrides_grid_and_unsorted_input():
+    imu, gps = _stream(400, "accel", 2), _stream(60, "pdop", 3)
+    gps.loc[7, "pdop_time"] = np.nan  # dropped
+    shuffled = gps.sample(frac=1.0, random_state=0)
+    grid = np.arange(0, 10, 0.25)
+    out = align_sources(
+        [Source(imu, time_column="accel_time", tolerance=0.02),
+         Source(shuffled, time_column="pdop_time", prefix="gps_", direction="backward")],
+        base=grid, tolerance=0.5,
+    )
+    assert out.columns.tolist() == ["time", "accel", "gps_pdop"]
+    np.testing.assert_array_equal(out["time"], grid)
+    kept = gps.dropna(subset=["pdop_time"])
+    np.testing.assert_array_equal(
+        out["accel"], _as_of(grid, imu["accel_time"].to_numpy(), imu["accel"].to_numpy(), "nearest", 0.02))
+    np.testing.assert_array_equal(
+        out["gps_pdop"], _as_of(grid, kept["pdop_time"].to_numpy(), kept["pdop"].to_numpy(), "backward", 0.5))
+
+
+def test_column_clash_is_rejected():
+    a = pd.DataFrame({"time": [0.0, 1.0], "x": [1, 2]})
+    with pytest.raises(ValueError, match="x"):
+        align_sources([a, a.copy()])
+    assert align_sources([a, Source(a, prefix="b_")]).columns.tolist() == ["time", "x", "b_x"]
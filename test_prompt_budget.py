@@ -0,0 +1,70 @@
+"""Token-budgeted event payloads."""
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from prompt_budget import budget_events, estimate_tokens, event_values, summarize_events
+from rule_engine import detect_events
+
+
+def _rule(name, cond, severity="low"):
+    return {"name": name, "severity": severity, "description": name, "condition": cond}
+
+
+def _flight():
+    t = np.arange(12) * 0.5
+    vs = np.array([0.0, -1.2, -3.0, -1.1, 0.0, 0.0, -2.0, 0.0, 0.0, -1.5, 0.0, 0.0])
+    alt = np.array([0.0, 0.0, 0.0, 5.0, 5.0, 5.0, 5.0, 5.0, 1.0, 1.0, 1.0, 1.0])
+    return pd.DataFrame({"time": t, "vertical_speed": vs, "altitude": alt})
+
+
+RULES = [
+    _rule("rapid_descent", {"signal": "vertical_speed", "operator": "lt", "value": -1.0}, "high"),
+    _rule("jump", {"signal": "altitude", "operator": "abs_delta", "compare": "gt", "value": 3.0}),
+    _rule("falling", {"all": [
+        {"signal": "vertical_speed", "operator": "lt", "value": -1.0},
+        {"signal": "altitude", "operator": "gt", "value": 0.5},
+    ]}),
+]
+
+
+def test_point_events_get_their_compared_values():
+    df = _flight()
+    events = detect_events(df, RULES)
+    values = dict(zip(((e["event"], e["time"]) for e in events), event_values(events, RULES, df)))
+    assert values[("rapid_descent", 1.0)] == -3.0
+    assert values[("jump", 1.5)] == 5.0  # the |delta|, not the raw signal
+    assert values[("jump", 4.0)] == 4.0
+    assert all(v is None for (name, _), v in values.items() if name == "falling")
+    assert event_values(events) == [None] * len(events)  # no frame: values unknown
+
+
+def test_worst_follows_the_comparison_direction():
+    df = _flight()
+    events = detect_events(df, RULES)
+    summary = {a["event"]: a for a in summarize_events(events, RULES, event_values(events, RULES, df))}
+    assert summary["rapid_descent"]["worst"] == -3.0
+    assert summary["jump"]["worst"] == 5.0
+    assert "worst" not in summary["falling"]
+    assert [a["event"] for a in summarize_events(events, RULES)][0] == "rapid_descent"
+
+
+def test_budget_keeps_the_most_severe_events():
+    df = _flight()
+    events = detect_events(df, RULES)
+    summary_only, _ = budget_events(events, budget_tokens=0, rules=RULES, df=df)
+    one = estimate_tokens(summary_only) + 20
+    payload, report = budget_events(events, budget_tokens=one, rules=RULES, df=df)
+    data = json.loads(payload)
+    assert report["tokens"] == estimate_tokens(payload) <= one
+    assert data["omitted"] == len(events) - len(data["events"]) > 0
+    # room for one event: the deepest descent ranks first
+    assert data["events"] == [ {"time": 1.0, "event": "rapid_descent", "severity": "high", "value": -3.0}]
+
+    payload, report = budget_events(events, budget_tokens=10_000, rules=RULES, df=df)
+    data = json.loads(payload)
+    assert data["omitted"] == 0 and not report["over_budget"]
+    assert [e["time"] for e in data["events"]] == sorted(e["time"] for e in events)
@@ -0,0 +1,60 @@
+"""KLL quantile sketch: rank error, merging and bounded memory."""
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from quantile_sketch import KLLSketch
+
+
+QS = (0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99)
+
+
+def _rank_errors(sketch, data):
+    """|fraction of data <= each reported quantile - q|."""
+    s = np.sort(data)
+    got = sketch.quantiles(QS)
+    return np.abs(np.searchsorted(s, got, side="right") / len(s) - np.asarray(QS))
+
+
+def _data(n=200_000, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.concatenate([rng.normal(0, 1, n // 2), rng.exponential(3, n // 2)])  # skewed, with ties below
+
+
+def test_single_pass_rank_error():
+    data = _data()
+    sketch = KLLSketch()
+    for chunk in np.array_split(data, 37):
+        sketch.update(chunk)
+    assert len(sketch) == len(data)
+    assert _rank_errors(sketch, data).max() < 0.02
+    assert sketch.quantile(0) == data.min() and sketch.quantile(1) == data.max()
+    assert sum(len(lv) for lv in sketch._levels) < 4 * sketch.k  # memory independent of n
+
+
+def test_merged_parts_match_a_single_pass():
+    data = _data(seed=1)
+    parts = np.array_split(data, 25)
+    merged = KLLSketch()
+    for part in parts:
+        sk = KLLSketch(seed=None)
+        sk.update(part)
+        merged.merge(sk)
+    whole = KLLSketch()
+    whole.update(data)
+    assert len(merged) == len(whole) == len(data)
+    assert (merged.min, merged.max) == (whole.min, whole.max)
+    assert _rank_errors(merged, data).max() < 0.02
+    np.testing.assert_allclose(merged.fraction_above(2.0), np.mean(data > 2.0), atol=0.02)
+
+
+def test_nan_is_ignored_and_round_trip():
+    sketch = KLLSketch(k=16)
+    sketch.update([np.nan, 3.0, 1.0, np.nan, 2.0])
+    assert len(sketch) == 3 and sketch.quantile(0.5) == 2.0
+    copy = KLLSketch.from_dict(sketch.to_dict())
+    np.testing.assert_array_equal(copy.quantiles(QS), sketch.quantiles(QS))
+    assert np.isnan(KLLSketch().quantile(0.5))
+    with pytest.raises(ValueError):
+        KLLSketch(k=4)
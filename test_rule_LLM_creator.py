@@ -0,0 +1,71 @@
+"""LLM slot parsing: streamed and blocking answers give the same patch."""
+from __future__ import annotations
+
+from functools import partial
+
+import pytest
+
+import llm_cache
+import rule_LLM_creator
+from rule_LLM_creator import parse_user_answer
+
+
+class _Stream:
+    """Fake model stream: yields `pieces`, records how many were read and whether it was closed."""
+
+    def __init__(self, pieces):
+        self.pieces = pieces
+        self.read = 0
+        self.closed = False
+
+    def __call__(self, prompt, **kwargs):
+        try:
+            for piece in self.pieces:
+                self.read += 1
+                yield piece
+        finally:
+            self.closed = True
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """Route parse_user_answer's LLM calls to a fake reply, through a fresh cache."""
+
+    def install(pieces):
+        cache = llm_cache.LLMCache()
+        fake = _Stream(pieces)
+        monkeypatch.setattr(rule_LLM_creator, "call_claude_sonnet", lambda *a, **k: "".join(pieces))
+        monkeypatch.setattr(rule_LLM_creator, "cached_llm_stream",
+                            partial(llm_cache.cached_llm_stream, model_id="m", cache=cache, stream=fake))
+        monkeypatch.setattr(rule_LLM_creator, "cached_llm_call",
+                            partial(llm_cache.cached_llm_call, model_id="m", cache=cache,
+                                    call=lambda p, **k: "".join(pieces)))
+        return fake, cache
+
+    return install
+
+
+def _answer(stream):
+    return parse_user_answer("value", "greater than 1.5", use_llm=True, stream=stream)
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_truncated_object_falls_back(llm, stream):
+    llm(['{"signal": "pdop", ', '"operator": "gt", "val'])  # cut off by max_tokens
+    assert _answer(stream) == {"value": 1.5}
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_every_field_is_kept(llm, stream):
+    llm(["```json\n{", '"value": -1', '.5, "operator": "lt", ', '"name": "rapid_descent"}', "\n```", " done"])
+    assert _answer(stream) == {"value": -1.5, "operator": "lt", "name": "rapid_descent"}
+
+
+def test_stream_stops_at_closing_brace_and_caches_the_object(llm):
+    fake, cache = llm(['{"value": ', "2.5}", "\n", "trailing ", "text"])
+    assert _answer(True) == {"value": 2.5}
+    assert fake.read == 2 and fake.closed
+    assert cache.stats()["memory_entries"] == 1
+    # the cached object serves both paths
+    assert _answer(True) == _answer(False) == {"value": 2.5}
+    assert fake.read == 2
@@ -0,0 +1,54 @@
+"""Compiled execution plans and their cache."""
+from __future__ import annotations
+
+import pytest
+
+import rule_compiler
+from rule_compiler import clear_plan_cache, compile_rules
+from rule_engine import detect_events
+
+
+def _rule(name, cond, severity="low"):
+    return {"name": name, "severity": severity, "description": name, "condition": cond}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_plan_cache()
+    yield
+    clear_plan_cache()
+
+
+def test_mask_plan_matches_detect_events(flight, threshold_rules, mixed_rules):
+    df = flight()
+    rules = threshold_rules + mixed_rules
+    plan = compile_rules(rules, mode="mask")
+    assert plan.run(df) == detect_events(df, rules)
+    assert plan.run(df, coalesce=True, max_gap=2) == detect_events(df, rules, coalesce=True, max_gap=2)
+
+
+def test_plans_are_cached_by_content():
+    rules = [_rule("low", {"signal": "x", "operator": "lt", "value": 1.0})]
+    plan = compile_rules(rules)
+    assert compile_rules([dict(r) for r in rules]) is plan
+    rules[0]["condition"]["value"] = 2.0  # edited rule-set: new plan, the old one is unaffected
+    assert compile_rules(rules) is not plan
+    assert plan.rules[0]["condition"]["value"] == 1.0
+
+
+def test_lax_plan_is_not_reused_for_strict_compile():
+    rules = [{**_rule("low", {"signal": "x", "operator": "lt", "value": 1.0}), "owner": "ops"}]
+    compile_rules(rules, strict=False)
+    with pytest.raises(ValueError, match="owner"):
+        compile_rules(rules)
+
+
+def test_plan_cache_is_lru_bounded(monkeypatch):
+    monkeypatch.setattr(rule_compiler, "PLAN_CACHE_SIZE", 2)
+    sets = [[_rule("r", {"signal": "x", "operator": "lt", "value": float(v)})] for v in range(3)]
+    first = compile_rules(sets[0])
+    compile_rules(sets[1])
+    assert compile_rules(sets[0]) is first  # refreshed: sets[1] is now least recent
+    compile_rules(sets[2])
+    cached = [key.rsplit(":", 1)[1] for key in rule_compiler._PLAN_CACHE]
+    assert cached == [rule_compiler.rule_set_key(sets[0]), rule_compiler.rule_set_key(sets[2])]
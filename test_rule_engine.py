@@ -0,0 +1,23 @@
+"""Vectorized dict conditions against the scalar evaluator.
+
+Run the suite with `python -m pytest -q`; shared test data is in conftest.py.
+"""
+from __future__ import annotations
+
+from rule_engine import _eval_condition_dict, detect_events
+
+
+def _times(events, name):
+    return [e["time"] for e in events if e["event"] == name]
+
+
+def test_dict_conditions_match_scalar_evaluator(flight, threshold_rules):
+    df = flight()
+    rules = threshold_rules
+    events = detect_events(df, rules)
+    for rule in rules:
+        expected = [
+            float(t) for t, v in zip(df["time"], df["vertical_speed"])
+            if _eval_condition_dict(rule["condition"], v)
+        ]
+        assert _times(events, rule["name"]) == expected, rule["name"]
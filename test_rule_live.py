@@ -0,0 +1,39 @@
+"""LiveEvaluator against detect_events."""
+from __future__ import annotations
+
+from rule_engine import detect_events
+from rule_live import LiveEvaluator
+
+
+def _rule(name, cond, severity="low"):
+    return {"name": name, "severity": severity, "description": name, "condition": cond}
+
+
+def _window_rules():
+    """Every window operator, with thresholds on the 0.05 grid the samples (and many
+    window aggregates) land on exactly."""
+    rules = []
+    for how in ("rolling_min", "rolling_max", "rolling_range", "rolling_mean", "rolling_std"):
+        for window in (1, 2, 5):
+            for op in ("lt", "lte", "eq", "gte"):
+                for v in (0.0, 0.05, 0.25):
+                    rules.append(_rule(f"{how}_{window}_{op}_{v}", {
+                        "signal": "vertical_speed", "operator": how, "window": window, "compare": op, "value": v,
+                    }))
+    return rules
+
+
+def test_live_evaluator_matches_detect_events(flight, threshold_rules, mixed_rules):
+    df = flight(n=2000)
+    rules = mixed_rules + threshold_rules + _window_rules()
+    fired = LiveEvaluator(rules).push_batch(df)
+    key = lambda e: (e["event"], e["time"])  # noqa: E731
+    assert sorted(fired, key=key) == sorted(detect_events(df, rules), key=key)
+
+
+def test_push_one_sample_at_a_time(flight, mixed_rules):
+    df = flight(n=300)
+    live = LiveEvaluator(mixed_rules)
+    fired = [e for sample in df.to_dict("records") for e in live.push(sample)]
+    assert fired == LiveEvaluator(mixed_rules).push_batch(df)
+    assert live.samples_seen == len(df)
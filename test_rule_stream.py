@@ -0,0 +1,22 @@
+"""Chunked CSV streaming against in-memory detection."""
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from rule_engine import detect_events
+from rule_stream import detect_events_csv
+
+
+@pytest.mark.parametrize("chunksize", [1, 2, 3, 7, 64, 4096])
+def test_chunked_csv_matches_in_memory(tmp_path, chunksize, flight, mixed_rules):
+    df = flight(n=400)
+    path = tmp_path / "flight.csv"
+    df.to_csv(path, index=False)
+    df = pd.read_csv(path)  # compare against exactly the parsed values
+    rules = mixed_rules
+    assert detect_events_csv(path, rules, chunksize=chunksize) == detect_events(df, rules)
+    for max_gap, min_samples in ((0, 1), (2, 1), (1, 3)):
+        assert detect_events_csv(
+            path, rules, chunksize=chunksize, coalesce=True, max_gap=max_gap, min_samples=min_samples
+        ) == detect_events(df, rules, coalesce=True, max_gap=max_gap, min_samples=min_samples)
@@ -0,0 +1,48 @@
+"""ThresholdIndex and indexed plans against per-rule masks."""
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from rule_compiler import INDEX_MIN_RULES, compile_rules
+from rule_engine import _eval_condition_dict, detect_events
+from threshold_index import ThresholdIndex
+
+
+def test_threshold_index_matches_masks_at_boundaries(threshold_rules):
+    values = np.array([-np.inf, -1.0, -0.5, -0.25, 0.0, 0.0, 0.25, 0.5, 1.0, 2.0, np.inf, np.nan] * 20)
+    conds = [r["condition"] for r in threshold_rules]
+    conds.append({"signal": "x", "operator": "between", "min": 1.0, "max": -1.0})  # empty code range
+    index = ThresholdIndex(conds)
+    with np.errstate(invalid="ignore"):
+        for cond, hits in zip(conds, index.hit_indices(values)):
+            expected = [i for i, v in enumerate(values) if _eval_condition_dict(cond, v)]
+            assert hits.tolist() == expected, cond
+
+
+@pytest.mark.parametrize("mode", ["index", "auto"])
+def test_plan_modes_match_detect_events(mode, flight, threshold_rules, mixed_rules):
+    df = flight()
+    rules = threshold_rules + mixed_rules
+    assert compile_rules(rules, mode=mode).run(df) == detect_events(df, rules)
+    assert compile_rules(rules, mode=mode).run(df, coalesce=True, max_gap=2) == detect_events(
+        df, rules, coalesce=True, max_gap=2
+    )
+
+
+def test_auto_indexes_only_many_sparse_rules(flight):
+    df = flight()
+    values = df["vertical_speed"].to_numpy()
+    # tail thresholds: each rule hits only a few samples
+    sparse = [
+        {"name": f"{op}_{v}", "severity": "low", "description": "",
+         "condition": {"signal": "vertical_speed", "operator": op, "value": s * v}}
+        for op, s in (("gt", 1), ("lt", -1))
+        for v in np.round(np.linspace(1.5, 3.0, INDEX_MIN_RULES // 2), 2).tolist()
+    ]
+    dense = [{**r, "condition": {**r["condition"], "operator": "lt" if r["condition"]["operator"] == "gt" else "gt"}}
+             for r in sparse]
+    for rules, indexed in ((sparse, True), (sparse[:-1], False), (dense, False)):
+        plan = compile_rules(rules, mode="auto")
+        assert [g.use_index(values) for g in plan.groups] == [indexed]
+        assert plan.run(df) == detect_events(df, rules)
@@ -0,0 +1,77 @@
+"""Time index and event timeline range queries against linear scans."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from time_index import EventTimeline, TimeIndex, signal_slice
+
+
+def _events(seed=0, n=300):
+    """Mixed point and interval events, intervals of very different lengths."""
+    rng = np.random.default_rng(seed)
+    out = []
+    for k in range(n):
+        t = float(np.round(rng.uniform(0, 100), 1))
+        e = {"time": t, "event": f"e{k}"}
+        if k % 3 == 0:
+            e["end_time"] = t + float(np.round(rng.exponential(2.0 if k % 5 else 30.0), 1))
+        out.append(e)
+    return out
+
+
+def _overlapping(events, t0, t1):
+    return sorted(
+        (e for e in events if e["time"] <= t1 and e.get("end_time", e["time"]) >= t0),
+        key=lambda e: e["time"],
+    )
+
+
+def test_between_matches_linear_scan():
+    events = _events()
+    timeline = EventTimeline(events)
+    rng = np.random.default_rng(1)
+    queries = [(t, t + w) for t, w in zip(rng.uniform(-10, 110, 200).round(1), rng.exponential(3, 200).round(1))]
+    queries += [(e["time"], e["time"]) for e in events[:30]]  # point queries on event starts
+    queries += [(e["end_time"], e["end_time"] + 1) for e in events if "end_time" in e][:30]  # touching ends
+    for t0, t1 in queries:
+        got = timeline.between(t0, t1)
+        expected = _overlapping(events, t0, t1)
+        # ties in start time keep insertion order in both
+        assert [e["event"] for e in got] == [e["event"] for e in expected], (t0, t1)
+
+
+def test_long_interval_found_after_short_ones():
+    events = [{"time": 0.0, "end_time": 50.0, "event": "long"}] + [
+        {"time": float(t), "end_time": t + 0.5, "event": f"short{t}"} for t in range(1, 40)
+    ]
+    timeline = EventTimeline(events)
+    assert [e["event"] for e in timeline.between(45, 46)] == ["long"]
+    assert [e["event"] for e in timeline.around(30.2, 0.1)] == ["long", "short30"]
+    assert EventTimeline([]).between(0, 1) == []
+
+
+@pytest.mark.parametrize("shuffle", [False, True])
+def test_time_index_ranges(shuffle):
+    rng = np.random.default_rng(2)
+    t = np.round(np.sort(rng.uniform(0, 50, 500)), 1)
+    t[[10, 200]] = np.nan
+    if shuffle:
+        t = rng.permutation(t)
+    index = TimeIndex(t)
+    for t0, t1 in ((3.0, 7.5), (0.0, 0.0), (49.9, 80.0), (-5.0, -1.0), (20.0, 10.0)):
+        expected = np.flatnonzero((t >= t0) & (t <= t1))
+        np.testing.assert_array_equal(index.rows_between(t0, t1), expected)
+    for q in (-1.0, 12.34, 25.0, 99.0):
+        finite = np.flatnonzero(~np.isnan(t))
+        d = np.abs(t[finite] - q)
+        assert abs(t[index.nearest(q)] - q) == d.min()
+
+
+def test_signal_slice_covers_interval_events():
+    df = pd.DataFrame({"time": np.arange(100) * 0.5, "x": np.arange(100), "y": 0.0})
+    event = {"time": 10.0, "end_time": 12.0, "event": "e"}
+    out = signal_slice(df, event, 1.0, signals=["x"])
+    assert out.columns.tolist() == ["time", "x"]
+    assert out["time"].tolist() == [9.0, 9.5, 10.0, 10.5, 11.0, 11.5, 12.0, 12.5, 13.0]
@@ -0,0 +1,55 @@
+"""Bedrock streaming call: event decoding and error wrapping."""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+import tzarfati_func
+
+
+class _Body:
+    def __init__(self, events):
+        self.events = events
+        self.closed = False
+
+    def __iter__(self):
+        for e in self.events:
+            if isinstance(e, Exception):
+                raise e
+            yield e
+
+    def close(self):
+        self.closed = True
+
+
+def _delta(text):
+    data = {"type": "content_block_delta", "delta": {"type": "text_delta", "text": text}}
+    return {"chunk": {"bytes": json.dumps(data).encode()}}
+
+
+def _client(monkeypatch, body):
+    class Client:
+        def invoke_model_with_response_stream(self, **kwargs):
+            return {"body": body}
+
+    monkeypatch.setattr(tzarfati_func, "get_bedrock_client", lambda *a, **k: Client())
+
+
+def test_stream_yields_text_deltas(monkeypatch):
+    body = _Body([{"chunk": {"bytes": b'{"type": "message_start"}'}}, _delta("ab"), _delta("c")])
+    _client(monkeypatch, body)
+    assert "".join(tzarfati_func.call_claude_sonnet_stream("p")) == "abc"
+    assert body.closed
+
+
+def test_errors_while_streaming_are_wrapped(monkeypatch):
+    cause = ConnectionError("reset")
+    body = _Body([_delta("ab"), cause])
+    _client(monkeypatch, body)
+    deltas = tzarfati_func.call_claude_sonnet_stream("p", model_id="m")
+    assert next(deltas) == "ab"
+    with pytest.raises(RuntimeError, match="Can't invoke 'm'") as info:
+        next(deltas)
+    assert info.value.__cause__ is cause
+    assert body.closed
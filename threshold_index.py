@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+
+INDEXABLE_OPERATORS = ("lt", "lte", "gt", "gte", "eq", "between")
+
+# a condition hitting more than 1/DENSE_FRACTION of the samples is "dense": a
+# linear scan of the codes beats sorting its slice, and it saves nothing over a mask
+DENSE_FRACTION = 8
+
+
+def is_indexable(cond: Dict[str, Any]) -> bool:
+    """True if a dict condition is a plain threshold/range test on finite-or-inf numbers."""
+    op = cond.get("operator")
+    if op not in INDEXABLE_OPERATORS:
+        return False
+    keys = ("min", "max") if op == "between" else ("value",)
+    for k in keys:
+        v = cond.get(k)
+        if not isinstance(v, (int, float)) or isinstance(v, bool) or math.isnan(v):
+            return False
+    return True
+
+
+class ThresholdIndex:
+    """Sorted boundary table for many threshold rules on one signal.
+
+    Every sample is mapped once (one `searchsorted` pass) to a code:
+    `2*k` if it lies strictly between boundaries k-1 and k, `2*k+1` if it equals
+    boundary k. Codes are monotone in the sample value, so each lt/lte/gt/gte/eq/
+    between condition becomes a contiguous code range [lo, hi], and its hits are a
+    slice of the samples ordered by code.
+    """
+
+    def __init__(self, conditions: Sequence[Dict[str, Any]]) -> None:
+        raw: List[float] = []
+        for cond in conditions:
+            if not is_indexable(cond):
+                raise ValueError(f"condition is not indexable: {cond}")
+            if cond["operator"] == "between":
+                raw.extend((float(cond["min"]), float(cond["max"])))
+            else:
+                raw.append(float(cond["value"]))
+
+        self.boundaries = np.unique(np.asarray(raw, dtype=np.float64))
+        self.code_ranges: List[Tuple[int, int]] = [self._code_range(c) for c in conditions]
+
+    def __len__(self) -> int:
+        return len(self.code_ranges)
+
+    def _pos(self, v: float) -> int:
+        return int(np.searchsorted(self.boundaries, v))
+
+    def _code_range(self, cond: Dict[str, Any]) -> Tuple[int, int]:
+        top = 2 * len(self.boundaries)
+        op = cond["operator"]
+        if op == "between":
+            return 2 * self._pos(cond["min"]) + 1, 2 * self._pos(cond["max"]) + 1
+        k = self._pos(cond["value"])
+        if op == "lt":
+            return 0, 2 * k
+        if op == "lte":
+            return 0, 2 * k + 1
+        if op == "gt":
+            return 2 * k + 2, top
+        if op == "gte":
+            return 2 * k + 1, top
+        return 2 * k + 1, 2 * k + 1  # eq
+
+    def codes(self, values: np.ndarray) -> np.ndarray:
+        """Map samples to boundary codes; NaN samples get -1 (they never match)."""
+        b = self.boundaries
+        pos = np.searchsorted(b, values, side="left")
+        # past the last boundary the clipped lookup can never compare equal
+        exact = b[np.minimum(pos, len(b) - 1)] == values
+        codes = 2 * pos + exact
+        codes[np.isnan(values)] = -1
+        return codes
+
+    def _code_counts(self, valid_codes: np.ndarray) -> np.ndarray:
+        """Cumulative sample count per (non-NaN) code; hits of [lo, hi] = c[hi+1] - c[lo]."""
+        offsets = np.zeros(2 * len(self.boundaries) + 2, dtype=np.int64)
+        np.cumsum(np.bincount(valid_codes, minlength=2 * len(self.boundaries) + 1), out=offsets[1:])
+        return offsets
+
+    def sparse_count(self, values: np.ndarray, *, sample: int = 4096) -> int:
+        """Estimated number of conditions that are not dense, from a strided sample of `values`."""
+        values = np.asarray(values, dtype=np.float64)
+        sub = values[:: max(1, len(values) // sample)]
+        codes = self.codes(sub)
+        offsets = self._code_counts(codes[codes >= 0])
+        return sum(
+            1 for lo, hi in self.code_ranges
+            if lo > hi or (offsets[hi + 1] - offsets[lo]) * DENSE_FRACTION <= len(sub)
+        )
+
+    def hit_indices(self, values: np.ndarray) -> List[np.ndarray]:
+        """Return, per condition, the ascending sample positions where it holds."""
+        values = np.asarray(values, dtype=np.float64)
+        n = len(values)
+        codes = self.codes(values)
+
+        valid = np.flatnonzero(codes >= 0)
+        valid_codes = codes[valid]
+        # small code alphabets sort with a stable radix sort
+        if len(self.boundaries) < 32767:
+            valid_codes = valid_codes.astype(np.uint16)
+        order = valid[np.argsort(valid_codes, kind="stable")]
+        offsets = self._code_counts(valid_codes)
+
+        out: List[np.ndarray] = []
+        for lo, hi in self.code_ranges:
+            if lo > hi:
+                out.append(np.empty(0, dtype=np.int64))
+                continue
+            a, b = offsets[lo], offsets[hi + 1]
+            if (b - a) * DENSE_FRACTION > n:
+                # dense hits: one linear pass beats sorting the slice
+                out.append(np.flatnonzero((codes >= lo) & (codes <= hi)))
+            else:
+                out.append(np.sort(order[a:b]))
+        return out
+
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import weakref
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+# -------------------------
+# Sorted time index (binary-search range lookups)
+# -------------------------
+
+
+class TimeIndex:
+    """Sorted view of one time column.
+
+    Logs are almost always already in time order; then no sort is done and row
+    positions are the sorted positions. Otherwise a stable argsort maps sorted
+    positions back to rows (NaN times sort last and never match a range).
+    """
+
+    def __init__(self, times: np.ndarray) -> None:
+        t = np.ascontiguousarray(np.asarray(times, dtype=np.float64))
+        self.times = t
+        if len(t) < 2 or bool(np.all(t[1:] >= t[:-1])):
+            self.order: Optional[np.ndarray] = None
+            self.sorted_times = t
+        else:
+            self.order = np.argsort(t, kind="stable")
+            self.sorted_times = t[self.order]
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    @property
+    def start(self) -> float:
+        return float(self.sorted_times[0]) if len(self) else np.nan
+
+    @property
+    def end(self) -> float:
+        finite = self.sorted_times[~np.isnan(self.sorted_times)]
+        return float(finite[-1]) if len(finite) else np.nan
+
+    def span(self, t0: float, t1: float) -> Tuple[int, int]:
+        """[lo, hi) positions in sorted order with t0 <= time <= t1."""
+        lo = int(np.searchsorted(self.sorted_times, t0, side="left"))
+        hi = int(np.searchsorted(self.sorted_times, t1, side="right"))
+        return lo, max(lo, hi)
+
+    def rows_between(self, t0: float, t1: float) -> np.ndarray:
+        """Ascending row positions with t0 <= time <= t1."""
+        lo, hi = self.span(t0, t1)
+        if self.order is None:
+            return np.arange(lo, hi)
+        return np.sort(self.order[lo:hi])
+
+    def rows_around(self, t: float, seconds: float) -> np.ndarray:
+        """Ascending row positions within `seconds` of t."""
+        return self.rows_between(t - seconds, t + seconds)
+
+    def nearest(self, t: float) -> int:
+        """Row position of the sample closest in time to t (earlier sample on ties); -1 if empty."""
+        n = int(np.count_nonzero(~np.isnan(self.sorted_times)))
+        if n == 0:
+            return -1
+        k = int(np.searchsorted(self.sorted_times[:n], t))
+        if k == n or (k > 0 and t - self.sorted_times[k - 1] <= self.sorted_times[k] - t):
+            k -= 1
+        return k if self.order is None else int(self.order[k])
+
+
+_INDEX_CACHE: Dict[Tuple[int, str], TimeIndex] = {}
+
+
+def time_index(df, time_column: str = "time") -> TimeIndex:
+    """The TimeIndex of df[time_column], built once per DataFrame.
+
+    Cached by object identity and dropped when the DataFrame is garbage
+    collected; frames are treated as immutable (don't edit the time column of a
+    frame after querying it).
+    """
+    key = (id(df), time_column)
+    index = _INDEX_CACHE.get(key)
+    if index is None or len(index) != len(df):
+        index = TimeIndex(df[time_column].to_numpy(dtype=np.float64, na_value=np.nan))
+        if key not in _INDEX_CACHE:
+            weakref.finalize(df, _INDEX_CACHE.pop, key, None)
+        _INDEX_CACHE[key] = index
+    return index
+
+
+# -------------------------
+# Queries
+# -------------------------
+
+
+def _event_span(event: Union[float, Mapping[str, Any]]) -> Tuple[float, float]:
+    if isinstance(event, Mapping):
+        start = float(event["time"])
+        end = event.get("end_time")
+        return start, start if end is None else float(end)
+    return float(event), float(event)
+
+
+def signal_slice(
+    df,
+    event: Union[float, Mapping[str, Any]],
+    seconds: float,
+    *,
+    signals: Optional[Sequence[str]] = None,
+    time_column: str = "time",
+):
+    """Rows of df from `seconds` before an event to `seconds` after it.
+
+    `event` is a time or an event dict (interval events use time..end_time).
+    `signals` limits the returned columns (the time column is always kept).
+    """
+    t0, t1 = _event_span(event)
+    rows = time_index(df, time_column).rows_between(t0 - seconds, t1 + seconds)
+    out = df.iloc[rows]
+    if signals is not None:
+        out = out[list(dict.fromkeys([time_column, *signals]))]
+    return out
+
+
+class EventTimeline:
+    """Events sorted by start time for "which events overlap [t1, t2]" queries.
+
+    Point events and interval events (with `end_time`) may be mixed. Both ends of a
+    query are binary searches: starts are sorted, and a running maximum of end
+    times finds the first event that can still reach t1.
+    """
+
+    def __init__(self, events: Sequence[Dict[str, Any]]) -> None:
+        spans = np.array([_event_span(e) for e in events], dtype=np.float64).reshape(-1, 2)
+        order = np.argsort(spans[:, 0], kind="stable")
+        self.events: List[Dict[str, Any]] = [events[i] for i in order]
+        self.starts = spans[order, 0]
+        self.ends = spans[order, 1]
+        self._reach = np.maximum.accumulate(self.ends) if len(self.ends) else self.ends
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def between(self, t0: float, t1: float) -> List[Dict[str, Any]]:
+        """Events whose [time, end_time] overlaps [t0, t1], in start-time order."""
+        lo = int(np.searchsorted(self._reach, t0, side="left"))
+        hi = int(np.searchsorted(self.starts, t1, side="right"))
+        if hi <= lo:
+            return []
+        keep = np.flatnonzero(self.ends[lo:hi] >= t0) + lo
+        return [self.events[i] for i in keep]
+
+    def around(self, t: float, seconds: float) -> List[Dict[str, Any]]:
+        return self.between(t - seconds, t + seconds)
+
+
+def events_between(events: Sequence[Dict[str, Any]], t0: float, t1: float) -> List[Dict[str, Any]]:
+    """One-off `EventTimeline(events).between(t0, t1)`."""
+    return EventTimeline(events).between(t0, t1)
@@ -1,19 +1,58 @@
 import boto3
 import json
+import threading
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 
-def call_claude_sonnet(
-    prompt: str,
-    region: str = "eu-central-1",
-    model_id: str = "eu.anthropic.claude-sonnet-4-5-20250929-v1:0",
-    max_tokens: int = 50,
-) -> str:
-    """
-    Send a prompt to Anthropic Claude Sonnet via AWS Bedrock and return the text response.
+DEFAULT_REGION = "eu-central-1"
+DEFAULT_MODEL_ID = "eu.anthropic.claude-sonnet-4-5-20250929-v1:0"
+DEFAULT_MAX_POOL_CONNECTIONS = 10
+
+# (region, model_id, max_pool_connections, endpoint_url) -> bedrock-runtime client
+_CLIENTS: Dict[Tuple[str, str, int, Optional[str]], Any] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def get_bedrock_client(
+    region: str = DEFAULT_REGION,
+    model_id: str = DEFAULT_MODEL_ID,
+    *,
+    max_pool_connections: int = DEFAULT_MAX_POOL_CONNECTIONS,
+    endpoint_url: Optional[str] = None,
+):
+    """Process-wide bedrock-runtime client for (region, model).
+
+    Built once (credential resolution, endpoint setup) and reused, so repeated
+    calls keep their pooled HTTPS connections alive instead of paying a new
+    TLS handshake each time. botocore clients are thread-safe once created;
+    creation itself happens under a lock on a private Session. `max_pool_connections`
+    caps concurrent connections per client (raise it for threaded batch callers).
     """
-    client = boto3.client("bedrock-runtime", region_name=region)
+    key = (region, model_id, max_pool_connections, endpoint_url)
+    client = _CLIENTS.get(key)
+    if client is not None:
+        return client
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            config = Config(max_pool_connections=max_pool_connections, tcp_keepalive=True)
+            client = boto3.session.Session().client(
+                "bedrock-runtime", region_name=region, endpoint_url=endpoint_url, config=config
+            )
+            _CLIENTS[key] = client
+    return client
+
+
+def clear_bedrock_clients() -> None:
+    """Drop cached clients (e.g. after rotating credentials)."""
+    with _CLIENTS_LOCK:
+        _CLIENTS.clear()
 
+
+def _native_request(prompt: str, max_tokens: int) -> str:
     native_request = {
         "anthropic_version": "bedrock-2023-05-31",
         "max_tokens": max_tokens,
@@ -24,14 +63,73 @@ def call_claude_sonnet(
             }
         ]
     }
+    return json.dumps(native_request)
+
+
+def call_claude_sonnet(
+    prompt: str,
+    region: str = DEFAULT_REGION,
+    model_id: str = DEFAULT_MODEL_ID,
+    max_tokens: int = 50,
+    *,
+    max_pool_connections: int = DEFAULT_MAX_POOL_CONNECTIONS,
+    endpoint_url: Optional[str] = None,
+) -> str:
+    """
+    Send a prompt to Anthropic Claude Sonnet via AWS Bedrock and return the text response.
+    Uses the shared client from `get_bedrock_client`.
+    """
+    client = get_bedrock_client(
+        region, model_id, max_pool_connections=max_pool_connections, endpoint_url=endpoint_url
+    )
 
     try:
         response = client.invoke_model(
             modelId=model_id,
-            body=json.dumps(native_request)
+            body=_native_request(prompt, max_tokens)
         )
     except (ClientError, Exception) as e:
-        raise RuntimeError(f"Can't invoke '{model_id}': {e}")
+        raise RuntimeError(f"Can't invoke '{model_id}': {e}") from e
 
     model_response = json.loads(response["body"].read())
     return model_response["content"][0]["text"]
+
+
+def call_claude_sonnet_stream(
+    prompt: str,
+    region: str = DEFAULT_REGION,
+    model_id: str = DEFAULT_MODEL_ID,
+    max_tokens: int = 50,
+    *,
+    max_pool_connections: int = DEFAULT_MAX_POOL_CONNECTIONS,
+    endpoint_url: Optional[str] = None,
+) -> Iterator[str]:
+    """
+    Streaming variant of `call_claude_sonnet`: yields text deltas as the model produces them.
+    Closing the generator early (e.g. `break` in a for loop) closes the HTTP stream.
+    """
+    client = get_bedrock_client(
+        region, model_id, max_pool_connections=max_pool_connections, endpoint_url=endpoint_url
+    )
+
+    try:
+        response = client.invoke_model_with_response_stream(
+            modelId=model_id,
+            body=_native_request(prompt, max_tokens)
+        )
+    except (ClientError, Exception) as e:
+        raise RuntimeError(f"Can't invoke '{model_id}': {e}") from e
+
+    stream = response["body"]
+    try:
+        for event in stream:
+            chunk = event.get("chunk")
+            if chunk is None:
+                continue
+            data = json.loads(chunk["bytes"])
+            if data.get("type") == "content_block_delta" and data["delta"].get("type") == "text_delta":
+                yield data["delta"]["text"]
+    except (ClientError, Exception) as e:
+        raise RuntimeError(f"Can't invoke '{model_id}': {e}") from e
+    finally:
+        stream.close()